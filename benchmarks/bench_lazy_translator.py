@@ -0,0 +1,84 @@
+"""
+Micro-benchmark: cost per evaluation of a lazy_translator proxy.
+
+Compares the old behaviour (resolve language + config + strings on every
+evaluation) with the request-local table used inside ActivityLogMiddleware.
+
+    python benchmarks/bench_lazy_translator.py
+
+Standalone script: it configures settings and migrates an in-memory database
+at import time, so it lives outside the package and its test suite.
+"""
+import os
+import sys
+import timeit
+
+import django
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from django.conf import settings
+if not settings.configured:
+    settings.configure(
+        SECRET_KEY='secret',
+        DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+        INSTALLED_APPS=[
+            'django.contrib.auth',
+            'django.contrib.contenttypes',
+            'django.contrib.sessions',
+            'microsys',
+        ],
+        USE_TZ=True,
+    )
+django.setup()
+from django.core.management import call_command
+call_command('migrate', verbosity=0)
+
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.backends.db import SessionStore
+from django.test import RequestFactory
+from django.utils.functional import lazy
+
+from microsys.middleware import _RequestState, _request_state
+from microsys.translations import (
+    begin_request_translations, end_request_translations, get_strings, lazy_translator,
+)
+
+N = 20000
+
+
+def legacy_translator(key, default_val):
+    """lazy_translator as it was: full get_strings() on every evaluation."""
+    def _translate():
+        return get_strings().get(key, default_val)
+    return lazy(_translate, str)()
+
+
+def per_eval_us(proxy):
+    return timeit.timeit(lambda: str(proxy), number=N) / N * 1e6
+
+
+def run_bench():
+    user = get_user_model().objects.create_user('bench', password='x')
+    request = RequestFactory().get('/')
+    request.user = user
+    request.session = SessionStore()
+    # Current request without the request-local translation state
+    _request_state.set(_RequestState(request, user))
+
+    legacy = legacy_translator('help', 'Help')
+    fast = lazy_translator('help', 'Help')
+    assert str(legacy) == str(fast)
+
+    print(f"--- lazy_translator, {N} evaluations ---")
+    print(f"legacy (per evaluation):    {per_eval_us(legacy):8.2f} us")
+    print(f"fast, outside a request:    {per_eval_us(fast):8.2f} us")
+    token = begin_request_translations()
+    try:
+        print(f"fast, inside a request:     {per_eval_us(fast):8.2f} us")
+    finally:
+        end_request_translations(token)
+
+
+if __name__ == '__main__':
+    run_bench()
@@ -232,3 +232,36 @@ def reset_preferences(request):
             return JsonResponse({'success': False, 'error': str(e)}, status=500)
     
     return JsonResponse({'success': False}, status=400)
+
+# Export Jobs API — Progress and download of background exports (see microsys.exportjobs)
+def _get_export_job(request, job_id):
+    """The job if it belongs to the user (superusers see all), else 404."""
+    ExportJob = apps.get_model('microsys', 'ExportJob')
+    jobs = ExportJob.objects.all()
+    if not request.user.is_superuser:
+        jobs = jobs.filter(created_by=request.user)
+    return get_object_or_404(jobs, pk=job_id)
+
+@login_required
+def list_export_jobs(request):
+    """The user's 20 most recent export jobs, newest first."""
+    from .exportjobs import export_job_status
+    ExportJob = apps.get_model('microsys', 'ExportJob')
+    jobs = ExportJob.objects.filter(created_by=request.user).defer('query')[:20]
+    return JsonResponse({'jobs': [export_job_status(job) for job in jobs]})
+
+@login_required
+def get_export_job(request, job_id):
+    """Poll a job: status, total/processed rows, percent and download_url once done."""
+    from .exportjobs import export_job_status
+    return JsonResponse(export_job_status(_get_export_job(request, job_id)))
+
+@login_required
+def download_export_job(request, job_id):
+    """Serve a finished job's file (streamed, resumable)."""
+    from .fetcher import _log_download_action, _serve_file
+    job = _get_export_job(request, job_id)
+    if job.status != job.DONE or not job.file:
+        return JsonResponse({'error': 'Export not ready'}, status=409)
+    _log_download_action(request, job.filename, model_name=job.model_name, count=job.processed)
+    return _serve_file(job.file, job.filename, request=request)
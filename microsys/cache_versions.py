@@ -0,0 +1,119 @@
+"""
+Generation counters for microsys caches.
+
+Cached values embed the current generation of their namespace in the cache
+key, so bumping a counter invalidates every key of that namespace in O(1) —
+the old entries are simply never read again and expire on their own.
+
+Namespaces:
+- 'sidebar'       — resolved sidebar items (context_processors)
+- 'config'        — the SystemSettings singleton / merged system config
+- 'translations'  — merged translation tables
+- 'log_archive'   — months that have an activity-log archive table (logarchive)
+
+Counters live in the shared Django cache so every worker sees a bump. Each
+process re-reads them at most once per GENERATION_CHECK_INTERVAL seconds.
+"""
+import logging
+import threading
+import time
+
+from django.core.cache import cache
+
+logger = logging.getLogger('microsys')
+
+CACHE_NAMESPACES = ('sidebar', 'config', 'translations', 'log_archive')
+
+# Seconds a process trusts its last read of a counter
+GENERATION_CHECK_INTERVAL = 1.0
+
+_local = {}  # namespace -> (generation, read_at)
+_lock = threading.Lock()
+
+
+def _counter_key(namespace):
+    return f'microsys_cache_gen_{namespace}'
+
+
+def get_cache_generation(namespace):
+    """Current generation number for a namespace (starts at 1)."""
+    stamp = time.monotonic()
+    cached = _local.get(namespace)
+    if cached is not None and stamp - cached[1] < GENERATION_CHECK_INTERVAL:
+        return cached[0]
+
+    key = _counter_key(namespace)
+    try:
+        generation = cache.get(key)
+        if generation is None:
+            cache.add(key, 1, timeout=None)
+            generation = cache.get(key, 1)
+    except Exception:
+        # Cache backend unavailable: keep serving the last known generation
+        generation = cached[0] if cached else 1
+    with _lock:
+        _local[namespace] = (generation, stamp)
+    return generation
+
+
+def bump_cache_generation(*namespaces):
+    """
+    Invalidate every cached value of the given namespaces (all when none given).
+    Returns {namespace: new_generation}.
+    """
+    bumped = {}
+    for namespace in namespaces or CACHE_NAMESPACES:
+        key = _counter_key(namespace)
+        try:
+            try:
+                generation = cache.incr(key)
+            except ValueError:
+                # Counter missing (first run, evicted or cache cleared): restart above any old value
+                generation = int(time.time())
+                cache.set(key, generation, timeout=None)
+        except Exception:
+            logger.exception("microsys: could not bump cache generation for '%s'", namespace)
+            continue
+        with _lock:
+            _local[namespace] = (generation, time.monotonic())
+        bumped[namespace] = generation
+    return bumped
+
+
+def _urlconf_fingerprint():
+    """Hash of every named URL pattern (name + route) in the active URLconf."""
+    import hashlib
+    from django.urls import get_resolver, URLResolver
+
+    def walk(patterns, prefix=''):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns, prefix + str(pattern.pattern))
+            elif getattr(pattern, 'name', None):
+                yield f'{pattern.name}:{prefix}{pattern.pattern}'
+
+    names = sorted(walk(get_resolver().url_patterns))
+    return hashlib.md5('|'.join(names).encode()).hexdigest()
+
+
+def check_urlconf_changed(**kwargs):
+    """
+    Bump the sidebar generation when this process serves a different URLconf
+    than the one the shared cache was built from (deploys, dev reloads).
+    Runs on the first request of each process.
+    """
+    from django.core.signals import request_started
+    request_started.disconnect(check_urlconf_changed, dispatch_uid='microsys_urlconf_check')
+    try:
+        fingerprint = _urlconf_fingerprint()
+        key = 'microsys_urlconf_fingerprint'
+        if cache.get(key) != fingerprint:
+            cache.set(key, fingerprint, timeout=None)
+            bump_cache_generation('sidebar')
+    except Exception:
+        logger.exception("microsys: URLconf fingerprint check failed")
+
+
+def versioned_key(namespace, key):
+    """Append the namespace's current generation to a cache key."""
+    return f'{key}_g{get_cache_generation(namespace)}'
@@ -5,6 +5,7 @@ import json
 from django.core.cache import cache
 from django.urls import reverse, NoReverseMatch
 from .discovery import discover_list_urls, get_sidebar_config
+from .cache_versions import bump_cache_generation, versioned_key
 
 # Helper functions for Sidebar - KEPT PRIVATE
 def _get_config_hash(config):
@@ -14,21 +15,43 @@ def _get_config_hash(config):
     config_str = json.dumps(config_copy, sort_keys=True)
     return hashlib.md5(config_str.encode()).hexdigest()[:8]
 
-def _process_extra_items(config, request, user_prefs=None, ms_trans=None):
+def _user_has_sidebar_permission(user, permission):
+    """Check an item's `permission` (string or list/tuple/set; 'is_staff'/'is_superuser' allowed)."""
+    if not permission:
+        return True
+    perms = permission if isinstance(permission, (list, tuple, set)) else [permission]
+    for perm in perms:
+        if perm == 'is_staff':
+            allowed = user.is_staff
+        elif perm == 'is_superuser':
+            allowed = user.is_superuser
+        else:
+            allowed = user.has_perm(perm)
+        if allowed:
+            return True
+    return False
+
+def _reverse_or_hash(url_name):
+    try:
+        return reverse(url_name)
+    except NoReverseMatch:
+        return '#'
+
+def _is_active_url(path, url):
+    return url != '#' and (path == url or path.startswith(url.rstrip('/') + '/'))
+
+def _compile_extra_items(config, user, ms_trans=None):
     """
-    Process EXTRA_ITEMS config into sidebar-ready format.
-    
-    Returns dict of groups, each with icon and list of items with resolved URLs.
+    Resolve EXTRA_ITEMS for one user: translated labels, reversed URLs and
+    permission filtering. Everything here depends only on (language, permission set),
+    so the result is cacheable; active/open state is added per request.
     """
     from django.utils.text import slugify
-    if user_prefs is None:
-        user_prefs = {}
     if ms_trans is None:
         ms_trans = {}
-    open_accordions = user_prefs.get('open_accordions', [])
 
     extra_items = config.get('EXTRA_ITEMS', {})
-    processed_groups = {}
+    compiled_groups = []
     
     for group_name, group_config in extra_items.items():
         # Prefer the explicitly provided 'label' in config, then translation, then group_name itself
@@ -53,60 +76,99 @@ def _process_extra_items(config, request, user_prefs=None, ms_trans=None):
             url_name = item.get('url_name', '')
             
             # Check permission if specified (supports string or list/tuple/set)
-            permission = item.get('permission')
-            if permission:
-                perms = permission if isinstance(permission, (list, tuple, set)) else [permission]
-                allowed = False
-                for perm in perms:
-                    if perm == 'is_staff':
-                        allowed = request.user.is_staff
-                    elif perm == 'is_superuser':
-                        allowed = request.user.is_superuser
-                    else:
-                        allowed = request.user.has_perm(perm)
-                    if allowed:
-                        break
-                if not allowed:
-                    continue
-            
-            # Resolve URL
-            try:
-                url = reverse(url_name)
-                active = request.path == url or request.path.startswith(url.rstrip('/') + '/')
-            except NoReverseMatch:
-                url = '#'
-                active = False
+            if not _user_has_sidebar_permission(user, item.get('permission')):
+                continue
             
             raw_label = item.get('label', url_name)
             translated_label = ms_trans.get(raw_label, raw_label)
             
             items.append({
                 'url_name': url_name,
-                'url': url,
+                'url': _reverse_or_hash(url_name),
                 'label': translated_label,
                 'icon': item.get('icon', 'bi-link'),
-                'active': active,
             })
         
         if items:  # Only add group if it has visible items
-            group_id = f"extraGroup-{slugify(group_name)}"
-            has_active = any(item['active'] for item in items)
-            is_open = (group_id in open_accordions) or has_active
-            
-            # Auto-expand if the group's dashboard URL is currently active
-            # (Behavior removed: we now rely solely on 'active' inner items or explicit user 'open_accordions' state)
-            processed_groups[group_name] = {  # Use internal group_name as key for easier sorting logic
+            compiled_groups.append({
                 'label': translated_group_name,
                 'icon': group_icon,
                 'url': group_url,
                 'items': items,
-                'has_active': any(item['active'] for item in items),
-                'is_open': is_open,
-                'id': group_id,
+                'id': f"extraGroup-{slugify(group_name)}",
                 'raw_name': group_name, # Keep for reordering lookups
-            }
+            })
+    
+    return compiled_groups
+
+def _mark_extra_groups(groups, path, user_prefs=None):
+    """Add per-request active/open flags to compiled extra groups."""
+    open_accordions = (user_prefs or {}).get('open_accordions', [])
+    for group in groups:
+        for item in group['items']:
+            item['active'] = _is_active_url(path, item['url'])
+        has_active = any(item['active'] for item in group['items'])
+        group['has_active'] = has_active
+        # Open when an inner item is active or the user left it expanded
+        group['is_open'] = (group['id'] in open_accordions) or has_active
+    return groups
+
+def _process_extra_items(config, request, user_prefs=None, ms_trans=None):
+    """
+    Process EXTRA_ITEMS config into sidebar-ready format.
     
-    return processed_groups
+    Returns dict of groups, each with icon and list of items with resolved URLs.
+    """
+    groups = _compile_extra_items(config, request.user, ms_trans)
+    _mark_extra_groups(groups, request.path, user_prefs)
+    return {group['raw_name']: group for group in groups}
+
+def _permission_set_hash(user):
+    """Short hash of everything sidebar visibility depends on for this user."""
+    if user.is_superuser:
+        perms = ['*']
+    else:
+        perms = sorted(user.get_all_permissions())
+    key = f"{int(user.is_staff)}{int(user.is_superuser)}|" + '|'.join(perms)
+    return hashlib.md5(key.encode()).hexdigest()[:12]
+
+def _get_settings_hash():
+    """Hash of the raw SIDEBAR_AUTO setting (cheap: no translation or config lookups)."""
+    user_config = getattr(settings, 'SIDEBAR_AUTO', {})
+    config_str = json.dumps(user_config, sort_keys=True, default=str)
+    return hashlib.md5(config_str.encode()).hexdigest()[:8]
+
+def _get_compiled_sidebar(user, current_lang, ms_trans):
+    """
+    Fully resolved sidebar (auto items + extra groups) for a language and
+    permission set, cached for SIDEBAR_AUTO['CACHE_TIMEOUT'] seconds.
+    """
+    timeout = getattr(settings, 'SIDEBAR_AUTO', {}).get('CACHE_TIMEOUT', 3600)
+    cache_key = versioned_key('sidebar', f'sidebar_compiled_{current_lang}_{_get_settings_hash()}_{_permission_set_hash(user)}')
+    compiled = cache.get(cache_key)
+    if compiled is not None:
+        return compiled
+
+    config = get_sidebar_config(lang_code=current_lang)
+    # Discovered items are shared by every permission set
+    items_key = versioned_key('sidebar', f'sidebar_auto_items_{current_lang}_{_get_config_hash(config)}')
+    items = cache.get(items_key)
+    if items is None:
+        items = discover_list_urls(lang_code=current_lang)
+        cache.set(items_key, items, timeout=config['CACHE_TIMEOUT'])
+
+    auto_items = []
+    for item in items:
+        # Superusers see everything
+        if user.is_superuser or not item.get('permissions') or any(user.has_perm(p) for p in item['permissions']):
+            auto_items.append({**item, 'url': _reverse_or_hash(item['url_name'])})
+
+    compiled = {
+        'auto_items': auto_items,
+        'extra_groups': _compile_extra_items(config, user, ms_trans),
+    }
+    cache.set(cache_key, compiled, timeout=timeout)
+    return compiled
 
 def _sort_sidebar(items, order, id_field='url_name'):
     """Helper to sort sidebar items list based on a list of IDs."""
@@ -140,10 +202,10 @@ def microsys_context(request):
 
     # 1. Branding / App Config
     from .utils import get_system_config
-    final_config = get_system_config()
+    final_config = dict(get_system_config())  # copied: branding keys are promoted below
 
     # 4. Language / i18n (resolved BEFORE branding overrides so we know current_lang)
-    from .translations import get_strings
+    from .translations import get_active_language, get_active_strings
 
     # Available languages from config (default: English and Arabic)
     default_languages = {
@@ -153,28 +215,8 @@ def microsys_context(request):
     languages = final_config.get('languages', default_languages)
 
     # Resolve active language: user pref → session → config default → 'en'
-    default_lang = final_config.get('default_language', 'en')
-    
-    current_lang = None
-    # 1. User Preference
-    if request.user.is_authenticated and hasattr(request.user, 'profile'):
-        user_prefs = request.user.profile.preferences or {}
-        if 'language' in user_prefs:
-            current_lang = user_prefs.get('language')
-    else:
-        user_prefs = {}
-    
-    # 2. Session Preference (for anonymous users or overrides)
-    if not current_lang:
-        current_lang = request.session.get('lang')
-        
-    # 3. Default
-    if not current_lang:
-        current_lang = default_lang
-
-    # Validate the resolved language exists in available languages
-    if current_lang not in languages:
-        current_lang = default_lang if default_lang in languages else 'en'
+    # (resolved once per request and shared with get_strings / lazy labels)
+    current_lang, current_dir = get_active_language(request)
 
     # DYNAMIC BRANDING: Look for [key]_[lang] overrides in final_config
     # (e.g. name_en, logo_ar) and promote them to the base keys
@@ -198,11 +240,9 @@ def microsys_context(request):
     context['user_preferences'] = user_prefs # Injected for JS use
 
     lang_config = languages.get(current_lang, {'name': 'English', 'dir': 'ltr', 'flag': '🇬🇧'})
-    current_dir = lang_config.get('dir', 'rtl')
 
     # Get translated strings (with project-level overrides from config)
-    project_overrides = final_config.get('translations', None)
-    ms_trans = get_strings(current_lang, overrides=project_overrides)
+    ms_trans = get_active_strings(request)
 
     context['CURRENT_LANG'] = current_lang
     context['CURRENT_DIR'] = current_dir
@@ -211,34 +251,20 @@ def microsys_context(request):
     context['MS_TRANS'] = ms_trans
 
     # 5. Sidebar Context (uses current_lang for translated labels)
-    config = get_sidebar_config(lang_code=current_lang)
-    # Include config hash + lang in cache key so language changes get fresh items
-    cache_key = f'sidebar_auto_items_{current_lang}_{_get_config_hash(config)}'
-    items = cache.get(cache_key)
-    
-    if items is None:
-        items = discover_list_urls(lang_code=current_lang)
-        cache.set(cache_key, items, timeout=config['CACHE_TIMEOUT'])
-    
-    # Filter by user permissions
+    # The resolved sidebar is cached per (language, permission set);
+    # only active flags and the user's ordering are computed here.
     sidebar_items = []
-    extra_groups_dict = {}
 
     if request.user.is_authenticated:
-        if request.user.is_superuser:
-            # Superusers see everything
-            sidebar_items = items
-        else:
-            visible = []
-            for item in items:
-                if not item.get('permissions'):
-                    visible.append(item)
-                elif any(request.user.has_perm(p) for p in item['permissions']):
-                    visible.append(item)
-            sidebar_items = visible
-        
-        # Process extra items for authenticated users
-        extra_groups_dict = _process_extra_items(config, request, user_prefs, ms_trans)
+        compiled = _get_compiled_sidebar(request.user, current_lang, ms_trans)
+        sidebar_items = [
+            {**item, 'active': _is_active_url(request.path, item['url'])}
+            for item in compiled['auto_items']
+        ]
+        extra_groups_list = _mark_extra_groups(
+            [{**group, 'items': [dict(item) for item in group['items']]} for group in compiled['extra_groups']],
+            request.path, user_prefs,
+        )
         
         # --- Apply Reordering based on user_prefs ---
         layout = user_prefs.get('sidebar_layout', {})
@@ -248,7 +274,6 @@ def microsys_context(request):
             sidebar_items = _sort_sidebar(sidebar_items, layout['auto_items'], 'url_name')
             
         # 2. Sort Accordion Groups
-        extra_groups_list = list(extra_groups_dict.values())
         if extra_groups_list and layout.get('accordion_groups_order'):
             extra_groups_list = _sort_sidebar(extra_groups_list, layout['accordion_groups_order'], 'id')
             
@@ -286,9 +311,6 @@ def clear_sidebar_cache():
     """
     Clear the sidebar items cache.
     Call this when models or URLs change and sidebar needs refresh.
+    Bumps the 'sidebar' cache generation, so every cached variant is dropped at once.
     """
-    # Note: We can't easily clear specific hash keys, so we might need a more robust clearing strategy
-    # or just rely on timeout. For now, this function is a placeholder or partial implementation.
-    # To truly clear, we'd need to track keys or use a specific prefix clear if supported by backend.
-    # Simpler: Just rely on short timeout during dev.
-    pass
+    bump_cache_generation('sidebar')
@@ -8,6 +8,8 @@ from django.urls import get_resolver, URLPattern, URLResolver
 from django.apps import apps
 from django.conf import settings
 from difflib import get_close_matches
+import math
+from fractions import Fraction
 
 
 def get_sidebar_config(lang_code=None):
@@ -122,22 +124,49 @@ def get_sidebar_config(lang_code=None):
     return config
 
 
+# Process-wide discovery results, keyed by the discovery settings.
+# URLconf and models are fixed for the life of a process; settings overrides
+# (tests) reset it through clear_discovery_cache().
+_discovery_cache = {}
 
-def discover_list_urls(lang_code=None):
+# Model-name indexes, keyed by the excluded app labels
+_model_index_cache = {}
+
+# difflib cutoff used for fuzzy model matching
+FUZZY_CUTOFF = 0.8
+
+
+def clear_discovery_cache():
+    """Forget discovered URL/model matches and model-name indexes."""
+    _discovery_cache.clear()
+    _model_index_cache.clear()
+
+
+def _discovery_key(config):
+    """Settings that affect which URLs map to which models (language independent)."""
+    return (
+        settings.ROOT_URLCONF,
+        tuple(config['URL_PATTERNS']),
+        tuple(config['EXCLUDE_APPS']),
+        tuple(config['EXCLUDE_MODELS']),
+    )
+
+
+def _discover_list_models(config):
     """
-    Scan all URL patterns for names containing configured keywords.
-    Match them to Django models and extract verbose_name_plural.
-    
+    Match list-style URL names to models.
+    Language independent, so it runs once per process and is shared by
+    every language.
+
     Returns:
-        List of sidebar item dictionaries sorted by order.
+        List of (url_name, model) tuples in URLconf order.
     """
-    config = get_sidebar_config(lang_code=lang_code)
-    
-    if not config['ENABLED']:
-        return []
-    
+    key = _discovery_key(config)
+    if key in _discovery_cache:
+        return _discovery_cache[key]
+
     resolver = get_resolver()
-    items = []
+    matches = []
     
     for pattern in _iterate_patterns(resolver.url_patterns):
         url_name = getattr(pattern, 'name', '') or ''
@@ -172,30 +201,53 @@ def discover_list_urls(lang_code=None):
                     continue
                 if f"{model._meta.app_label}.{model.__name__}" in config['EXCLUDE_MODELS']:
                     continue
-                
-                items.append({
-                    'url_name': url_name,
-                    'label': getattr(model._meta, 'sidebar_label', None) or str(model._meta.verbose_name_plural),
-                    'icon': getattr(model._meta, 'sidebar_icon', config['DEFAULT_ICON']),
-                    'order': getattr(model._meta, 'sidebar_order', 100),
-                    'app_label': model._meta.app_label,
-                    'model_name': model._meta.model_name,
-                    'permissions': [f'{model._meta.app_label}.view_{model._meta.model_name}'],
-                })
-
-            # Override with DEFAULT_ITEMS if present
-            default_items = config.get('DEFAULT_ITEMS', {})
-            if url_name in default_items:
-                item_config = default_items[url_name]
-                # Update last added item
-                if items:
-                    item = items[-1]
-                    if 'label' in item_config:
-                        item['label'] = item_config['label']
-                    if 'icon' in item_config:
-                        item['icon'] = item_config['icon']
-                    if 'order' in item_config:
-                        item['order'] = item_config['order']
+                matches.append((url_name, model))
+
+    _discovery_cache.clear()
+    _discovery_cache[key] = matches
+    return matches
+
+
+def discover_list_urls(lang_code=None):
+    """
+    Scan all URL patterns for names containing configured keywords.
+    Match them to Django models and extract verbose_name_plural.
+    URL-to-model matching is computed once (see _discover_list_models);
+    only labels are localized per call.
+    
+    Returns:
+        List of sidebar item dictionaries sorted by order.
+    """
+    config = get_sidebar_config(lang_code=lang_code)
+    
+    if not config['ENABLED']:
+        return []
+    
+    items = []
+    default_items = config.get('DEFAULT_ITEMS', {})
+
+    for url_name, model in _discover_list_models(config):
+        item = {
+            'url_name': url_name,
+            'label': getattr(model._meta, 'sidebar_label', None) or str(model._meta.verbose_name_plural),
+            'icon': getattr(model._meta, 'sidebar_icon', config['DEFAULT_ICON']),
+            'order': getattr(model._meta, 'sidebar_order', 100),
+            'app_label': model._meta.app_label,
+            'model_name': model._meta.model_name,
+            'permissions': [f'{model._meta.app_label}.view_{model._meta.model_name}'],
+        }
+
+        # Override with DEFAULT_ITEMS if present
+        if url_name in default_items:
+            item_config = default_items[url_name]
+            if 'label' in item_config:
+                item['label'] = item_config['label']
+            if 'icon' in item_config:
+                item['icon'] = item_config['icon']
+            if 'order' in item_config:
+                item['order'] = item_config['order']
+
+        items.append(item)
     
     return sorted(items, key=lambda x: (x['order'], x['label']))
 
@@ -209,6 +261,45 @@ def _iterate_patterns(patterns, prefix=''):
             yield pattern
 
 
+def _get_model_index(exclude_apps):
+    """
+    Lower-cased model names → model, built once per set of excluded apps.
+    Also buckets names by length for fuzzy matching and memoizes lookups.
+    """
+    key = tuple(sorted(exclude_apps))
+    index = _model_index_cache.get(key)
+    if index is None:
+        apps.check_models_ready()
+        names = {}
+        for m in apps.get_models():
+            if m._meta.app_label not in exclude_apps:
+                names[m.__name__.lower()] = m
+        by_length = {}
+        for name in names:
+            by_length.setdefault(len(name), []).append(name)
+        index = {'names': names, 'by_length': by_length, 'lookups': {}}
+        _model_index_cache[key] = index
+    return index
+
+
+def _fuzzy_candidates(index, hint):
+    """
+    Names long enough / short enough to possibly reach FUZZY_CUTOFF.
+    difflib's ratio is 2*M / (len(a) + len(b)) with M <= min(len(a), len(b)),
+    so anything outside this length window can never match.
+    The bounds are exact fractions widened by one, so a ratio landing exactly
+    on the cutoff is never lost to float rounding (difflib makes the final call).
+    """
+    length = len(hint)
+    cutoff = Fraction(str(FUZZY_CUTOFF))
+    low = max(math.ceil(length * cutoff / (2 - cutoff)) - 1, 0)
+    high = math.floor(length * (2 - cutoff) / cutoff) + 1
+    candidates = []
+    for size in range(low, high + 1):
+        candidates.extend(index['by_length'].get(size, ()))
+    return candidates
+
+
 def _find_model(hint, config):
     """
     Find model by name using exact and fuzzy matching.
@@ -220,24 +311,23 @@ def _find_model(hint, config):
     Returns:
         Model class or None if not found
     """
-    all_models = apps.get_models()
-    
-    # Build lookup excluding configured apps
-    model_names = {}
-    for m in all_models:
-        if m._meta.app_label not in config['EXCLUDE_APPS']:
-            model_names[m.__name__.lower()] = m
-    
+    index = _get_model_index(config['EXCLUDE_APPS'])
+    model_names = index['names']
     hint_lower = hint.lower()
+
+    if hint_lower in index['lookups']:
+        return index['lookups'][hint_lower]
     
     # Exact match first
     if hint_lower in model_names:
-        return model_names[hint_lower]
-    
+        model = model_names[hint_lower]
     # Handle common pluralization (simple 's' suffix)
-    if hint_lower.endswith('s') and hint_lower[:-1] in model_names:
-        return model_names[hint_lower[:-1]]
-    
-    # Fuzzy match as fallback
-    matches = get_close_matches(hint_lower, model_names.keys(), n=1, cutoff=0.8)
-    return model_names[matches[0]] if matches else None
+    elif hint_lower.endswith('s') and hint_lower[:-1] in model_names:
+        model = model_names[hint_lower[:-1]]
+    else:
+        # Fuzzy match as fallback, limited to names that can reach the cutoff
+        matches = get_close_matches(hint_lower, _fuzzy_candidates(index, hint_lower), n=1, cutoff=FUZZY_CUTOFF)
+        model = model_names[matches[0]] if matches else None
+
+    index['lookups'][hint_lower] = model
+    return model
@@ -0,0 +1,270 @@
+"""
+Background export jobs.
+
+start_export_job() records an ExportJob (the queryset travels as its pickled
+Query, signed with SECRET_KEY) and hands it to the runner set in
+MICROSYS_FETCHER['EXPORT_RUNNER']:
+
+- 'thread'  (default): a small per-process thread pool (EXPORT_WORKERS threads)
+- 'command': jobs wait until `manage.py microsys_run_exports` claims them
+
+No broker is needed either way. run_export_job() writes the file with
+fetcher.write_export, saving progress at most every EXPORT_PROGRESS_INTERVAL
+seconds. Progress and the download link are served under sys/api/exports/.
+run_pending_export_jobs() also picks up jobs a dead process left behind and
+deletes finished jobs (and their files) older than EXPORT_RETENTION_HOURS.
+"""
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.apps import apps
+from django.core import signing
+from django.core.files import File
+from django.db import close_old_connections, transaction
+from django.urls import reverse
+from django.utils.timezone import now
+
+from .fetcher import EXPORT_FILE_TYPES, get_fetcher_config, write_export
+from .middleware import request_context
+from .utils import log_user_action
+
+logger = logging.getLogger('microsys')
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+QUERY_SALT = 'microsys.exportjobs.query'
+
+
+class _QuerySerializer:
+    """signing serializer for Query objects; loads() only runs on a verified payload."""
+
+    def dumps(self, obj):
+        return pickle.dumps(obj)
+
+    def loads(self, data):
+        return pickle.loads(data)
+
+
+def dump_query(query):
+    """Pickle and sign a Query for ExportJob.query."""
+    return signing.dumps(query, salt=QUERY_SALT, serializer=_QuerySerializer, compress=True).encode('ascii')
+
+
+def load_query(data):
+    """Verify and unpickle ExportJob.query. Raises signing.BadSignature if it was tampered with."""
+    try:
+        signed = bytes(data).decode('ascii')
+    except UnicodeDecodeError:
+        raise signing.BadSignature("Export query is not signed") from None
+    return signing.loads(signed, salt=QUERY_SALT, serializer=_QuerySerializer)
+
+
+def _get_executor():
+    """Per-process thread pool (recreated after fork)."""
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is not None and _executor_pid == pid:
+        return _executor
+    with _executor_lock:
+        if _executor is None or _executor_pid != pid:
+            workers = max(int(get_fetcher_config()['EXPORT_WORKERS']), 1)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='microsys-export')
+            _executor_pid = pid
+    return _executor
+
+
+def start_export_job(request, queryset, format='xlsx', exclude_fields=None, hidden_fields=None, include_hidden=False, sheet_title="Excel"):
+    """
+    Queue a background export of `queryset` (a QuerySet) for request.user.
+    Takes the same options as fetch_export. Returns the ExportJob; poll
+    export_job_status(job) / the sys/api/exports/<id>/ endpoint for progress.
+    """
+    format = (format or 'xlsx').lower()
+    if format not in EXPORT_FILE_TYPES:
+        raise ValueError(f"Unsupported export format: {format}")
+
+    ExportJob = apps.get_model('microsys', 'ExportJob')
+    model = queryset.model
+    user = getattr(request, 'user', None)
+    job = ExportJob.objects.create(
+        created_by=user if user is not None and user.is_authenticated else None,
+        format=format,
+        app_label=model._meta.app_label,
+        model_name=model._meta.model_name,
+        query=dump_query(queryset.query),
+        options={
+            'exclude_fields': list(exclude_fields or []),
+            'hidden_fields': list(hidden_fields or []),
+            'include_hidden': bool(include_hidden),
+            'sheet_title': sheet_title,
+        },
+    )
+
+    try:
+        if user is not None and user.is_authenticated:
+            log_user_action(request, "EXPORT", model_name=model._meta.verbose_name, details={'job': str(job.pk), 'format': format, 'status': 'queued'})
+    except Exception:
+        logger.exception("Logging export job %s failed", job.pk)
+
+    if get_fetcher_config()['EXPORT_RUNNER'] == 'thread':
+        job_id = job.pk
+        transaction.on_commit(lambda: _get_executor().submit(run_export_job, job_id))
+    return job
+
+
+def run_export_job(job_id):
+    """
+    Claim a pending job and write its file. Returns False if another runner
+    got it first. Safe to call from any thread or process.
+    """
+    ExportJob = apps.get_model('microsys', 'ExportJob')
+    close_old_connections()
+    try:
+        claimed = ExportJob.objects.filter(pk=job_id, status=ExportJob.PENDING).update(
+            status=ExportJob.RUNNING, started_at=now(),
+        )
+        if not claimed:
+            return False
+        job = ExportJob.objects.select_related('created_by').get(pk=job_id)
+        # Run as the requesting user (activity log actor, scope context)
+        with request_context(user=job.created_by):
+            _write_job(job)
+        return True
+    finally:
+        close_old_connections()
+
+
+def _write_job(job):
+    ExportJob = type(job)
+    config = get_fetcher_config()
+    interval = float(config['EXPORT_PROGRESS_INTERVAL'])
+    last_saved = time.monotonic()
+
+    def progress(done):
+        nonlocal last_saved
+        if time.monotonic() - last_saved >= interval:
+            ExportJob.objects.filter(pk=job.pk).update(processed=done)
+            last_saved = time.monotonic()
+
+    try:
+        model = apps.get_model(job.app_label, job.model_name)
+        queryset = model._base_manager.all()
+        # The pickled query already carries the original manager's filtering (soft delete, scope)
+        queryset.query = load_query(job.query)
+        job.total = queryset.count()
+        job.save(update_fields=['total'])
+
+        options = job.options or {}
+        ext = EXPORT_FILE_TYPES[job.format][0]
+        with tempfile.TemporaryFile() as output:
+            count = write_export(
+                output, queryset, job.format,
+                exclude_fields=options.get('exclude_fields'),
+                hidden_fields=options.get('hidden_fields'),
+                include_hidden=options.get('include_hidden', False),
+                sheet_title=options.get('sheet_title') or "Excel",
+                progress=progress,
+            )
+            output.seek(0)
+            filename = f"{model._meta.model_name}_export_{count}.{ext}"
+            job.file.save(filename, File(output), save=False)
+
+        job.filename = filename
+        job.processed = count
+        job.status = ExportJob.DONE
+    except Exception as e:
+        logger.exception("Export job %s failed", job.pk)
+        job.status = ExportJob.FAILED
+        job.error = str(e) or e.__class__.__name__
+    job.finished_at = now()
+    job.save(update_fields=['file', 'filename', 'processed', 'status', 'error', 'finished_at'])
+
+
+def sweep_export_jobs():
+    """
+    Fail jobs left RUNNING by a runner that died (started more than
+    EXPORT_STALE_AFTER seconds ago). Returns how many were marked FAILED.
+    """
+    ExportJob = apps.get_model('microsys', 'ExportJob')
+    stale_after = timedelta(seconds=float(get_fetcher_config()['EXPORT_STALE_AFTER']))
+    swept = ExportJob.objects.filter(status=ExportJob.RUNNING, started_at__lt=now() - stale_after).update(
+        status=ExportJob.FAILED, error="Export runner stopped before the job finished", finished_at=now(),
+    )
+    if swept:
+        logger.warning("Marked %d stale export job(s) as failed", swept)
+    return swept
+
+
+def purge_expired_export_jobs():
+    """
+    Delete finished jobs, and their files, that finished more than
+    EXPORT_RETENTION_HOURS ago. Returns how many rows were deleted.
+    """
+    retention = get_fetcher_config()['EXPORT_RETENTION_HOURS']
+    if retention is None:
+        return 0
+    ExportJob = apps.get_model('microsys', 'ExportJob')
+    expired = list(ExportJob.objects.filter(
+        status__in=[ExportJob.DONE, ExportJob.FAILED],
+        finished_at__lt=now() - timedelta(hours=float(retention)),
+    ).only('pk', 'file'))
+    if not expired:
+        return 0
+    removed = []
+    for job in expired:
+        if job.file:
+            try:
+                job.file.delete(save=False)
+            except OSError:
+                # Keep the row so the next sweep retries the file
+                logger.exception("Could not delete export file %s", job.file.name)
+                continue
+        removed.append(job.pk)
+    purged, _ = ExportJob.objects.filter(pk__in=removed).delete()
+    return purged
+
+
+def run_pending_export_jobs(limit=None):
+    """
+    Run pending jobs oldest first (the `command` runner). Returns how many this call ran.
+    Sweeps stale RUNNING jobs and expired finished jobs first. Under the 'thread' runner only jobs pending for
+    longer than EXPORT_ORPHAN_AFTER are run: their on_commit submit died with its process.
+    """
+    ExportJob = apps.get_model('microsys', 'ExportJob')
+    config = get_fetcher_config()
+    sweep_export_jobs()
+    purge_expired_export_jobs()
+    pending = ExportJob.objects.filter(status=ExportJob.PENDING)
+    if config['EXPORT_RUNNER'] == 'thread':
+        pending = pending.filter(created_at__lt=now() - timedelta(seconds=float(config['EXPORT_ORPHAN_AFTER'])))
+    pending = pending.order_by('created_at').values_list('pk', flat=True)
+    if limit:
+        pending = pending[:limit]
+    return sum(1 for job_id in list(pending) if run_export_job(job_id))
+
+
+def export_job_status(job):
+    """JSON-ready progress of a job (what the sys/api/exports/ endpoints return)."""
+    done = job.status == job.DONE and bool(job.file)
+    return {
+        'id': str(job.pk),
+        'status': job.status,
+        'format': job.format,
+        'model': f"{job.app_label}.{job.model_name}",
+        'total': job.total,
+        'processed': job.processed,
+        'percent': job.percent,
+        'filename': job.filename or None,
+        'error': job.error or None,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'download_url': reverse('api_export_job_download', args=[job.pk]) if done else None,
+    }
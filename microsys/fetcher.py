@@ -1,15 +1,65 @@
 # Fundemental imports
 #####################################################################
-from django.http import HttpResponse, HttpResponseRedirect
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import FileResponse, HttpResponse, HttpResponseRedirect, StreamingHttpResponse
 from django.db.models.query import QuerySet
 from django.contrib import messages
-from django.db.models import FileField
-from io import BytesIO
+from django.db.models import FileField, Model
+from django.db.models.fields.files import FieldFile
+from django.utils.http import content_disposition_header
+from urllib.parse import quote
+import csv
+import json
+import logging
 import mimetypes
 import openpyxl
+import re
+import tempfile
+import time
 import zipfile
 from .utils import log_user_action
 
+logger = logging.getLogger('microsys')
+
+FETCHER_DEFAULTS = {
+    # Bytes per read when streaming files to the client
+    'CHUNK_SIZE': 64 * 1024,
+    # Hand local files to the web server: None, 'x-sendfile' (Apache/lighttpd) or 'x-accel-redirect' (nginx)
+    'SENDFILE': None,
+    # nginx `internal` location aliased to MEDIA_ROOT (X-Accel-Redirect only)
+    'SENDFILE_URL': '/protected/',
+    # Already-compressed types are stored in ZIP downloads; everything else is deflated
+    'ZIP_STORED_EXTENSIONS': (
+        'pdf', 'jpg', 'jpeg', 'png', 'gif', 'webp', 'heic', 'tif', 'tiff',
+        'zip', 'gz', 'tgz', 'bz2', 'xz', '7z', 'rar',
+        'docx', 'xlsx', 'pptx', 'odt', 'ods', 'odp',
+        'mp3', 'mp4', 'm4a', 'mov', 'avi', 'mkv', 'webm',
+    ),
+    # Rows fetched per database round trip by exports
+    'EXPORT_CHUNK_SIZE': 2000,
+    # Exports are built in memory up to this size, then spill to a temp file
+    'EXPORT_SPOOL_SIZE': 10 * 1024 * 1024,
+    # Background export jobs (microsys.exportjobs): 'thread' pool or 'command' (microsys_run_exports)
+    'EXPORT_RUNNER': 'thread',
+    'EXPORT_WORKERS': 2,
+    # Minimum seconds between progress writes of a running job
+    'EXPORT_PROGRESS_INTERVAL': 1.0,
+    # Seconds after which a RUNNING job is taken as abandoned by a dead runner and marked FAILED
+    'EXPORT_STALE_AFTER': 6 * 60 * 60,
+    # 'thread' runner: seconds after which microsys_run_exports runs a PENDING job itself
+    # (the process that queued it exited before the pool got to it)
+    'EXPORT_ORPHAN_AFTER': 5 * 60,
+    # Hours a finished (done or failed) job and its file are kept before the sweep deletes them (None keeps them)
+    'EXPORT_RETENTION_HOURS': 24,
+}
+
+
+def get_fetcher_config():
+    """Return MICROSYS_FETCHER merged over the defaults."""
+    return {**FETCHER_DEFAULTS, **getattr(settings, 'MICROSYS_FETCHER', {})}
+
+
 # Universal Downloader
 #####################################################################
 def fetch_file(request, data, file_type=None):
@@ -84,7 +134,7 @@ def fetch_file(request, data, file_type=None):
         # Serve Single File
         target = files_to_download[0]
         _log_download_action(request, target['filename'], model_name=model_name)
-        return _serve_file(target['file'], target['filename'])
+        return _serve_file(target['file'], target['filename'], request=request)
     else:
         # Serve Zip
         # Name zip based on first record's model and range
@@ -187,29 +237,171 @@ def _sanitize_filename(filename):
     return filename.replace('/', '_').replace('\\', '_').replace(':', '-').replace(' ', '_')
 
 
-def _serve_file(file_obj, filename):
-    """Helper: Serve a single file with correct content type."""
+def _guess_content_type(name):
     try:
-        content_type, _ = mimetypes.guess_type(file_obj.name)
+        content_type, _ = mimetypes.guess_type(name)
     except Exception:
-        content_type = 'application/octet-stream'
-        
-    if not content_type:
-        content_type = 'application/octet-stream'
-        
+        content_type = None
+    return content_type or 'application/octet-stream'
+
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+def _parse_range(header, size):
+    """
+    Resolve a single `Range: bytes=first-last` header against a file size.
+    Returns (start, end) inclusive, None to serve the whole file (missing,
+    malformed or multi-range headers), or False if the range is unsatisfiable.
+    """
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = int(last) if last else size - 1
+        if start >= size:
+            return False
+        if end < start:
+            return None
+        return start, min(end, size - 1)
+    if last:
+        # Suffix range: the final N bytes
+        length = int(last)
+        if not length:
+            return False
+        return max(size - length, 0), size - 1
+    return None
+
+
+class _FileRangeIterator:
+    """Yields `length` bytes of an open file from `start`, in chunks; closes the file when done."""
+
+    def __init__(self, f, start, length, chunk_size):
+        self.f = f
+        self.start = start
+        self.length = length
+        self.chunk_size = chunk_size
+
+    def __iter__(self):
+        self.f.seek(self.start)
+        remaining = self.length
+        try:
+            while remaining > 0:
+                chunk = self.f.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            self.close()
+
+    def close(self):
+        self.f.close()
+
+
+def _sendfile_response(file_obj, content_type, config):
+    """Let the web server send a local file (X-Sendfile / X-Accel-Redirect); None if not configured/possible."""
+    mode = (config.get('SENDFILE') or '').lower()
+    if mode not in ('x-sendfile', 'x-accel-redirect'):
+        return None
+    try:
+        path = file_obj.path  # Only local (FileSystemStorage) files have a path
+    except (NotImplementedError, AttributeError, ValueError):
+        return None
+
     response = HttpResponse(content_type=content_type)
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
-    
-    with file_obj.open('rb') as f:
-        response.write(f.read())
-        
+    if mode == 'x-sendfile':
+        response['X-Sendfile'] = path
+    else:
+        location = file_obj.name.replace('\\', '/').lstrip('/')
+        response['X-Accel-Redirect'] = config['SENDFILE_URL'].rstrip('/') + '/' + quote(location)
     return response
 
 
-def _serve_zip(files_list, zip_filename):
-    """Helper: Create and serve a zip file from list of file objects."""
-    zip_buffer = BytesIO()
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+def _serve_file(file_obj, filename, request=None):
+    """
+    Helper: Serve a single file with correct content type.
+    The file is streamed in chunks (never read whole into memory), with
+    Content-Length and single-range `Range` support for resumable downloads.
+    Local files can be handed to the web server instead (MICROSYS_FETCHER['SENDFILE']).
+    """
+    content_type = _guess_content_type(file_obj.name)
+    disposition = content_disposition_header(True, filename)
+    config = get_fetcher_config()
+
+    response = _sendfile_response(file_obj, content_type, config)
+    if response is not None:
+        response['Content-Disposition'] = disposition
+        return response
+
+    try:
+        size = file_obj.size
+    except Exception:
+        size = None
+
+    byte_range = None
+    # If-Range validators aren't tracked, so a conditional range gets the full file
+    if request is not None and size and 'HTTP_IF_RANGE' not in request.META:
+        header = request.META.get('HTTP_RANGE')
+        if header:
+            byte_range = _parse_range(header, size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    f = file_obj.open('rb')
+    if byte_range:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _FileRangeIterator(f, start, length, config['CHUNK_SIZE']),
+            status=206, content_type=content_type,
+        )
+        response['Content-Length'] = str(length)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    else:
+        response = FileResponse(f, content_type=content_type)
+        response.block_size = config['CHUNK_SIZE']
+        if size is not None:
+            response['Content-Length'] = str(size)
+
+    if size is not None:
+        response['Accept-Ranges'] = 'bytes'
+    response['Content-Disposition'] = disposition
+    return response
+
+
+class _ZipStream:
+    """Write-only sink for ZipFile; the streaming generator drains it after every write."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _iter_zip(files_list, config):
+    """
+    Yield a ZIP archive of `files_list` piece by piece. Each member is read and
+    compressed in CHUNK_SIZE blocks, so memory stays flat whatever the total size.
+    """
+    chunk_size = config['CHUNK_SIZE']
+    stored = {ext.lower().lstrip('.') for ext in config['ZIP_STORED_EXTENSIONS']}
+    sink = _ZipStream()
+
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as zf:
         seen_names = set()
         for item in files_list:
             fname = item['filename']
@@ -219,58 +411,71 @@ def _serve_zip(files_list, zip_filename):
                 fname = f"{base}_{len(seen_names)}.{ext}"
             
             seen_names.add(fname)
-            
+
             try:
-                with item['file'].open('rb') as f:
-                    zf.writestr(fname, f.read())
+                f = item['file'].open('rb')
             except Exception:
                 # If a file fails to open types (e.g. missing on disk), skip it and continue
                 continue
-                
-    zip_buffer.seek(0)
-    response = HttpResponse(zip_buffer.getvalue(), content_type="application/zip")
-    response['Content-Disposition'] = f'attachment; filename="{zip_filename}"'
-    return response
 
+            try:
+                size = item['file'].size
+            except Exception:
+                size = None
+            info = zipfile.ZipInfo(fname, date_time=time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_STORED if fname.rsplit('.', 1)[-1].lower() in stored else zipfile.ZIP_DEFLATED
+            try:
+                with f, zf.open(info, 'w', force_zip64=size is None or size >= zipfile.ZIP64_LIMIT) as dest:
+                    while True:
+                        chunk = f.read(chunk_size)
+                        if not chunk:
+                            break
+                        dest.write(chunk)
+                        data = sink.drain()
+                        if data:
+                            yield data
+            except Exception:
+                # Read failed midway: the member is closed as written so far and the archive stays valid
+                pass
+            data = sink.drain()
+            if data:
+                yield data
 
-# Excel Exporter
-#####################################################################
-def fetch_excel(request, queryset, exclude_fields=None, hidden_fields=None, sheet_title="Excel"):
+    # Central directory
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def _serve_zip(files_list, zip_filename):
     """
-    Export a queryset to Excel with Smart Hiding.
-    
-    Args:
-    - queryset: Data to export.
-    - exclude_fields: List of field names to completely omit.
-    - hidden_fields: List of field names to include but hide the column.
-                     (FileFields and Auto-Timestamps are automatically hidden).
-    - sheet_title: Title of the worksheet.
+    Helper: Create and serve a zip file from list of file objects.
+    The archive is streamed while it is built; members whose extension is in
+    MICROSYS_FETCHER['ZIP_STORED_EXTENSIONS'] are stored, the rest deflated.
     """
-    if not queryset:
-        messages.error(request, "لا توجد بيانات للتصدير.")
-        return HttpResponseRedirect(request.META.get('HTTP_REFERER', '/'))
+    response = StreamingHttpResponse(_iter_zip(files_list, get_fetcher_config()), content_type="application/zip")
+    response['Content-Disposition'] = content_disposition_header(True, zip_filename)
+    return response
 
-    # Normalize to iterable if list passed
-    data_list = queryset
-    model = None
-    if isinstance(queryset, QuerySet):
-        model = queryset.model
-    elif isinstance(queryset, list) and queryset:
-        model = queryset[0].__class__
-        
-    if not model:
-         messages.error(request, "تعذر تحديد نموذج البيانات.")
-         return HttpResponseRedirect(request.META.get('HTTP_REFERER', '/'))
 
-    from openpyxl.utils import get_column_letter
-    from django.db.models import FileField, DateTimeField
+# Export Engine
+#####################################################################
+# Related labels remembered per FK column during one export (cleared when full)
+EXPORT_LABEL_MEMO_SIZE = 10000
+
+
+def _export_columns(model, exclude_fields=None, hidden_fields=None):
+    """
+    Columns exported for a model, in field order.
+    Returns a list of {'name', 'verbose', 'hidden', 'field'}; FileFields,
+    auto timestamps and `hidden_fields` are flagged hidden.
+    """
+    from django.db.models import DateTimeField
 
-    # Prepare Field Lists
     exclude_fields = set(exclude_fields or [])
     user_hidden_fields = set(hidden_fields or [])
     
-    final_fields = [] # List of (field_name, verbose_name, is_hidden)
-    
+    columns = []
     for field in model._meta.fields:
         if field.name in exclude_fields:
             continue
@@ -290,71 +495,447 @@ def fetch_excel(request, queryset, exclude_fields=None, hidden_fields=None, shee
             if field.auto_now or field.auto_now_add:
                 is_hidden = True
         
-        final_fields.append({
+        columns.append({
             'name': field.name,
             'verbose': field.verbose_name.title(),
-            'hidden': is_hidden
+            'hidden': is_hidden,
+            'field': field,
         })
+    return columns
 
-    # Create Workbook
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = sheet_title or "Export"
 
-    # Write Header Row
-    ws.append([f['verbose'] for f in final_fields])
+def _export_cell(val):
+    # Handle FileField (use the stored name)
+    if isinstance(val, FieldFile):
+        val = val.name
+    # Convert Model Instances / Enums / Dates to string
+    return str(val) if val is not None else ""
 
-    # Write Data Rows
-    for obj in data_list:
-        row = []
-        for field_info in final_fields:
-            name = field_info['name']
-            
-            # Simple attribute access
-            val = getattr(obj, name, "")
-            
-            # Handle FileField (use url or name)
-            if hasattr(val, 'url'):
-                val = val.name # or val.url if you prefer full path
-            
-            # Convert Model Instances / Enums / Dates to string
-            if val is not None:
-                row.append(str(val))
-            else:
-                row.append("")
-        ws.append(row)
 
-    # Apply Hidden Columns
+def _export_value(val):
+    """Like _export_cell but keeps native types (numbers, dates, None) for typed formats."""
+    if isinstance(val, FieldFile):
+        return val.name or None
+    if isinstance(val, Model):
+        return str(val)
+    return val
+
+
+def _iter_export_rows(data, columns, chunk_size, convert=_export_cell, progress=None):
+    """
+    Yield one list of cells per record (strings by default, see `convert`).
+    QuerySets are read with values_list().iterator() (no model instances);
+    FK columns are turned into labels with one in_bulk() query per column
+    and chunk, memoized across chunks. Lists of instances use getattr.
+    progress(rows_done) is called after every chunk.
+    """
+    done = 0
+    if not isinstance(data, QuerySet):
+        for obj in data:
+            yield [convert(getattr(obj, col['name'], "")) for col in columns]
+            done += 1
+            if progress and done % chunk_size == 0:
+                progress(done)
+        if progress:
+            progress(done)
+        return
+
+    relations = [
+        (index, col['field']) for index, col in enumerate(columns)
+        if col['field'].is_relation
+    ]
+    labels = {index: {} for index, _ in relations}
+    rows = data.values_list(*[col['field'].attname for col in columns]).iterator(chunk_size=chunk_size)
+
+    while True:
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                break
+        if not chunk:
+            if progress:
+                progress(done)
+            return
+
+        for index, field in relations:
+            memo = labels[index]
+            missing = {row[index] for row in chunk if row[index] is not None and row[index] not in memo}
+            if not missing:
+                continue
+            if len(memo) + len(missing) > EXPORT_LABEL_MEMO_SIZE:
+                memo.clear()
+            # Same manager FK attribute access uses
+            target = field.target_field
+            field_name = 'pk' if target.primary_key else target.name
+            for key, obj in field.related_model._base_manager.in_bulk(missing, field_name=field_name).items():
+                memo[key] = str(obj)
+
+        for row in chunk:
+            yield [
+                convert(labels[index].get(val, val) if index in labels and val is not None else val)
+                for index, val in enumerate(row)
+            ]
+        done += len(chunk)
+        if progress:
+            progress(done)
+
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _encoded(pieces, buffer_size):
+    """UTF-8 encode text pieces, yielding them in blocks of about `buffer_size` bytes."""
+    buffer, length = [], 0
+    for piece in pieces:
+        data = piece.encode('utf-8')
+        buffer.append(data)
+        length += len(data)
+        if length >= buffer_size:
+            yield b''.join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def _export_model(request, queryset):
+    """Resolve the model of an export source; None (with a message) if empty or unknown."""
+    if isinstance(queryset, QuerySet):
+        if not queryset.exists():
+            messages.error(request, "لا توجد بيانات للتصدير.")
+            return None
+        return queryset.model
+
+    if not queryset:
+        messages.error(request, "لا توجد بيانات للتصدير.")
+        return None
+    if isinstance(queryset, list):
+        return queryset[0].__class__
+
+    messages.error(request, "تعذر تحديد نموذج البيانات.")
+    return None
+
+
+def _log_export_action(request, model, filename, count, **details):
+    """Helper to log export actions."""
+    try:
+        if request.user.is_authenticated:
+            log_user_action(request, "EXPORT", model_name=model._meta.verbose_name, details={'filename': filename, 'count': count, **details})
+    except Exception:
+        # Don't fail download if logging fails
+        logger.exception("Logging export of %s failed", filename)
+
+
+# Excel Exporter
+#####################################################################
+def _write_xlsx(output, queryset, columns, config, sheet_title="Excel", progress=None):
+    """Write a write-only workbook (hidden columns applied) to `output`. Returns the row count."""
+    from openpyxl.utils import get_column_letter
+
+    # Create Workbook (write-only: rows go straight to disk-backed XML)
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_title or "Export")
+
+    # Apply Hidden Columns (write-only sheets need them before the first row)
     # openpyxl columns are 1-indexed (A=1, B=2...)
-    for idx, field_info in enumerate(final_fields, start=1):
+    for idx, field_info in enumerate(columns, start=1):
         if field_info['hidden']:
             col_letter = get_column_letter(idx)
             ws.column_dimensions[col_letter].hidden = True
 
+    # Write Header Row
+    ws.append([f['verbose'] for f in columns])
+
+    # Write Data Rows
+    obj_count = 0
+    for row in _iter_export_rows(queryset, columns, config['EXPORT_CHUNK_SIZE'], progress=progress):
+        ws.append(row)
+        obj_count += 1
+
+    wb.save(output)
+    return obj_count
+
+
+def fetch_excel(request, queryset, exclude_fields=None, hidden_fields=None, sheet_title="Excel"):
+    """
+    Export a queryset to Excel with Smart Hiding.
+    
+    Args:
+    - queryset: Data to export.
+    - exclude_fields: List of field names to completely omit.
+    - hidden_fields: List of field names to include but hide the column.
+                     (FileFields and Auto-Timestamps are automatically hidden).
+    - sheet_title: Title of the worksheet.
+
+    Rows are streamed from the database in chunks into a write-only workbook,
+    saved to a spooled temp file and served with FileResponse.
+    """
+    model = _export_model(request, queryset)
+    if not model:
+        return HttpResponseRedirect(request.META.get('HTTP_REFERER', '/'))
+
+    config = get_fetcher_config()
+    final_fields = _export_columns(model, exclude_fields, hidden_fields)
+
+    output = tempfile.SpooledTemporaryFile(max_size=config['EXPORT_SPOOL_SIZE'])
+    obj_count = _write_xlsx(output, queryset, final_fields, config, sheet_title=sheet_title)
+
     # Filename generation
-    obj_count = len(data_list)
     filename = f"{model._meta.model_name}_export_{obj_count}.xlsx"
 
     # Log Action
-    try:
-        if request.user.is_authenticated:
-            log_user_action(request, "EXPORT", model_name=model._meta.verbose_name, details={'filename': filename, 'count': obj_count})
-    except Exception as e:
-        # Don't fail download if logging fails
-        print(f"Logging failed: {e}")
+    _log_export_action(request, model, filename, obj_count)
 
-    response = HttpResponse(
+    output.seek(0)
+    response = FileResponse(
+        output,
         content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
     )
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
-    wb.save(response)
+    response['Content-Disposition'] = content_disposition_header(True, filename)
+    return response
+
+# Fast Export Formats
+#####################################################################
+class _Echo:
+    """File-like object whose write() hands the line back (csv.writer without a buffer)."""
+
+    def write(self, value):
+        return value
+
+
+def _export_filename(model, count, ext):
+    """`<model>_export_<count>.<ext>`; streamed exports don't know the count up front (None)."""
+    if count is None:
+        return f"{model._meta.model_name}_export.{ext}"
+    return f"{model._meta.model_name}_export_{count}.{ext}"
+
+
+def _csv_lines(queryset, columns, config, progress=None):
+    """CSV text, line by line (UTF-8 BOM first so Excel detects the encoding)."""
+    writer = csv.writer(_Echo())
+    yield '\ufeff'
+    yield writer.writerow([str(col['verbose']) for col in columns])
+    for row in _iter_export_rows(queryset, columns, config['EXPORT_CHUNK_SIZE'], progress=progress):
+        yield writer.writerow(row)
+
+
+def _jsonl_lines(queryset, columns, config, progress=None):
+    """JSON Lines text: one object per record keyed by field name."""
+    names = [col['name'] for col in columns]
+    for row in _iter_export_rows(queryset, columns, config['EXPORT_CHUNK_SIZE'], convert=_export_value, progress=progress):
+        yield json.dumps(dict(zip(names, row)), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def _streamed_export(request, model, queryset, columns, config, format, lines):
+    """
+    Stream `lines` as a download. No COUNT(*) runs up front: the export is
+    logged with the rows actually sent once the stream ends.
+    """
+    filename = _export_filename(model, None, format)
+    sent = 0
+
+    def track(done):
+        nonlocal sent
+        sent = done
+
+    def stream():
+        try:
+            yield from _encoded(lines(queryset, columns, config, progress=track), config['CHUNK_SIZE'])
+        finally:
+            _log_export_action(request, model, filename, sent, format=format)
+
+    response = StreamingHttpResponse(stream(), content_type=EXPORT_FILE_TYPES[format][1])
+    response['Content-Disposition'] = content_disposition_header(True, filename)
+    return response
+
+
+def _export_csv(request, model, queryset, columns, config):
+    """Streamed CSV."""
+    return _streamed_export(request, model, queryset, columns, config, 'csv', _csv_lines)
+
+
+def _export_jsonl(request, model, queryset, columns, config):
+    """Streamed JSON Lines."""
+    return _streamed_export(request, model, queryset, columns, config, 'jsonl', _jsonl_lines)
+
+
+_PARQUET_INT_TYPES = {
+    'AutoField', 'BigAutoField', 'SmallAutoField',
+    'IntegerField', 'BigIntegerField', 'SmallIntegerField',
+    'PositiveIntegerField', 'PositiveBigIntegerField', 'PositiveSmallIntegerField',
+}
+
+def _parquet_type(field, pa):
+    """Arrow type of an export column; FK labels and anything unmapped are strings."""
+    if field.is_relation:
+        return pa.string()
+    internal = field.get_internal_type()
+    if internal in _PARQUET_INT_TYPES:
+        return pa.int64()
+    if internal == 'FloatField':
+        return pa.float64()
+    if internal == 'BooleanField':
+        return pa.bool_()
+    if internal == 'DateField':
+        return pa.date32()
+    if internal == 'DateTimeField':
+        return pa.timestamp('us', tz='UTC' if settings.USE_TZ else None)
+    if internal == 'DecimalField' and field.max_digits and field.max_digits <= 38:
+        return pa.decimal128(field.max_digits, field.decimal_places or 0)
+    return pa.string()
+
+
+def _parquet_text(val):
+    if val is None or isinstance(val, str):
+        return val
+    if isinstance(val, (dict, list)):
+        return json.dumps(val, cls=DjangoJSONEncoder, ensure_ascii=False)
+    return str(val)
+
+
+def _write_parquet(output, queryset, columns, config, progress=None):
+    """
+    Write Parquet to `output` in record batches of EXPORT_CHUNK_SIZE rows.
+    Returns the row count. Raises ImportError without pyarrow.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(col['name'], _parquet_type(col['field'], pa)) for col in columns])
+    text_columns = [index for index, arrow_field in enumerate(schema) if pa.types.is_string(arrow_field.type)]
+
+    count = 0
+    with pq.ParquetWriter(output, schema) as writer:
+        rows = _iter_export_rows(queryset, columns, config['EXPORT_CHUNK_SIZE'], convert=_export_value, progress=progress)
+        for chunk in _chunked(rows, config['EXPORT_CHUNK_SIZE']):
+            values = [list(column) for column in zip(*chunk)]
+            for index in text_columns:
+                values[index] = [_parquet_text(val) for val in values[index]]
+            writer.write_batch(pa.RecordBatch.from_arrays(
+                [pa.array(column, type=arrow_field.type) for column, arrow_field in zip(values, schema)],
+                schema=schema,
+            ))
+            count += len(chunk)
+    return count
+
+
+def _export_parquet(request, model, queryset, columns, config):
+    """Parquet (requires pyarrow)."""
+    output = tempfile.SpooledTemporaryFile(max_size=config['EXPORT_SPOOL_SIZE'])
+    try:
+        count = _write_parquet(output, queryset, columns, config)
+    except ImportError:
+        output.close()
+        messages.error(request, "تصدير Parquet يتطلب تثبيت pyarrow.")
+        return HttpResponseRedirect(request.META.get('HTTP_REFERER', '/'))
+
+    filename = _export_filename(model, count, 'parquet')
+    _log_export_action(request, model, filename, count, format='parquet')
+
+    output.seek(0)
+    response = FileResponse(output, content_type='application/vnd.apache.parquet')
+    response['Content-Disposition'] = content_disposition_header(True, filename)
     return response
 
+
+# Exporters by format: fn(request, model, queryset, columns, config) -> response ('xlsx' is fetch_excel)
+EXPORT_FORMATS = {
+    'csv': _export_csv,
+    'jsonl': _export_jsonl,
+    'parquet': _export_parquet,
+}
+
+
+def fetch_export(request, queryset, format='csv', exclude_fields=None, hidden_fields=None, include_hidden=False, sheet_title="Excel"):
+    """
+    Export a queryset in the requested format: 'csv', 'xlsx', 'parquet' or 'jsonl'.
+
+    Uses the same column selection as fetch_excel. Flat formats cannot hide
+    columns, so hidden ones (hidden_fields, FileFields, auto timestamps) are
+    left out unless include_hidden=True. CSV and JSONL stream straight from
+    the database; Parquet needs pyarrow and is written in record batches.
+    """
+    format = (format or 'csv').lower()
+    if format == 'xlsx':
+        return fetch_excel(request, queryset, exclude_fields=exclude_fields, hidden_fields=hidden_fields, sheet_title=sheet_title)
+
+    exporter = EXPORT_FORMATS.get(format)
+    if exporter is None:
+        messages.error(request, f"صيغة التصدير غير مدعومة: {format}")
+        return HttpResponseRedirect(request.META.get('HTTP_REFERER', '/'))
+
+    model = _export_model(request, queryset)
+    if not model:
+        return HttpResponseRedirect(request.META.get('HTTP_REFERER', '/'))
+
+    columns = _format_columns(model, format, exclude_fields, hidden_fields, include_hidden)
+    return exporter(request, model, queryset, columns, get_fetcher_config())
+
+
+def _format_columns(model, format, exclude_fields=None, hidden_fields=None, include_hidden=False):
+    """Export columns for a format: XLSX keeps hidden columns (hidden), flat formats drop them."""
+    columns = _export_columns(model, exclude_fields, hidden_fields)
+    if format == 'xlsx' or include_hidden:
+        return columns
+    return [col for col in columns if not col['hidden']]
+
+
+# File extension and content type per export format
+EXPORT_FILE_TYPES = {
+    'csv': ('csv', 'text/csv; charset=utf-8'),
+    'jsonl': ('jsonl', 'application/x-ndjson'),
+    'parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'xlsx': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
+
+
+def write_export(output, queryset, format='csv', exclude_fields=None, hidden_fields=None, include_hidden=False, sheet_title="Excel", progress=None):
+    """
+    Write an export of `queryset` to the binary file `output` (no request
+    needed; used by background export jobs). Same formats and column rules
+    as fetch_export. progress(rows_done) is called as chunks are written.
+    Returns the number of rows written.
+    """
+    format = (format or 'csv').lower()
+    if format not in EXPORT_FILE_TYPES:
+        raise ValueError(f"Unsupported export format: {format}")
+
+    config = get_fetcher_config()
+    model = queryset.model if isinstance(queryset, QuerySet) else queryset[0].__class__
+    columns = _format_columns(model, format, exclude_fields, hidden_fields, include_hidden)
+
+    if format == 'xlsx':
+        return _write_xlsx(output, queryset, columns, config, sheet_title=sheet_title, progress=progress)
+    if format == 'parquet':
+        return _write_parquet(output, queryset, columns, config, progress=progress)
+
+    count = 0
+    def track(done):
+        nonlocal count
+        count = done
+        if progress:
+            progress(done)
+
+    lines = _csv_lines if format == 'csv' else _jsonl_lines
+    for data in _encoded(lines(queryset, columns, config, progress=track), config['CHUNK_SIZE']):
+        output.write(data)
+    return count
+
+
 def _log_download_action(request, filename, model_name="Document", count=1):
     """Helper to log download actions."""
     try:
         if not request.user.is_authenticated:
             return
         log_user_action(request, "DOWNLOAD", model_name=model_name, details={'filename': filename, 'count': count})
-    except Exception as e:
-        print(f"Logging failed: {e}")
+    except Exception:
+        # Don't fail download if logging fails
+        logger.exception("Logging download of %s failed", filename)
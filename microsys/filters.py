@@ -8,6 +8,7 @@ from django.db.models import Q
 from django.apps import apps
 from microsys.utils import is_scope_enabled
 from microsys.translations import get_strings
+from microsys.logarchive import get_hot_cutoff, list_archive_months
 from django.conf import settings as django_settings
 
 User = get_user_model()
@@ -70,8 +71,11 @@ class UserActivityLogFilter(django_filters.FilterSet):
             self.filters['scope'].extra['empty_label'] = s.get('filter_all', 'الكل')
             self.filters['scope'].label = s.get('filter_scope', 'النطاق')
         
-        years = self.Meta.model.objects.dates('created_at', 'year').distinct()
-        self.filters['year'].extra['choices'] = [(year.year, year.year) for year in years]
+        years = {year.year for year in self.Meta.model.objects.dates('created_at', 'year').distinct()}
+        # Years that only live in archive tables (see microsys.logarchive)
+        if get_hot_cutoff() is not None:
+            years.update(year for year, month in list_archive_months())
+        self.filters['year'].extra['choices'] = [(year, year) for year in sorted(years)]
         self.filters['year'].field.widget.attrs.update({
             'class': 'auto-submit-filter'
         })
@@ -0,0 +1,329 @@
+"""
+Retention and archiving for UserActivityLog.
+
+Rows older than the hot window are moved out of `microsys_useractivitylog`
+by the `microsys_archive_logs` management command, either into monthly
+archive tables (`microsys_useractivitylog_YYYYMM`) or into gzipped JSONL
+files (one per month). Rows are copied and deleted in chunks, each chunk in
+its own transaction.
+
+Table archives stay queryable: `UserActivityLogView` reads only the hot table
+unless the date filter reaches back past the hot window, in which case the
+matching monthly tables are UNIONed in. JSONL archives are offline storage.
+
+    MICROSYS_ACTIVITY_LOG = {
+        'HOT_DAYS': 90,              # rows older than this are archived (None disables)
+        'ARCHIVE_BACKEND': 'table',  # 'table' or 'jsonl'
+        'ARCHIVE_DIR': BASE_DIR / 'log_archive',  # jsonl backend only
+        'ARCHIVE_CHUNK_SIZE': 5000,
+    }
+"""
+import gzip
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from datetime import date, datetime, time, timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from .cache_versions import bump_cache_generation, versioned_key
+from .logsink import get_activity_log_config
+from .managers import ScopedManager
+
+logger = logging.getLogger('microsys')
+
+ARCHIVE_TABLE_PREFIX = 'microsys_useractivitylog_'
+_ARCHIVE_TABLE_RE = re.compile(r'^microsys_useractivitylog_(\d{4})(\d{2})$')
+
+# Archive model classes, built once per process and keyed by (year, month)
+_archive_models = {}
+_archive_models_lock = threading.Lock()
+# Archive tables known to exist (skips introspection on every chunk)
+_existing_tables = set()
+
+# The month list is cached under the 'log_archive' generation, which is bumped
+# whenever an archive table is created; the TTL only covers tables dropped by hand
+ARCHIVE_MONTHS_TTL = 24 * 60 * 60
+
+
+def get_hot_cutoff():
+    """
+    Start of the hot window, or None when archiving is disabled.
+    Truncated to the hour so queries filtered on it (and the counts cached
+    by their SQL) stay the same between requests.
+    """
+    hot_days = get_activity_log_config().get('HOT_DAYS')
+    if not hot_days:
+        return None
+    cutoff = timezone.now() - timedelta(days=int(hot_days))
+    return cutoff.replace(minute=0, second=0, microsecond=0)
+
+
+def get_archive_dir():
+    """Directory for JSONL archives (ARCHIVE_DIR, else <BASE_DIR>/log_archive)."""
+    archive_dir = get_activity_log_config().get('ARCHIVE_DIR')
+    if not archive_dir:
+        archive_dir = os.path.join(str(getattr(settings, 'BASE_DIR', os.getcwd())), 'log_archive')
+    return str(archive_dir)
+
+
+def _log_model():
+    return apps.get_model('microsys', 'UserActivityLog')
+
+
+def get_archive_model(year, month):
+    """
+    Unmanaged model mirroring UserActivityLog for one monthly archive table.
+    FKs keep their columns but drop DB constraints and reverse accessors.
+    """
+    key = (year, month)
+    model = _archive_models.get(key)
+    if model is not None:
+        return model
+    with _archive_models_lock:
+        if key not in _archive_models:
+            _archive_models[key] = _build_archive_model(year, month)
+    return _archive_models[key]
+
+
+def _build_archive_model(year, month):
+    source = _log_model()
+    attrs = {'__module__': __name__}
+    for field in source._meta.concrete_fields:
+        name, path, args, kwargs = field.deconstruct()
+        if field.is_relation:
+            kwargs['related_name'] = '+'
+            kwargs['db_constraint'] = False
+        # Archived timestamps are copied verbatim
+        kwargs.pop('auto_now', None)
+        kwargs.pop('auto_now_add', None)
+        attrs[name] = field.__class__(*args, **kwargs)
+
+    stamp = f'{year:04d}{month:02d}'
+    attrs['objects'] = ScopedManager()
+    attrs['Meta'] = type('Meta', (), {
+        'app_label': 'microsys',
+        'db_table': f'{ARCHIVE_TABLE_PREFIX}{stamp}',
+        'managed': False,
+        'default_permissions': (),
+        'ordering': ('-created_at',),
+        'indexes': [models.Index(fields=['created_at'], name=f'microsys_ual_{stamp}_ts')],
+    })
+    model = type(f'UserActivityLogArchive{stamp}', (models.Model,), attrs)
+    # Query-only class: keep it out of the app registry so get_models(), the delete
+    # Collector (reverse relations of User/Scope) and migrations never see it
+    apps.all_models['microsys'].pop(model._meta.model_name, None)
+    apps.clear_cache()
+    return model
+
+
+def list_archive_months():
+    """(year, month) pairs that have an archive table, oldest first."""
+    key = versioned_key('log_archive', 'microsys_archive_months')
+    months = cache.get(key)
+    if months is None:
+        months = []
+        for table in connection.introspection.table_names():
+            match = _ARCHIVE_TABLE_RE.match(table)
+            if match:
+                months.append((int(match.group(1)), int(match.group(2))))
+        months.sort()
+        cache.set(key, months, ARCHIVE_MONTHS_TTL)
+    return [tuple(month) for month in months]
+
+
+def archive_models_between(start=None, end=None):
+    """Archive models whose month overlaps [start, end] (dates or datetimes, either open)."""
+    start_key = _month_of(start) if start else None
+    end_key = _month_of(end) if end else None
+    return [
+        get_archive_model(*month) for month in list_archive_months()
+        if (start_key is None or month >= start_key) and (end_key is None or month <= end_key)
+    ]
+
+
+def get_archived_log(pk):
+    """
+    Find an archived log row by id (ids are kept when rows are archived).
+    One UNION query over every archive table; None when no table has it.
+    """
+    archives = [get_archive_model(*month) for month in reversed(list_archive_months())]
+    if not archives:
+        return None
+    first, *rest = [archive.objects.filter(pk=pk).order_by() for archive in archives]
+    return first.union(*rest, all=True).first() if rest else first.first()
+
+
+def _ensure_archive_table(model):
+    table = model._meta.db_table
+    if table in _existing_tables:
+        return
+    if table not in connection.introspection.table_names():
+        with connection.schema_editor() as editor:
+            editor.create_model(model)
+        bump_cache_generation('log_archive')
+    _existing_tables.add(table)
+
+
+def _month_of(value):
+    """(year, month) of a timestamp in the active time zone (archive tables are local months)."""
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return (value.year, value.month)
+
+
+def _row_to_json(obj):
+    data = {}
+    for field in obj._meta.concrete_fields:
+        data[field.attname] = getattr(obj, field.attname)
+    return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def _jsonl_path(month):
+    return os.path.join(get_archive_dir(), f'activity_log_{month[0]:04d}{month[1]:02d}.jsonl.gz')
+
+
+def _write_pending_jsonl(month, rows, first_pk, last_pk):
+    """
+    Write a chunk to its own gzip file next to the month archive.
+    It is appended by _commit_jsonl() only once the chunk's DELETE has
+    committed, so a rolled-back chunk never reaches the archive.
+    """
+    archive_dir = get_archive_dir()
+    os.makedirs(archive_dir, exist_ok=True)
+    path = f'{_jsonl_path(month)}.{first_pk}-{last_pk}.pending'
+    with gzip.open(path, 'wt', encoding='utf-8') as fh:
+        for obj in rows:
+            fh.write(_row_to_json(obj))
+            fh.write('\n')
+    return path
+
+
+def _commit_jsonl(month, pending_path):
+    # Appending adds a new gzip member; readers see one continuous stream
+    try:
+        with open(pending_path, 'rb') as src, open(_jsonl_path(month), 'ab') as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(pending_path)
+    except OSError:
+        # The rows are already deleted: keep the pending file for a manual append
+        logger.exception("Could not append %s to the log archive", pending_path)
+
+
+def _discard_pending(paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            logger.warning("Could not remove pending log archive %s", path)
+
+
+def _delete_rows(model, pks):
+    """Plain DELETE on the hot table: log rows have no dependants to collect."""
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(model._meta.pk.column)
+    placeholders = ', '.join(['%s'] * len(pks))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE {column} IN ({placeholders})', pks)
+
+
+def archive_logs(cutoff, backend='table', chunk_size=5000, dry_run=False):
+    """
+    Move log rows created before `cutoff` to monthly archives.
+    Works in id-ordered chunks; each chunk is copied and deleted in one
+    transaction, so an interrupted run can simply be resumed.
+    Returns {(year, month): rows_moved}.
+    """
+    source = _log_model()
+    manager = source._base_manager  # every row: all scopes, soft-deleted included
+    moved = {}
+    last_pk = 0
+
+    while True:
+        chunk = list(
+            manager.filter(created_at__lt=cutoff, pk__gt=last_pk).order_by('pk')[:chunk_size]
+        )
+        if not chunk:
+            break
+        last_pk = chunk[-1].pk
+
+        by_month = {}
+        for obj in chunk:
+            by_month.setdefault(_month_of(obj.created_at), []).append(obj)
+
+        if dry_run:
+            for month, rows in by_month.items():
+                moved[month] = moved.get(month, 0) + len(rows)
+            continue
+
+        if backend != 'jsonl':
+            # DDL stays outside the copy transaction (SQLite refuses it inside one)
+            for month in by_month:
+                _ensure_archive_table(get_archive_model(*month))
+
+        pending = []
+        try:
+            with transaction.atomic():
+                for month, rows in by_month.items():
+                    if backend == 'jsonl':
+                        path = _write_pending_jsonl(month, rows, chunk[0].pk, last_pk)
+                        pending.append(path)
+                        transaction.on_commit(lambda m=month, p=path: _commit_jsonl(m, p))
+                    else:
+                        archive_model = get_archive_model(*month)
+                        archive_model._base_manager.bulk_create([
+                            archive_model(**{f.attname: getattr(obj, f.attname) for f in source._meta.concrete_fields})
+                            for obj in rows
+                        ], ignore_conflicts=True)
+                    moved[month] = moved.get(month, 0) + len(rows)
+                # No per-row delete signals: the activity-log receivers ignore log rows anyway
+                _delete_rows(source, [obj.pk for obj in chunk])
+        except Exception:
+            _discard_pending(pending)
+            raise
+
+    return moved
+
+
+def _as_datetime(value, end_of_day=False):
+    """Normalize a filter bound (date or datetime) to an aware datetime."""
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time.max if end_of_day else time.min)
+    if settings.USE_TZ and timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+def get_filter_date_range(cleaned_data):
+    """
+    (start, end) requested by UserActivityLogFilter data, from the
+    created_at range and the year filter; either side may be None.
+    """
+    start = _as_datetime(cleaned_data.get('created_at__gte'))
+    end = _as_datetime(cleaned_data.get('created_at__lte'), end_of_day=True)
+    year = cleaned_data.get('year')
+    if year:
+        year = int(year)
+        year_start = _as_datetime(date(year, 1, 1))
+        year_end = _as_datetime(date(year, 12, 31), end_of_day=True)
+        start = max(start, year_start) if start else year_start
+        end = min(end, year_end) if end else year_end
+    return start, end
+
+
+def filter_reaches_archive(cleaned_data, cutoff):
+    """True when the requested date range starts (or ends) before the hot window."""
+    if cutoff is None:
+        return False
+    start, end = get_filter_date_range(cleaned_data)
+    return (start is not None and start < cutoff) or (end is not None and end < cutoff)
@@ -0,0 +1,360 @@
+"""
+Pluggable sinks for UserActivityLog writes.
+
+`UserActivityLog.safe_log()` hands every entry to the configured sink:
+
+- 'sync'   (default) — dedupe query + INSERT inline, inside the caller's request.
+                       Deterministic, use it in tests.
+- 'queued'           — in-process queue drained by a background thread that
+                       `bulk_create`s entries in batches. Flushed at request end
+                       (by ActivityLogMiddleware) and at interpreter shutdown.
+- 'path.to.Sink'     — any BaseLogSink subclass.
+
+Configure via settings:
+
+    MICROSYS_ACTIVITY_LOG = {
+        'SINK': 'queued',
+        'BATCH_SIZE': 500,       # rows per bulk_create
+        'FLUSH_INTERVAL': 1.0,   # seconds between background drains
+        'QUEUE_SIZE': 10000,     # pending entries before writes fall back inline
+        'TRACK_FIELDS': True,    # snapshot field values at load time (no pre-save SELECT)
+        'DEBOUNCE_SIZE': 2048,   # recent entries remembered in-process (0 disables)
+    }
+
+Retention keys (HOT_DAYS, ARCHIVE_*) are documented in microsys.logarchive.
+"""
+import atexit
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import close_old_connections, transaction
+from django.utils.module_loading import import_string
+from django.utils.timezone import now
+
+logger = logging.getLogger('microsys')
+
+ACTIVITY_LOG_DEFAULTS = {
+    'SINK': 'sync',
+    'BATCH_SIZE': 500,
+    'FLUSH_INTERVAL': 1.0,
+    'QUEUE_SIZE': 10000,
+    'TRACK_FIELDS': False,
+    'DEBOUNCE_SIZE': 2048,
+    # Retention / archiving (see microsys.logarchive)
+    'HOT_DAYS': None,
+    'ARCHIVE_BACKEND': 'table',
+    'ARCHIVE_DIR': None,
+    'ARCHIVE_CHUNK_SIZE': 5000,
+}
+
+# Entries with the same dedupe key inside this window are dropped (see safe_log)
+DEDUPE_WINDOW = timedelta(seconds=2)
+
+SINK_ALIASES = {
+    'sync': 'microsys.logsink.SyncLogSink',
+    'queued': 'microsys.logsink.QueuedLogSink',
+}
+
+
+def get_activity_log_config():
+    """Return MICROSYS_ACTIVITY_LOG merged over the defaults."""
+    return {**ACTIVITY_LOG_DEFAULTS, **getattr(settings, 'MICROSYS_ACTIVITY_LOG', {})}
+
+
+def details_digest(details):
+    """Stable SHA-256 of a details payload (None for empty details)."""
+    if not details:
+        return None
+    payload = json.dumps(details, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _dedupe_key(entry):
+    """Identity of a log entry for debounce purposes (mirrors the safe_log lookup)."""
+    user = entry.get('created_by')
+    model_name = entry.get('model_name')
+    return (
+        getattr(user, 'pk', user),
+        entry.get('action'),
+        # verbose names are often lazy; resolve them here, not while hashing under a lock
+        str(model_name) if model_name is not None else None,
+        entry.get('object_id'),
+        entry.get('details_digest'),
+    )
+
+
+class Debouncer:
+    """
+    Process-local LRU of recently written dedupe keys.
+    `seen()` answers True for a key recorded less than DEDUPE_WINDOW ago.
+    Keys are recorded with `record()` only once the entry is actually written
+    or queued, so a rolled-back or failed write does not suppress its retry.
+    """
+
+    def __init__(self, size=2048):
+        self.size = size
+        self._lock = threading.Lock()
+        self._recent = OrderedDict()
+
+    def _is_recent(self, key, stamp):
+        last = self._recent.get(key)
+        return last is not None and stamp - last < DEDUPE_WINDOW
+
+    def seen(self, key):
+        if self.size <= 0:
+            return False
+        with self._lock:
+            return self._is_recent(key, now())
+
+    def record(self, key):
+        """Record a written key. Returns False if it was already recorded inside the window."""
+        if self.size <= 0:
+            return True
+        stamp = now()
+        with self._lock:
+            if self._is_recent(key, stamp):
+                return False
+            self._recent[key] = stamp
+            self._recent.move_to_end(key)
+            while len(self._recent) > self.size:
+                self._recent.popitem(last=False)
+        return True
+
+    def forget(self, key):
+        """Drop a key whose write failed."""
+        with self._lock:
+            self._recent.pop(key, None)
+
+
+class BaseLogSink:
+    """Interface for activity-log sinks."""
+
+    def write(self, model, entry):
+        """Persist (or schedule) one entry. `entry` holds UserActivityLog field kwargs."""
+        raise NotImplementedError
+
+    def flush(self, wait=False):
+        """Push pending entries out. With wait=True, block until they are written."""
+
+    def close(self):
+        """Release background resources once the sink is no longer the active one."""
+
+    def write_inline(self, model, entry):
+        """
+        Insert one entry now, in the caller's transaction, so a later lookup in the
+        same transaction can find it (the User/Profile merge in signals.log_save).
+        """
+        if model.is_recent_duplicate(entry):
+            return None
+        return model.objects.create(**entry)
+
+
+class SyncLogSink(BaseLogSink):
+    """
+    Inline writer: one INSERT per entry. Repeats seen by this process inside
+    the window are dropped without a query; anything else is checked against
+    the table (indexed dedupe lookup) to catch writes from other processes.
+    """
+
+    def __init__(self, debounce_size=2048):
+        self._debouncer = Debouncer(debounce_size)
+
+    def write(self, model, entry):
+        return self.write_inline(model, entry)
+
+    def write_inline(self, model, entry):
+        key = _dedupe_key(entry)
+        if self._debouncer.seen(key):
+            return None
+        obj = super().write_inline(model, entry)
+        if obj is not None:
+            transaction.on_commit(lambda: self._debouncer.record(key))
+        return obj
+
+
+class QueuedLogSink(BaseLogSink):
+    """
+    Background batched writer.
+    Dedupe happens in memory against recently queued keys, so the request
+    thread issues no queries at all. Entries are only queued once the
+    surrounding transaction commits, so `write()` returns None rather than
+    an instance that has no pk yet.
+    """
+
+    def __init__(self, batch_size=500, flush_interval=1.0, queue_size=10000, debounce_size=2048):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        # Always on here: it is the only dedupe this sink does
+        self._debouncer = Debouncer(max(debounce_size, 1))
+        self._pid = None
+        self._thread = None
+        self._queue = None
+        self._wakeup = None
+        self._stop = threading.Event()
+
+    def write(self, model, entry):
+        key = _dedupe_key(entry)
+        if self._debouncer.seen(key):
+            return None
+
+        # Built now so created_at is the time of the action, not of the batch INSERT
+        obj = model(**entry)
+        # Mirror ScopedModel.save(), which bulk_create bypasses
+        obj.updated_by_id = obj.created_by_id
+        transaction.on_commit(lambda: self._enqueue(key, obj))
+        return None
+
+    def write_inline(self, model, entry):
+        key = _dedupe_key(entry)
+        if self._debouncer.seen(key):
+            return None
+        obj = super().write_inline(model, entry)
+        if obj is not None:
+            transaction.on_commit(lambda: self._debouncer.record(key))
+        return obj
+
+    def flush(self, wait=False):
+        if self._queue is None:
+            return
+        if wait:
+            self._drain()
+        else:
+            self._wakeup.set()
+
+    def close(self):
+        """Stop the background writer; anything queued later is written inline."""
+        self._stop.set()
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _ensure_worker(self):
+        """Start (or restart after fork) the background writer thread."""
+        pid = os.getpid()
+        if self._thread is not None and self._pid == pid and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == pid and self._thread.is_alive():
+                return
+            if self._pid != pid:
+                self._queue = queue.Queue(maxsize=self.queue_size)
+                self._wakeup = threading.Event()
+                self._pid = pid
+            self._thread = threading.Thread(target=self._run, name='microsys-log-writer', daemon=True)
+            self._thread.start()
+
+    def _enqueue(self, key, obj):
+        # Repeats inside one transaction all pass write(); only the first is queued
+        if not self._debouncer.record(key):
+            return
+        if self._stop.is_set():
+            # Late on_commit callback on a replaced sink: no worker will pick it up
+            self._write_batch([(key, obj)])
+            return
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((key, obj))
+        except queue.Full:
+            # Backpressure: write in the caller's thread rather than dropping entries
+            self._drain()
+            self._queue.put((key, obj))
+        if self._stop.is_set():
+            # Closed while queueing: the worker may already be gone
+            self._drain()
+        elif self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._drain()
+            close_old_connections()
+
+    def _drain(self):
+        with self._drain_lock:
+            while True:
+                batch = []
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not batch:
+                    return
+                self._write_batch(batch)
+
+    def _write_batch(self, batch):
+        objs = [obj for _, obj in batch]
+        try:
+            type(objs[0])._base_manager.bulk_create(objs)
+        except Exception:
+            logger.exception("microsys: failed to write %d activity log entries", len(batch))
+            # Let a retry of the lost entries through
+            for key, _ in batch:
+                self._debouncer.forget(key)
+
+
+_sink = None
+_sink_lock = threading.Lock()
+
+
+def get_log_sink():
+    """Return the process-wide sink configured by MICROSYS_ACTIVITY_LOG['SINK']."""
+    global _sink
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                config = get_activity_log_config()
+                sink = config['SINK']
+                if isinstance(sink, str):
+                    sink_class = import_string(SINK_ALIASES.get(sink, sink))
+                else:
+                    sink_class = sink
+                if issubclass(sink_class, QueuedLogSink):
+                    _sink = sink_class(
+                        batch_size=config['BATCH_SIZE'],
+                        flush_interval=config['FLUSH_INTERVAL'],
+                        queue_size=config['QUEUE_SIZE'],
+                        debounce_size=config['DEBOUNCE_SIZE'],
+                    )
+                elif issubclass(sink_class, SyncLogSink):
+                    _sink = sink_class(debounce_size=config['DEBOUNCE_SIZE'])
+                else:
+                    _sink = sink_class()
+    return _sink
+
+
+def flush_log_sink(wait=False):
+    """Flush the active sink (no-op if none has been created yet)."""
+    if _sink is not None:
+        _sink.flush(wait=wait)
+
+
+def reset_log_sink(**kwargs):
+    """Drop the cached sink so the next write re-reads settings (override_settings support)."""
+    global _sink
+    if kwargs.get('setting') not in (None, 'MICROSYS_ACTIVITY_LOG'):
+        return
+    old, _sink = _sink, None
+    if old is not None:
+        old.flush(wait=True)
+        old.close()
+
+
+def _flush_at_exit():
+    flush_log_sink(wait=True)
+
+
+setting_changed.connect(reset_log_sink)
+atexit.register(_flush_at_exit)
@@ -0,0 +1,65 @@
+# microsys/management/commands/microsys_archive_logs.py
+"""
+Management command to move old activity-log rows out of the hot table.
+Rows older than --days (default: MICROSYS_ACTIVITY_LOG['HOT_DAYS']) go to
+monthly archive tables or gzipped JSONL files, in chunked copy-and-delete
+transactions. Safe to re-run; schedule it (cron/systemd timer) nightly.
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from microsys.logarchive import archive_logs, get_archive_dir
+from microsys.logsink import get_activity_log_config
+
+
+class Command(BaseCommand):
+    help = 'Archive activity-log rows older than the hot window'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            help="Archive rows older than this many days (default: MICROSYS_ACTIVITY_LOG['HOT_DAYS'])",
+        )
+        parser.add_argument(
+            '--backend',
+            choices=['table', 'jsonl'],
+            help="Archive target (default: MICROSYS_ACTIVITY_LOG['ARCHIVE_BACKEND'])",
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            help="Rows per copy-and-delete transaction (default: MICROSYS_ACTIVITY_LOG['ARCHIVE_CHUNK_SIZE'])",
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many rows would be moved',
+        )
+
+    def handle(self, *args, **options):
+        config = get_activity_log_config()
+        days = options['days'] or config.get('HOT_DAYS')
+        if not days:
+            raise CommandError("No hot window configured: pass --days or set MICROSYS_ACTIVITY_LOG['HOT_DAYS'].")
+        backend = options['backend'] or config['ARCHIVE_BACKEND']
+        chunk_size = options['chunk_size'] or config['ARCHIVE_CHUNK_SIZE']
+        cutoff = timezone.now() - timedelta(days=int(days))
+
+        self.stdout.write(self.style.MIGRATE_HEADING('\n🗄️  MicroSys Activity Log Archive\n'))
+        self.stdout.write('=' * 40 + '\n')
+        self.stdout.write(f'Cutoff: {cutoff:%Y-%m-%d %H:%M} ({days} days) → {backend}')
+        if backend == 'jsonl':
+            self.stdout.write(f'Directory: {get_archive_dir()}')
+
+        moved = archive_logs(cutoff, backend=backend, chunk_size=chunk_size, dry_run=options['dry_run'])
+
+        if not moved:
+            self.stdout.write(self.style.SUCCESS('\n✓ Nothing to archive'))
+            return
+        for (year, month), count in sorted(moved.items()):
+            self.stdout.write(f'  {year:04d}-{month:02d}: {count}')
+        verb = 'Would move' if options['dry_run'] else 'Moved'
+        self.stdout.write(self.style.SUCCESS(f'\n✓ {verb} {sum(moved.values())} rows'))
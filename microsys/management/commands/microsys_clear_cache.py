@@ -0,0 +1,36 @@
+# microsys/management/commands/microsys_clear_cache.py
+"""
+Management command to invalidate microsys caches.
+Bumps the generation counters (see microsys.cache_versions), which drops
+every cached sidebar, system config and translation entry in O(1) without
+flushing the rest of the cache.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from microsys.cache_versions import CACHE_NAMESPACES, bump_cache_generation
+
+
+class Command(BaseCommand):
+    help = 'Invalidate microsys caches (sidebar, config, translations)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'namespaces',
+            nargs='*',
+            help=f"Caches to invalidate: {', '.join(CACHE_NAMESPACES)} (default: all)",
+        )
+
+    def handle(self, *args, **options):
+        unknown = [ns for ns in options['namespaces'] if ns not in CACHE_NAMESPACES]
+        if unknown:
+            raise CommandError(f"Unknown cache namespace(s): {', '.join(unknown)}. Choose from: {', '.join(CACHE_NAMESPACES)}")
+
+        self.stdout.write(self.style.MIGRATE_HEADING('\n🧹 MicroSys Cache Invalidation\n'))
+        self.stdout.write('=' * 40 + '\n')
+
+        bumped = bump_cache_generation(*options['namespaces'])
+        for namespace in options['namespaces'] or CACHE_NAMESPACES:
+            if namespace in bumped:
+                self.stdout.write(f'  {namespace}: ' + self.style.SUCCESS(f'✓ generation {bumped[namespace]}'))
+            else:
+                self.stdout.write(f'  {namespace}: ' + self.style.ERROR('✗ cache unavailable'))
@@ -0,0 +1,57 @@
+# microsys/management/commands/microsys_run_exports.py
+"""
+Management command that runs background export jobs, for deployments that
+set MICROSYS_FETCHER['EXPORT_RUNNER'] = 'command' (e.g. to keep exports off
+the web workers). Polls for pending jobs until stopped; --once drains the
+queue and exits (suitable for cron).
+
+Every poll also sweeps jobs a dead process left behind, so deployments on the
+'thread' runner should schedule `--once` too (see run_pending_export_jobs).
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from microsys.exportjobs import run_pending_export_jobs
+
+
+class Command(BaseCommand):
+    help = 'Run pending background export jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run the pending jobs, then exit',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Seconds between polls for new jobs (default: 5)',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Run at most this many jobs per poll',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.MIGRATE_HEADING('\n📤 MicroSys Export Runner\n'))
+        self.stdout.write('=' * 40 + '\n')
+
+        total = 0
+        try:
+            while True:
+                ran = run_pending_export_jobs(limit=options['limit'])
+                total += ran
+                if ran:
+                    self.stdout.write(f'  Ran {ran} job(s)')
+                if not ran:
+                    if options['once']:
+                        break
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(f'\n✓ {total} export job(s) run'))
@@ -1,32 +1,150 @@
+from collections import namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
 
-import threading
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.utils.decorators import sync_and_async_middleware
+
+# Resolved scope state for the active request (see get_scope_context)
+ScopeContext = namedtuple('ScopeContext', ['is_enabled', 'scope_id', 'is_superuser'])
+
+
+class _RequestState:
+    """
+    Per-request state. A single mutable holder is bound to the context, so
+    every copy of it (sync_to_async threads, tasks) sees the same values.
+    """
+    __slots__ = ('user', 'request', 'scope_context', 'in_request')
+
+    def __init__(self, request=None, user=None, in_request=True):
+        self.request = request
+        self.user = user
+        self.scope_context = None
+        self.in_request = in_request
+
+
+# Active request's state (bound by ActivityLogMiddleware / request_context; None outside requests)
+_request_state = ContextVar('microsys_request_state', default=None)
 
-_thread_locals = threading.local()
 
 def get_current_user():
-    return getattr(_thread_locals, 'user', None)
+    state = _request_state.get()
+    return state.user if state is not None else None
 
 def get_current_request():
-    return getattr(_thread_locals, 'request', None)
+    state = _request_state.get()
+    return state.request if state is not None else None
+
+def _resolve_scope_context(user):
+    """Resolve global scope flag and the user's scope id without loading the Scope row."""
+    from django.apps import apps
+    try:
+        ScopeSettings = apps.get_model('microsys', 'ScopeSettings')
+        is_enabled = ScopeSettings.load().is_enabled
+    except Exception:
+        # ScopeSettings table may not exist yet (e.g. during migrations)
+        is_enabled = False
+
+    scope_id = None
+    is_superuser = False
+    if user is not None and getattr(user, 'is_authenticated', False):
+        is_superuser = bool(user.is_superuser)
+        try:
+            scope_id = user.profile.scope_id
+        except Exception:
+            scope_id = None
+        if not scope_id:
+            # Layout for old CustomUser (will be removed later)
+            scope_id = getattr(user, 'scope_id', None)
+    return ScopeContext(is_enabled, scope_id, is_superuser)
+
+def get_scope_context():
+    """
+    Return the ScopeContext for the current request.
+    Resolved once per request and reused by managers, form/table patches and helpers.
+    Outside a request (shell, commands) it is resolved on every call.
+    """
+    state = _request_state.get()
+    if state is None or not state.in_request:
+        return _resolve_scope_context(get_current_user())
+    if state.scope_context is None:
+        state.scope_context = _resolve_scope_context(state.user)
+    return state.scope_context
 
+def reset_scope_context():
+    """Drop the cached scope context (e.g. after ScopeSettings or a profile scope changes)."""
+    state = _request_state.get()
+    if state is not None:
+        state.scope_context = None
+
+def _begin_request(request, user=None):
+    from .translations import begin_request_translations
+    if user is None:
+        user = getattr(request, 'user', None)
+    return _request_state.set(_RequestState(request, user)), begin_request_translations(request)
+
+def _end_request(tokens):
+    from .translations import end_request_translations
+    state_token, translations_token = tokens
+    end_request_translations(translations_token)
+    _request_state.reset(state_token)
+
+@contextmanager
+def request_context(request=None, user=None):
+    """
+    Bind a request and/or user to the current context, as the middleware does.
+    For tests, management commands and background jobs that should log and
+    scope as a given user:
+
+        with request_context(user=user):
+            obj.save()
+    """
+    tokens = _begin_request(request, user)
+    try:
+        yield
+    finally:
+        _end_request(tokens)
+
+
+@sync_and_async_middleware
 class ActivityLogMiddleware:
     """
-    Middleware to capture the current request and user in a thread-local variable.
+    Middleware to capture the current request and user in a context variable.
     This allows access to the user in signals where request is not available.
+    Context variables follow the request across threads and async tasks, so it
+    works under WSGI and ASGI alike.
+    Also owns the per-request scope context and language state (language,
+    direction and strings; all resolved lazily on first use) and flushes the
+    activity-log sink at request end.
     """
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        _thread_locals.user = getattr(request, 'user', None)
-        _thread_locals.request = request
-        
-        response = self.get_response(request)
-        
-        # Clean up to prevent memory leaks or data pollution in reused threads
-        if hasattr(_thread_locals, 'user'):
-            del _thread_locals.user
-        if hasattr(_thread_locals, 'request'):
-            del _thread_locals.request
-            
+        if self.async_mode:
+            return self.__acall__(request)
+
+        tokens = _begin_request(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            self._finish(tokens)
         return response
+
+    async def __acall__(self, request):
+        tokens = _begin_request(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            self._finish(tokens)
+        return response
+
+    def _finish(self, tokens):
+        # Hand this request's queued activity-log entries to the background writer
+        from .logsink import flush_log_sink
+        flush_log_sink()
+        # Unbind the request so nothing leaks into whatever reuses this thread/context
+        _end_request(tokens)
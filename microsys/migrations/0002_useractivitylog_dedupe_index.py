@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('microsys', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='useractivitylog',
+            name='details_digest',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, verbose_name='بصمة التفاصيل'),
+        ),
+        migrations.AddIndex(
+            model_name='useractivitylog',
+            index=models.Index(fields=['created_by', 'action', 'model_name', 'object_id', 'created_at'], name='microsys_log_dedupe_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:42
+
+import django.db.models.deletion
+import microsys.models
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('microsys', '0002_useractivitylog_dedupe_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاريخ الإنشاء')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='بدأ في')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='انتهى في')),
+                ('status', models.CharField(choices=[('pending', 'في الانتظار'), ('running', 'قيد التنفيذ'), ('done', 'مكتمل'), ('failed', 'فشل')], default='pending', max_length=20, verbose_name='الحالة')),
+                ('format', models.CharField(max_length=10, verbose_name='الصيغة')),
+                ('app_label', models.CharField(max_length=100, verbose_name='التطبيق')),
+                ('model_name', models.CharField(max_length=100, verbose_name='القسم')),
+                ('query', models.BinaryField()),
+                ('options', models.JSONField(blank=True, default=dict, verbose_name='الخيارات')),
+                ('total', models.PositiveIntegerField(blank=True, null=True, verbose_name='الإجمالي')),
+                ('processed', models.PositiveIntegerField(default=0, verbose_name='المنجز')),
+                ('file', models.FileField(blank=True, max_length=255, upload_to=microsys.models._export_job_upload_to, verbose_name='الملف')),
+                ('filename', models.CharField(blank=True, max_length=255, verbose_name='اسم الملف')),
+                ('error', models.TextField(blank=True, verbose_name='الخطأ')),
+                ('created_by', models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='أنشئ بواسطة')),
+            ],
+            options={
+                'verbose_name': 'Export Job',
+                'verbose_name_plural': 'Export Jobs',
+                'ordering': ['-created_at'],
+                'default_permissions': (),
+                'indexes': [models.Index(fields=['status', 'created_at'], name='microsys_exportjob_status_idx')],
+            },
+        ),
+    ]
@@ -1,6 +1,8 @@
 # Imports of the required python modules and libraries
 ######################################################
-from django.db import models
+import uuid
+
+from django.db import models, transaction
 from django.conf import settings
 from django.utils import timezone
 from django.core.cache import cache
@@ -28,6 +30,9 @@ class ScopeSettings(models.Model):
     def save(self, *args, **kwargs):
         self.pk = 1
         super(ScopeSettings, self).save(*args, **kwargs)
+        # Drop the cached per-request scope state so the new flag applies immediately
+        from .middleware import reset_scope_context
+        reset_scope_context()
 
     @classmethod
     def load(cls):
@@ -45,14 +50,23 @@ class SingletonModel(models.Model):
     def save(self, *args, **kwargs):
         self.pk = 1
         super().save(*args, **kwargs)
+        # Cache the row only once it is visible to other connections
+        transaction.on_commit(self._on_commit)
+
+    def _on_commit(self):
         self.refresh_cache()
 
     def delete(self, *args, **kwargs):
         pass
 
+    @classmethod
+    def _cache_key(cls):
+        from .cache_versions import versioned_key
+        return versioned_key('config', cls.__name__)
+
     @classmethod
     def load(cls):
-        obj = cache.get(cls.__name__)
+        obj = cache.get(cls._cache_key())
         if not obj:
             obj, created = cls.objects.get_or_create(pk=1)
             if created:
@@ -67,11 +81,11 @@ class SingletonModel(models.Model):
                 if 'name_ar' in config:
                     obj.name = config.get('name_ar')
                 obj.save()
-            cache.set(cls.__name__, obj, timeout=86400)
+            cache.set(cls._cache_key(), obj, timeout=86400)
         return obj
 
     def refresh_cache(self):
-         cache.set(self.__class__.__name__, self, timeout=86400)
+         cache.set(self._cache_key(), self, timeout=86400)
 
 
 class SystemSettings(SingletonModel):
@@ -89,6 +103,14 @@ class SystemSettings(SingletonModel):
         verbose_name = "System Settings"
         verbose_name_plural = "System Settings"
 
+    def _on_commit(self):
+        # Branding, languages and translation overrides feed all three caches.
+        # Bumped after commit, so a worker reading before it cannot pin the old
+        # row under the new generation; then this row is cached under that key.
+        from .cache_versions import bump_cache_generation
+        bump_cache_generation('config', 'sidebar', 'translations')
+        super()._on_commit()
+
     def __str__(self):
         return "إعدادات النظام العامة"
 
@@ -155,10 +177,11 @@ class ScopedModel(models.Model):
                 if not self.created_by_id:
                     self.created_by = user
                 # Auto-set scope from user's profile if not explicitly set
-                if not self.scope_id and hasattr(user, 'profile') and user.profile.scope_id:
-                    from .utils import is_scope_enabled
-                    if is_scope_enabled():
-                        self.scope_id = user.profile.scope_id
+                if not self.scope_id:
+                    from .middleware import get_scope_context
+                    ctx = get_scope_context()
+                    if ctx.is_enabled and ctx.scope_id:
+                        self.scope_id = ctx.scope_id
             self.updated_by = user
         super().save(*args, **kwargs)
 
@@ -228,7 +251,9 @@ class UserActivityLog(ScopedModel):
     - created_at → when the action occurred (was 'timestamp')
     """
     # created_by (inherited) → replaces old 'user' field
-    # created_at (inherited) → replaces old 'timestamp' field
+    # created_at → replaces old 'timestamp' field. Stamped when the entry is built
+    # rather than at INSERT, so queued sinks keep the time the action happened.
+    created_at = models.DateTimeField(default=timezone.now, editable=False, verbose_name="تاريخ الإنشاء")
     action = models.CharField(max_length=50, verbose_name="العملية")
     model_name = models.CharField(max_length=100, blank=True, null=True, verbose_name="القسم")
     object_id = models.IntegerField(blank=True, null=True, verbose_name="ID")
@@ -236,6 +261,8 @@ class UserActivityLog(ScopedModel):
     ip_address = models.GenericIPAddressField(blank=True, null=True, verbose_name="عنوان IP")
     user_agent = models.TextField(blank=True, null=True, verbose_name="agent")
     details = models.JSONField(default=dict, blank=True, null=True, verbose_name="التفاصيل")
+    # SHA-256 of `details`, compared by the dedupe lookup instead of JSON equality
+    details_digest = models.CharField(max_length=64, blank=True, null=True, editable=False, verbose_name="بصمة التفاصيل")
 
     # Backward-compat properties for templates and tables
     @property
@@ -258,48 +285,80 @@ class UserActivityLog(ScopedModel):
         permissions = [
             ("view_activity_log", "View activity log"),
         ]
+        indexes = [
+            # Matches the safe_log dedupe lookup
+            models.Index(
+                fields=['created_by', 'action', 'model_name', 'object_id', 'created_at'],
+                name='microsys_log_dedupe_idx',
+            ),
+            # Hot-window filter (created_at >= cutoff) and the keyset ordering
+            models.Index(fields=['-created_at', '-id'], name='microsys_log_created_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        """Keep the details digest in step with details (merged entries are re-saved)."""
+        from .logsink import details_digest
+        self.details_digest = details_digest(self.details)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'details' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'details_digest'}
+        super().save(*args, **kwargs)
 
     @classmethod
-    def safe_log(cls, user, action, model_name=None, object_id=None, number=None, details=None, ip_address=None, user_agent=None, scope=None):
+    def is_recent_duplicate(cls, entry):
         """
-        Log an action only if a duplicate entry hasn't been created in the last 2 seconds.
+        Check whether an identical entry was logged within the debounce window.
+        `entry` holds the field kwargs passed to safe_log's sink.
         """
         from django.utils.timezone import now
-        from datetime import timedelta
-        
-        # Debounce window
-        time_threshold = now() - timedelta(seconds=2)
-        
-        # Check for duplicates
+        from .logsink import DEDUPE_WINDOW
+
         duplicate = cls.objects.filter(
-            created_by=user,
-            action=action,
-            model_name=model_name,
-            object_id=object_id,
-            created_at__gte=time_threshold
+            created_by=entry.get('created_by'),
+            action=entry.get('action'),
+            model_name=entry.get('model_name'),
+            object_id=entry.get('object_id'),
+            created_at__gte=now() - DEDUPE_WINDOW,
         )
-        
-        if details:
-             duplicate = duplicate.filter(details=details)
-             
-        if duplicate.exists():
-            return None
+        if entry.get('details_digest'):
+            duplicate = duplicate.filter(details_digest=entry['details_digest'])
+        return duplicate.exists()
+
+    @classmethod
+    def safe_log(cls, user, action, model_name=None, object_id=None, number=None, details=None, ip_address=None, user_agent=None, scope=None, inline=False):
+        """
+        Log an action only if a duplicate entry hasn't been created in the last 2 seconds.
+        The write goes through the configured activity-log sink (see microsys.logsink),
+        which either inserts inline or queues the entry for a batched background insert.
+        `inline=True` always inserts in the caller's transaction, for entries that later
+        writes look up and merge into.
+
+        Returns the saved entry, or None when it was dropped as a duplicate or queued.
+        """
+        from .logsink import get_log_sink, details_digest
+
+        entry = {
+            'created_by': user,
+            'action': action,
+            'model_name': model_name,
+            'object_id': object_id,
+            'number': number,
+            'details': details or {},
+            'details_digest': details_digest(details),
+            'ip_address': ip_address,
+            'user_agent': user_agent,
+        }
 
         # Automatically use actor's scope if not provided
-        if not scope and user and hasattr(user, 'profile'):
-            scope = user.profile.scope
-
-        return cls.objects.create(
-            created_by=user,
-            action=action,
-            model_name=model_name,
-            object_id=object_id,
-            number=number,
-            details=details or {},
-            ip_address=ip_address,
-            user_agent=user_agent,
-            scope=scope,
-        )
+        if scope:
+            entry['scope'] = scope
+        elif user and hasattr(user, 'profile'):
+            entry['scope_id'] = user.profile.scope_id
+
+        sink = get_log_sink()
+        if inline:
+            return sink.write_inline(cls, entry)
+        return sink.write(cls, entry)
 
     def get_modal_context(self):
         """Auto-resolve related object for dynamic modal detail view."""
@@ -334,6 +393,71 @@ class UserActivityLog(ScopedModel):
             'related_object_model': related_object._meta.verbose_name if related_object else (self.model_name or "-"),
         }
 
+def _export_job_upload_to(instance, filename):
+    # One unguessable folder per job; files are only served through the job download view
+    return f"microsys/exports/{instance.pk}/{filename}"
+
+
+class ExportJob(models.Model):
+    """
+    Background export of a queryset (see microsys.exportjobs).
+    The queryset is stored as its pickled Query; the runner (thread pool or
+    the microsys_run_exports command) writes the file and updates progress.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'في الانتظار'),
+        (RUNNING, 'قيد التنفيذ'),
+        (DONE, 'مكتمل'),
+        (FAILED, 'فشل'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, related_name='+',
+        on_delete=models.SET_NULL, editable=False, verbose_name="أنشئ بواسطة"
+    )
+    created_at = models.DateTimeField(auto_now_add=True, editable=False, verbose_name="تاريخ الإنشاء")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="بدأ في")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="انتهى في")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING, verbose_name="الحالة")
+    format = models.CharField(max_length=10, verbose_name="الصيغة")
+    app_label = models.CharField(max_length=100, verbose_name="التطبيق")
+    model_name = models.CharField(max_length=100, verbose_name="القسم")
+    query = models.BinaryField(editable=False)
+    # exclude_fields, hidden_fields, include_hidden, sheet_title
+    options = models.JSONField(default=dict, blank=True, verbose_name="الخيارات")
+    total = models.PositiveIntegerField(null=True, blank=True, verbose_name="الإجمالي")
+    processed = models.PositiveIntegerField(default=0, verbose_name="المنجز")
+    file = models.FileField(upload_to=_export_job_upload_to, max_length=255, blank=True, verbose_name="الملف")
+    filename = models.CharField(max_length=255, blank=True, verbose_name="اسم الملف")
+    error = models.TextField(blank=True, verbose_name="الخطأ")
+
+    class Meta:
+        verbose_name = "Export Job"
+        verbose_name_plural = "Export Jobs"
+        default_permissions = ()
+        ordering = ['-created_at']
+        indexes = [
+            # Runner polling for pending jobs
+            models.Index(fields=['status', 'created_at'], name='microsys_exportjob_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model_name} {self.format} ({self.status})"
+
+    @property
+    def percent(self):
+        if self.status == self.DONE:
+            return 100
+        if not self.total:
+            return 0
+        return min(int(self.processed * 100 / self.total), 99)
+
+
 class TranslationMixin:
     """
     Mixin for zero-boilerplate database content translation.
@@ -0,0 +1,237 @@
+"""
+Keyset (seek) pagination for django-tables2 tables.
+
+OFFSET pagination re-reads every skipped row and needs a full COUNT(*).
+`KeysetPaginationMixin` pages on a fixed key instead (e.g. created_at, id)
+with opaque `?cursor=` tokens for next/previous, and shows an estimated or
+cached total:
+
+    class MyTable(KeysetPaginationMixin, tables.Table):
+        keyset = ('-created_at', '-id')
+
+When the user sorts by a column, or the data is not a plain queryset, the
+table falls back to regular page-number pagination.
+"""
+import base64
+import hashlib
+import json
+import math
+
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.db import connections
+from django.db.models import Q
+from django_tables2.rows import BoundRows
+
+# Cache lifetime (seconds) for totals that cannot be estimated from DB statistics
+KEYSET_COUNT_TTL = 60
+
+# Below this many estimated rows an exact (cached) count is cheap enough to show
+KEYSET_ESTIMATE_THRESHOLD = 10000
+
+
+def _postgres_estimate(queryset, connection):
+    """
+    Planner row estimate on PostgreSQL: pg_class.reltuples for a bare table,
+    the EXPLAIN row estimate once any filter applies (ScopedManager always
+    adds `deleted_at IS NULL`). None when no estimate is available.
+    """
+    if not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row and row[0] is not None and row[0] >= 0:
+            return int(row[0])
+        return None
+    try:
+        plan = json.loads(queryset.order_by().explain(format='json'))
+        return int(plan[0]['Plan']['Plan Rows'])
+    except Exception:
+        return None
+
+
+def estimated_count(queryset, ttl=KEYSET_COUNT_TTL):
+    """
+    Row count for display purposes.
+    Large tables on PostgreSQL use the planner's estimate (see _postgres_estimate);
+    everything else is counted once and cached for `ttl` seconds per distinct query.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        estimate = _postgres_estimate(queryset, connection)
+        if estimate is not None and estimate >= KEYSET_ESTIMATE_THRESHOLD:
+            return estimate
+
+    try:
+        sql, params = queryset.query.get_compiler(using=queryset.db).as_sql()
+    except Exception:
+        return queryset.count()
+    digest = hashlib.md5(f'{queryset.db}:{sql}:{params!r}'.encode('utf-8')).hexdigest()
+    return cache.get_or_set(f'microsys_keyset_count_{digest}', queryset.count, ttl)
+
+
+def encode_cursor(values, direction, number):
+    payload = json.dumps({'k': values, 'd': direction, 'n': number}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Return (values, direction, page number), or None for a missing/garbled token."""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        direction = data['d'] if data['d'] in ('next', 'prev') else 'next'
+        return list(data['k']), direction, max(int(data.get('n', 1)), 1)
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _seek_filter(keyset, values, forward):
+    """
+    Lexicographic "after (or before) this key" filter:
+    (a, b) > (x, y)  ==  a > x OR (a = x AND b > y), per-field direction aware.
+    """
+    condition = Q()
+    equal = Q()
+    for field, value in zip(keyset, values):
+        name = field.lstrip('-')
+        descending = field.startswith('-')
+        lookup = 'lt' if descending == forward else 'gt'
+        condition |= equal & Q(**{f'{name}__{lookup}': value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+class KeysetPage(Page):
+    def __init__(self, object_list, number, paginator, has_next, has_previous, next_cursor, previous_cursor):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+
+class KeysetPaginator(Paginator):
+    """
+    Paginator over a table's BoundRows backed by a queryset.
+    `cursor` is the token from the request; `page()` ignores its number argument.
+    """
+    is_keyset = True
+
+    def __init__(self, object_list, per_page, keyset=('-created_at', '-id'), cursor=None, count_ttl=KEYSET_COUNT_TTL, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.keyset = tuple(keyset)
+        self.cursor = decode_cursor(cursor)
+        self.count_ttl = count_ttl
+        self.queryset = object_list.data.data
+
+    @property
+    def count(self):
+        if not hasattr(self, '_count'):
+            self._count = estimated_count(self.queryset.order_by(), self.count_ttl)
+        return self._count
+
+    @property
+    def num_pages(self):
+        return max(math.ceil(self.count / self.per_page), 1)
+
+    def _key_values(self, record):
+        model = self.queryset.model
+        values = []
+        for field in self.keyset:
+            name = field.lstrip('-')
+            model_field = model._meta.pk if name == 'pk' else model._meta.get_field(name)
+            values.append(model_field.value_to_string(record))
+        return values
+
+    def _parse_values(self, values):
+        model = self.queryset.model
+        parsed = []
+        for field, value in zip(self.keyset, values):
+            name = field.lstrip('-')
+            model_field = model._meta.pk if name == 'pk' else model._meta.get_field(name)
+            parsed.append(model_field.to_python(value))
+        return parsed
+
+    def page(self, number=None):
+        queryset = self.queryset.order_by(*self.keyset)
+        direction, page_number = 'next', 1
+        if self.cursor is not None:
+            values, direction, page_number = self.cursor
+            try:
+                values = self._parse_values(values)
+            except Exception:
+                direction, page_number = 'next', 1
+            else:
+                if direction == 'prev':
+                    reverse_keyset = [f[1:] if f.startswith('-') else f'-{f}' for f in self.keyset]
+                    queryset = queryset.filter(_seek_filter(self.keyset, values, forward=False)).order_by(*reverse_keyset)
+                else:
+                    queryset = queryset.filter(_seek_filter(self.keyset, values, forward=True))
+
+        records = list(queryset[:self.per_page + 1])
+        has_more = len(records) > self.per_page
+        records = records[:self.per_page]
+        if direction == 'prev':
+            records.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, page_number > 1
+
+        next_cursor = previous_cursor = None
+        if records and has_next:
+            next_cursor = encode_cursor(self._key_values(records[-1]), 'next', page_number + 1)
+        if records and has_previous:
+            previous_cursor = encode_cursor(self._key_values(records[0]), 'prev', page_number - 1)
+
+        rows = BoundRows(data=records, table=self.object_list.table)
+        return KeysetPage(rows, page_number, self, has_next, has_previous, next_cursor, previous_cursor)
+
+
+class KeysetPaginationMixin:
+    """
+    django-tables2 Table mixin switching `paginate()` to keyset pagination.
+    `keyset` must end in a unique field (usually id) so the order is total.
+    """
+    keyset = ('-created_at', '-id')
+    cursor_field = 'cursor'
+    count_ttl = KEYSET_COUNT_TTL
+    keyset_template_name = 'microsys/helpers/keyset_table.html'
+
+    @property
+    def prefixed_cursor_field(self):
+        return f'{self.prefix}{self.cursor_field}'
+
+    def use_keyset(self):
+        """Keyset applies to unsorted queryset data (user sorting falls back to page numbers)."""
+        if not self.keyset or not hasattr(self.data, 'data') or not hasattr(self.data.data, 'query'):
+            return False
+        if self.data.data.query.combinator:
+            return False
+        request = getattr(self, 'request', None)
+        if request is not None and request.GET.get(self.prefixed_order_by_field):
+            return False
+        return True
+
+    def paginate(self, paginator_class=Paginator, per_page=None, page=1, *args, **kwargs):
+        if not self.use_keyset():
+            return super().paginate(paginator_class, per_page, page, *args, **kwargs)
+        request = getattr(self, 'request', None)
+        cursor = request.GET.get(self.prefixed_cursor_field) if request is not None else None
+        self.paginator = KeysetPaginator(
+            self.rows, per_page or self._meta.per_page, keyset=self.keyset, cursor=cursor, count_ttl=self.count_ttl,
+        )
+        self.page = self.paginator.page()
+        self.template_name = self.keyset_template_name
+        return self
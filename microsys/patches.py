@@ -6,6 +6,8 @@ gets automatic scope handling — zero developer effort required.
 """
 import copy
 import logging
+import threading
+from functools import lru_cache
 
 logger = logging.getLogger('microsys')
 
@@ -44,6 +46,11 @@ def _should_lock_scope(user):
     """Check if scope should be locked for this user."""
     if not user or not hasattr(user, 'is_authenticated'):
         return False
+    from microsys.middleware import get_current_user, get_scope_context
+    if user is get_current_user():
+        # Reuse the per-request scope context instead of walking user.profile
+        ctx = get_scope_context()
+        return not ctx.is_superuser and bool(ctx.scope_id)
     if not user.is_authenticated or user.is_superuser:
         return False
     return bool(
@@ -128,7 +135,7 @@ def _patch_modelform_init():
 
         if not scope_enabled or lock_scope:
             if lock_scope and user:
-                self.fields['scope'].initial = user.profile.scope
+                self.fields['scope'].initial = user.profile.scope_id
             self.fields['scope'].disabled = True
             self.fields['scope'].widget = django_forms.HiddenInput()
             self.fields['scope'].required = False
@@ -321,6 +328,52 @@ def _patch_table_init():
 # 4. Global gettext patch
 # ──────────────────────────────────────────────────────────
 
+# Memoized MS_TRANS lookups for the patched gettext, one LRU per strings table.
+# get_strings() tables are rebuilt when the translations version moves; the memo
+# is stored on the table itself, so a new table gets a fresh memo and a dropped
+# table takes its memo with it (nothing is keyed by id()).
+GETTEXT_MEMO_SIZE = 4096
+_gettext_lookup_lock = threading.Lock()
+_MISS = object()  # cached negative result: fall through to Django's gettext
+
+
+def _build_ms_lookup(ms_trans):
+    @lru_cache(maxsize=GETTEXT_MEMO_SIZE)
+    def lookup(message, context):
+        if context is not None:
+            context_key = f"{context}_{message}".lower().replace(' ', '_')
+            if context_key in ms_trans:
+                return ms_trans[context_key]
+
+        if message in ms_trans:
+            return ms_trans[message]
+
+        slug_key = message.lower().replace(' ', '_')
+        if slug_key in ms_trans:
+            return ms_trans[slug_key]
+        return _MISS
+    return lookup
+
+
+def _ms_lookup(ms_trans):
+    """LRU-memoized resolver for one strings table: (message, context) -> string or _MISS."""
+    from microsys.translations import FrozenStrings
+
+    lookup = getattr(ms_trans, '_gettext_lookup', None)
+    if lookup is not None:
+        return lookup
+    lookup = _build_ms_lookup(ms_trans)
+    if not isinstance(ms_trans, FrozenStrings):
+        # Mutable tables can't carry a memo that stays valid
+        return lookup
+    with _gettext_lookup_lock:
+        existing = getattr(ms_trans, '_gettext_lookup', None)
+        if existing is not None:
+            return existing
+        ms_trans._gettext_lookup = lookup
+    return lookup
+
+
 def _patch_django_gettext():
     """Patch Django's gettext, gettext_lazy, and pgettext to check MS_TRANS first."""
     import django.utils.translation as translation
@@ -331,34 +384,20 @@ def _patch_django_gettext():
     
     def _patched_gettext(message):
         try:
-            from microsys.translations import get_strings
-            ms_trans = get_strings()
-            
-            if message in ms_trans:
-                return ms_trans[message]
-                
-            slug_key = str(message).lower().replace(' ', '_')
-            if slug_key in ms_trans:
-                return ms_trans[slug_key]
+            from microsys.translations import get_active_strings
+            found = _ms_lookup(get_active_strings())(str(message), None)
+            if found is not _MISS:
+                return found
         except Exception:
             pass
         return _original_gettext(message)
         
     def _patched_pgettext(context, message):
         try:
-            from microsys.translations import get_strings
-            ms_trans = get_strings()
-            
-            context_key = f"{context}_{message}".lower().replace(' ', '_')
-            if context_key in ms_trans:
-                return ms_trans[context_key]
-                
-            if message in ms_trans:
-                return ms_trans[message]
-                
-            slug_key = str(message).lower().replace(' ', '_')
-            if slug_key in ms_trans:
-                return ms_trans[slug_key]
+            from microsys.translations import get_active_strings
+            found = _ms_lookup(get_active_strings())(str(message), str(context))
+            if found is not _MISS:
+                return found
         except Exception:
             pass
         return _original_pgettext(context, message)
@@ -395,6 +434,113 @@ def _patch_model_meta():
         meta.verbose_name_plural = lazy_translator(f"models_{meta.model_name}", raw_vnp)
 
 
+# ──────────────────────────────────────────────────────────
+# 6. Field tracking patch
+# ──────────────────────────────────────────────────────────
+
+# Cache of per-model tracking decisions (cleared when MICROSYS_ACTIVITY_LOG changes)
+_tracked_model_cache = {}
+
+
+def _is_tracked_model(model):
+    """
+    Check (with cache) if loaded field values should be snapshotted for a model.
+    Per-model `track_fields = True/False` wins over MICROSYS_ACTIVITY_LOG['TRACK_FIELDS'].
+    """
+    if model not in _tracked_model_cache:
+        flag = getattr(model, 'track_fields', None)
+        if not isinstance(flag, bool):
+            from microsys.logsink import get_activity_log_config
+            flag = bool(get_activity_log_config().get('TRACK_FIELDS'))
+        if model._meta.app_label == 'microsys' and model._meta.object_name == 'UserActivityLog':
+            flag = False
+        _tracked_model_cache[model] = flag
+    return _tracked_model_cache[model]
+
+
+def _reset_tracked_model_cache(setting=None, **kwargs):
+    if setting == 'MICROSYS_ACTIVITY_LOG':
+        _tracked_model_cache.clear()
+
+
+def snapshot_fields(instance, attnames=None):
+    """
+    Store the currently loaded field values on the instance (keyed by attname).
+    Deferred fields are left out; mutable JSON values are copied so in-place
+    edits still show up as changes. With `attnames`, only those fields are
+    re-snapshotted and merged into the existing snapshot.
+    """
+    loaded = instance.__dict__
+    if attnames is None:
+        snapshot = {}
+    else:
+        snapshot = dict(loaded.get('_microsys_snapshot') or {})
+    for field in instance._meta.fields:
+        if attnames is not None and field.attname not in attnames:
+            continue
+        if field.attname in loaded:
+            value = loaded[field.attname]
+            if isinstance(value, (dict, list)):
+                value = copy.deepcopy(value)
+            snapshot[field.attname] = value
+    instance._microsys_snapshot = snapshot
+
+
+def _refreshed_attnames(instance, fields):
+    """
+    Map the `fields` passed to refresh_from_db() to concrete attnames
+    (None = every concrete field). Relation/prefetch names are skipped.
+    """
+    from django.core.exceptions import FieldDoesNotExist
+
+    if fields is None:
+        return None
+    opts = instance._meta
+    attnames = {opts.pk.attname}
+    for name in fields:
+        try:
+            field = opts.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if getattr(field, 'concrete', False):
+            attnames.add(field.attname)
+    return attnames
+
+
+def _patch_model_field_tracking():
+    """Patch Model.from_db / (a)refresh_from_db to snapshot field values for tracked models."""
+    from django.db import models
+    from django.core.signals import setting_changed
+
+    _original_from_db = models.Model.from_db.__func__
+    _original_refresh_from_db = models.Model.refresh_from_db
+    _original_arefresh_from_db = models.Model.arefresh_from_db
+
+    def _patched_from_db(cls, db, field_names, values):
+        instance = _original_from_db(cls, db, field_names, values)
+        if _is_tracked_model(cls):
+            snapshot_fields(instance)
+        return instance
+
+    # Only the refreshed fields are re-snapshotted: reading a deferred field
+    # triggers refresh_from_db(fields=[name]), and unsaved edits to the other
+    # fields must still diff against their load-time values.
+    def _patched_refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        _original_refresh_from_db(self, using=using, fields=fields, from_queryset=from_queryset)
+        if _is_tracked_model(type(self)):
+            snapshot_fields(self, _refreshed_attnames(self, fields))
+
+    async def _patched_arefresh_from_db(self, using=None, fields=None, from_queryset=None):
+        await _original_arefresh_from_db(self, using=using, fields=fields, from_queryset=from_queryset)
+        if _is_tracked_model(type(self)):
+            snapshot_fields(self, _refreshed_attnames(self, fields))
+
+    models.Model.from_db = classmethod(_patched_from_db)
+    models.Model.refresh_from_db = _patched_refresh_from_db
+    models.Model.arefresh_from_db = _patched_arefresh_from_db
+    setting_changed.connect(_reset_tracked_model_cache)
+
+
 # ──────────────────────────────────────────────────────────
 # Entry point
 # ──────────────────────────────────────────────────────────
@@ -404,6 +550,7 @@ def apply_scoped_patches():
     _patch_modelform_init()
     _patch_filterset_init()
     _patch_table_init()
+    _patch_model_field_tracking()
     logger.debug("microsys: Scope auto-injection patches applied.")
 
 def apply_global_translation_patches():
@@ -2,6 +2,7 @@
 ######################################################
 from django.dispatch import receiver
 from django.db.models.signals import post_save, post_delete, pre_save
+from django.core.signals import request_started, setting_changed
 from django.utils.timezone import now
 from django.apps import apps
 from django.conf import settings
@@ -9,10 +10,14 @@ from django.contrib.auth.signals import user_logged_in, user_logged_out
 from django.contrib.auth import get_user_model
 from .middleware import get_current_user, get_current_request
 from .utils import log_user_action, get_client_ip
+from .managers import ScopedManager
+from .cache_versions import bump_cache_generation, check_urlconf_changed
 
 # Models to exclude from activity logging (e.g., internal Django models with non-integer PKs)
 EXCLUDED_MODELS = [
     'django.contrib.sessions.models.Session',
+    # Export jobs are logged explicitly (EXPORT when queued, DOWNLOAD when fetched)
+    'microsys.models.ExportJob',
 ]
 
 @receiver(user_logged_in)
@@ -25,6 +30,30 @@ def log_logout(sender, request, user, **kwargs):
     """Log user logout actions."""
     log_user_action(request, "LOGOUT", model_name="auth")
 
+def _snapshot_is_usable(sender, instance, snapshot):
+    """
+    A load-time snapshot can stand in for the pre-save SELECT when it covers
+    every concrete field and the row would still be visible through
+    `sender.objects` (soft-deleted rows are hidden by ScopedManager).
+    """
+    if any(field.attname not in snapshot for field in instance._meta.fields):
+        return False
+    if snapshot.get('deleted_at') is not None and isinstance(sender.objects, ScopedManager):
+        return False
+    return True
+
+
+def _display_value(instance, field, value, by_attname):
+    """Render a field value for the details diff (str() of the object for relations)."""
+    if by_attname and field.is_relation:
+        if value is None:
+            return 'None'
+        if value == getattr(instance, field.attname):
+            return str(getattr(instance, field.name))
+        return str(field.related_model._base_manager.filter(pk=value).first())
+    return str(value)
+
+
 @receiver(pre_save)
 def capture_original_state(sender, instance, **kwargs):
     """Capture state before save to calculate diffs."""
@@ -33,7 +62,19 @@ def capture_original_state(sender, instance, **kwargs):
     if sender == UserActivityLog:
         return
 
+    # Excluded models are never logged, so skip the snapshot too
+    if f"{sender.__module__}.{sender.__name__}" in EXCLUDED_MODELS:
+        return
+
     if instance.pk:
+        # Tracked models carry a snapshot taken at load time — no SELECT needed
+        snapshot = getattr(instance, '_microsys_snapshot', None)
+        if snapshot is not None and _snapshot_is_usable(sender, instance, snapshot):
+            instance._original_state = snapshot
+            instance._original_by_attname = True
+            instance._was_not_deleted = (snapshot.get('deleted_at') is None)
+            return
+
         try:
             old_instance = sender.objects.get(pk=instance.pk)
             instance._original_state = {}
@@ -92,6 +133,8 @@ def log_save(sender, instance, created, **kwargs):
     # Compare with original state for updates
     if not created and action == "UPDATE" and hasattr(instance, '_original_state'):
         original = instance._original_state
+        # Snapshots are keyed by attname (FK ids), SELECT-based state by name (objects)
+        by_attname = getattr(instance, '_original_by_attname', False)
         for field in instance._meta.fields:
             field_name = field.name
             
@@ -100,8 +143,9 @@ def log_save(sender, instance, created, **kwargs):
                 continue
                 
             try:
-                new_val = getattr(instance, field_name)
-                old_val = original.get(field_name)
+                key = field.attname if by_attname else field_name
+                new_val = getattr(instance, key)
+                old_val = original.get(key)
                 
                 # Handle Password and Backup Codes
                 if field_name == 'password' or field_name == 'backup_codes':
@@ -111,8 +155,8 @@ def log_save(sender, instance, created, **kwargs):
 
                 if new_val != old_val:
                     # Format values for display
-                    if hasattr(new_val, '__str__'): new_val = str(new_val)
-                    if hasattr(old_val, '__str__'): old_val = str(old_val)
+                    new_val = _display_value(instance, field, new_val, by_attname)
+                    old_val = _display_value(instance, field, old_val, by_attname)
                     
                     details[field_name] = {'old': old_val, 'new': new_val}
             except Exception:
@@ -206,8 +250,16 @@ def log_save(sender, instance, created, **kwargs):
         ip_address=ip,
         user_agent=user_agent,
         scope=scope,
+        # The other half of a User/Profile pair merges into this row; it must be visible now
+        inline=is_user_entry,
     )
 
+@receiver(post_save)
+def drop_field_snapshot(sender, instance, **kwargs):
+    """The load-time snapshot is stale once saved; the next save falls back to a SELECT."""
+    instance.__dict__.pop('_microsys_snapshot', None)
+    instance.__dict__.pop('_original_by_attname', None)
+
 @receiver(post_delete)
 def log_delete(sender, instance, **kwargs):
     """Log delete actions for all models."""
@@ -274,6 +326,7 @@ def log_delete(sender, instance, **kwargs):
         details=None,
         ip_address=ip,
         user_agent=user_agent,
+        inline=is_user_entry,
     )
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
@@ -367,3 +420,17 @@ def create_user_connected_profiles(sender, instance, created, **kwargs):
             # Silently fail if creation is impossible (e.g. strict DB constraints we couldn't bypass)
             pass
 
+
+# Cache invalidation — sidebar visibility follows URLs (permission changes are covered by
+# the permission-set hash in the compiled sidebar key, see context_processors)
+request_started.connect(check_urlconf_changed, dispatch_uid='microsys_urlconf_check')
+
+@receiver(setting_changed)
+def bump_on_setting_change(sender, setting, **kwargs):
+    """Settings overrides (tests, runtime reconfiguration) that change cached output."""
+    if setting in ('ROOT_URLCONF', 'SIDEBAR_AUTO', 'INSTALLED_APPS'):
+        from .discovery import clear_discovery_cache
+        clear_discovery_cache()
+        bump_cache_generation('sidebar')
+    elif setting == 'MICROSYS_CONFIG':
+        bump_cache_generation('config', 'sidebar', 'translations')
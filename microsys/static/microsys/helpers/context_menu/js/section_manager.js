@@ -62,15 +62,21 @@
         }
         
         let html = '<div class="row g-3">';
-        for (const [modelName, items] of Object.entries(relatedData)) {
+        for (const [modelName, entry] of Object.entries(relatedData)) {
+            // Either a plain list of labels or {count, items} (first labels of `count` rows)
+            const items = Array.isArray(entry) ? entry : (entry.items || []);
+            const count = Array.isArray(entry) ? items.length : (entry.count || items.length);
+            const more = count - items.length;
             html += `
                 <div class="col-sm-12">
                     <div class="glass-card h-100 p-3">
                         <div class="info-label-sm mb-2 text-primary fw-bold border-bottom pb-1" style="font-size: 0.8rem;">
                             <i class="bi bi-diagram-2 me-1"></i> ${modelName}
+                            <span class="badge rounded-pill bg-secondary ms-1">${count}</span>
                         </div>
                         <ul class="list-group list-group-flush bg-transparent">
                             ${items.map(item => `<li class="list-group-item bg-transparent border-0 py-1 px-1 small text-muted"><i class="bi bi-dot me-1"></i> ${item}</li>`).join('')}
+                            ${more > 0 ? `<li class="list-group-item bg-transparent border-0 py-1 px-1 small text-muted fst-italic">و ${more} أخرى...</li>` : ''}
                         </ul>
                     </div>
                 </div>
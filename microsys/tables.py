@@ -4,6 +4,7 @@ from django.apps import apps
 from django.utils.safestring import mark_safe
 from .translations import get_strings
 from .utils import filter_context_actions
+from .pagination import KeysetPaginationMixin
 from django.conf import settings
 
 User = get_user_model()
@@ -15,7 +16,7 @@ User = get_user_model()
 from django.urls import reverse
 import json
 
-class UserTable(tables.Table):
+class UserTable(KeysetPaginationMixin, tables.Table):
     username = tables.Column(verbose_name="اسم المستخدم")
     phone = tables.Column(verbose_name="رقم الهاتف", accessor='profile.phone', default='-')
     email = tables.Column(verbose_name="البريد الالكتروني")
@@ -25,6 +26,8 @@ class UserTable(tables.Table):
         accessor='profile.full_name', # Assuming profile has full_name property, or use user.get_full_name
         order_by='first_name'
     )
+    # Matches UserListView's default ordering
+    keyset = ('date_joined', 'id')
     is_staff = tables.BooleanColumn(verbose_name="مسؤول")
     is_active = tables.BooleanColumn(verbose_name="نشط")
     last_login = tables.DateColumn(
@@ -47,7 +50,7 @@ class UserTable(tables.Table):
             ])
         }
 
-class UserActivityLogTable(tables.Table):
+class UserActivityLogTable(KeysetPaginationMixin, tables.Table):
     timestamp = tables.DateColumn(
         format="H:i Y-m-d ",
         verbose_name="وقت العملية",
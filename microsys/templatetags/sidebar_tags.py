@@ -27,8 +27,10 @@ def auto_sidebar(context):
     extra_groups = context.get('sidebar_extra_groups', {})
     has_extra = bool(extra_groups)
     
-    # Add resolved URLs and active state
+    # Add resolved URLs and active state (microsys_context already provides both)
     for item in items:
+        if 'url' in item and 'active' in item:
+            continue
         try:
             item['url'] = reverse(item['url_name'])
             # Check if current path matches or starts with this URL
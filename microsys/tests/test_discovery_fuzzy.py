@@ -0,0 +1,33 @@
+from difflib import get_close_matches
+
+from django.test import SimpleTestCase
+
+from microsys.discovery import FUZZY_CUTOFF, _fuzzy_candidates
+
+
+def _index(names):
+    by_length = {}
+    for name in names:
+        by_length.setdefault(len(name), []).append(name)
+    return {'names': dict.fromkeys(names), 'by_length': by_length, 'lookups': {}}
+
+
+class FuzzyCandidatesTests(SimpleTestCase):
+    def test_ratio_exactly_at_cutoff_is_kept(self):
+        # ratio 2*4 / (6+4) == 0.8
+        index = _index(['abcd'])
+        self.assertEqual(get_close_matches('abcdef', _fuzzy_candidates(index, 'abcdef'), n=1, cutoff=FUZZY_CUTOFF), ['abcd'])
+
+    def test_boundary_lengths_match_full_scan(self):
+        alphabet = 'abcdefghijklmnopqrstuvwxyz'
+        for hint_length in range(1, 21):
+            hint = alphabet[:hint_length]
+            # Prefixes/extensions of the hint: the best possible ratio for each length pair
+            names = [alphabet[:size] for size in range(1, 27) if size != hint_length]
+            index = _index(names)
+            candidates = set(_fuzzy_candidates(index, hint))
+            for name in names:
+                with self.subTest(hint=hint_length, name=len(name)):
+                    full = get_close_matches(hint, [name], n=1, cutoff=FUZZY_CUTOFF)
+                    if full:
+                        self.assertIn(name, candidates)
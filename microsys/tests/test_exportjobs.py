@@ -0,0 +1,81 @@
+import pickle
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils.timezone import now
+
+from microsys.exportjobs import purge_expired_export_jobs, run_export_job, run_pending_export_jobs, start_export_job
+from microsys.models import ExportJob, Scope
+
+
+class ExportJobTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'pw')
+        Scope.objects.bulk_create([Scope(name=f'Scope {i}') for i in range(3)])
+
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def _start(self):
+        request = RequestFactory().get('/')
+        request.user = self.admin
+        with override_settings(MICROSYS_FETCHER={'EXPORT_RUNNER': 'command'}):
+            return start_export_job(request, Scope.objects.all(), format='csv')
+
+    def test_job_runs_from_signed_query(self):
+        job = self._start()
+        self.assertTrue(run_export_job(job.pk))
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.DONE)
+        self.assertEqual(job.processed, 3)
+
+    def test_unsigned_query_is_not_unpickled(self):
+        job = self._start()
+        ExportJob.objects.filter(pk=job.pk).update(query=pickle.dumps(Scope.objects.none().query))
+        run_export_job(job.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.FAILED)
+        self.assertFalse(job.file)
+
+    @override_settings(MICROSYS_FETCHER={'EXPORT_RUNNER': 'command', 'EXPORT_STALE_AFTER': 60})
+    def test_stale_running_job_is_failed(self):
+        stale = self._start()
+        fresh = self._start()
+        ExportJob.objects.filter(pk=stale.pk).update(status=ExportJob.RUNNING, started_at=now() - timedelta(minutes=5))
+        ExportJob.objects.filter(pk=fresh.pk).update(status=ExportJob.RUNNING, started_at=now())
+        run_pending_export_jobs()
+        self.assertEqual(ExportJob.objects.get(pk=stale.pk).status, ExportJob.FAILED)
+        self.assertEqual(ExportJob.objects.get(pk=fresh.pk).status, ExportJob.RUNNING)
+
+    @override_settings(MICROSYS_FETCHER={'EXPORT_RUNNER': 'thread', 'EXPORT_ORPHAN_AFTER': 60})
+    def test_thread_runner_sweep_only_runs_orphaned_jobs(self):
+        orphan = self._start()
+        queued = self._start()
+        ExportJob.objects.filter(pk=orphan.pk).update(created_at=now() - timedelta(minutes=5))
+        self.assertEqual(run_pending_export_jobs(), 1)
+        self.assertEqual(ExportJob.objects.get(pk=orphan.pk).status, ExportJob.DONE)
+        self.assertEqual(ExportJob.objects.get(pk=queued.pk).status, ExportJob.PENDING)
+
+    @override_settings(MICROSYS_FETCHER={'EXPORT_RUNNER': 'command', 'EXPORT_RETENTION_HOURS': 1})
+    def test_expired_jobs_and_files_are_purged(self):
+        expired = self._start()
+        recent = self._start()
+        run_export_job(expired.pk)
+        run_export_job(recent.pk)
+        expired.refresh_from_db()
+        storage, name = expired.file.storage, expired.file.name
+        self.assertTrue(storage.exists(name))
+        ExportJob.objects.filter(pk=expired.pk).update(finished_at=now() - timedelta(hours=2))
+
+        self.assertEqual(purge_expired_export_jobs(), 1)
+        self.assertFalse(ExportJob.objects.filter(pk=expired.pk).exists())
+        self.assertFalse(storage.exists(name))
+        self.assertTrue(ExportJob.objects.filter(pk=recent.pk).exists())
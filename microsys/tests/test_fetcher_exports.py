@@ -0,0 +1,148 @@
+import csv
+import io
+import json
+import unittest
+
+import openpyxl
+from openpyxl.utils import get_column_letter
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection, models
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from microsys.fetcher import _export_columns, _format_columns, _parquet_type, fetch_excel, fetch_export
+from microsys.models import UserActivityLog
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+# Two rows per chunk: five rows span three chunks, both users appear in the first
+@override_settings(MICROSYS_FETCHER={'EXPORT_CHUNK_SIZE': 2})
+class ExportTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.users = [User.objects.create_user('alice'), User.objects.create_user('bob')]
+        UserActivityLog.objects.bulk_create([
+            UserActivityLog(created_by=cls.users[index % 2], action=f"ACTION{index}", object_id=index)
+            for index in range(5)
+        ])
+        cls.queryset = UserActivityLog.objects.order_by('pk')
+
+    def _request(self):
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        return request
+
+    def _body(self, response):
+        return b''.join(response.streaming_content)
+
+
+class ExcelExportTests(ExportTestCase):
+    def test_workbook_headers_labels_and_hidden_columns(self):
+        # exists() + one values_list() read + one in_bulk() for created_by (memoized after the first chunk)
+        with self.assertNumQueries(3):
+            response = fetch_excel(self._request(), self.queryset, hidden_fields=['action'])
+            body = self._body(response)
+
+        self.assertEqual(response['Content-Type'], 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+        self.assertIn('useractivitylog_export_5.xlsx', response['Content-Disposition'])
+
+        columns = _export_columns(UserActivityLog, hidden_fields=['action'])
+        names = [col['name'] for col in columns]
+        sheet = openpyxl.load_workbook(io.BytesIO(body)).active
+        rows = list(sheet.iter_rows(values_only=True))
+        self.assertEqual(list(rows[0]), [str(col['verbose']) for col in columns])
+        self.assertEqual(len(rows), 6)
+
+        created_by = names.index('created_by')
+        self.assertEqual([row[created_by] for row in rows[1:]], ['alice', 'bob', 'alice', 'bob', 'alice'])
+        self.assertEqual(rows[1][names.index('action')], 'ACTION0')
+
+        for index, col in enumerate(columns, start=1):
+            with self.subTest(column=col['name']):
+                self.assertEqual(bool(sheet.column_dimensions[get_column_letter(index)].hidden), col['hidden'])
+        self.assertTrue(columns[names.index('action')]['hidden'])
+        self.assertTrue(columns[names.index('updated_at')]['hidden'])
+        self.assertFalse(columns[names.index('created_by')]['hidden'])
+
+
+class FlatExportTests(ExportTestCase):
+    def _export(self, format):
+        with CaptureQueriesContext(connection) as queries:
+            response = fetch_export(self._request(), self.queryset, format=format)
+            body = self._body(response)
+        self.assertFalse([q for q in queries if 'COUNT(' in q['sql'].upper()])
+        return response, body
+
+    def test_csv_round_trip(self):
+        response, body = self._export('csv')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('useractivitylog_export.csv', response['Content-Disposition'])
+
+        columns = _format_columns(UserActivityLog, 'csv')
+        rows = list(csv.reader(io.StringIO(body.decode('utf-8-sig'))))
+        self.assertEqual(rows[0], [str(col['verbose']) for col in columns])
+        names = [col['name'] for col in columns]
+        self.assertEqual([row[names.index('created_by')] for row in rows[1:]], ['alice', 'bob', 'alice', 'bob', 'alice'])
+        self.assertEqual([row[names.index('action')] for row in rows[1:]], [f"ACTION{i}" for i in range(5)])
+        self.assertNotIn('updated_at', names)
+
+    def test_jsonl_round_trip(self):
+        response, body = self._export('jsonl')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        records = [json.loads(line) for line in body.decode('utf-8').splitlines()]
+        self.assertEqual(len(records), 5)
+        self.assertEqual(list(records[0]), [col['name'] for col in _format_columns(UserActivityLog, 'jsonl')])
+        self.assertEqual(records[1]['created_by'], 'bob')
+        self.assertEqual(records[1]['object_id'], 1)
+        self.assertIsNone(records[1]['scope'])
+
+    @unittest.skipUnless(pyarrow, "pyarrow is not installed")
+    def test_parquet_round_trip(self):
+        response = fetch_export(self._request(), self.queryset, format='parquet')
+        self.assertIn('useractivitylog_export_5.parquet', response['Content-Disposition'])
+        table = pyarrow.parquet.read_table(io.BytesIO(self._body(response)))
+
+        columns = _format_columns(UserActivityLog, 'parquet')
+        self.assertEqual(table.schema.names, [col['name'] for col in columns])
+        self.assertEqual(table.schema.field('id').type, pyarrow.int64())
+        self.assertEqual(table.schema.field('object_id').type, pyarrow.int64())
+        self.assertEqual(table.schema.field('created_by').type, pyarrow.string())
+        self.assertTrue(pyarrow.types.is_timestamp(table.schema.field('created_at').type))
+        self.assertEqual(table.column('created_by').to_pylist(), ['alice', 'bob', 'alice', 'bob', 'alice'])
+        self.assertEqual(table.column('object_id').to_pylist(), [0, 1, 2, 3, 4])
+
+
+@unittest.skipUnless(pyarrow, "pyarrow is not installed")
+class ParquetTypeTests(SimpleTestCase):
+    def test_field_types(self):
+        pa = pyarrow
+        cases = [
+            (models.BigAutoField(primary_key=True), pa.int64()),
+            (models.PositiveSmallIntegerField(), pa.int64()),
+            (models.FloatField(), pa.float64()),
+            (models.BooleanField(), pa.bool_()),
+            (models.DateField(), pa.date32()),
+            (models.DecimalField(max_digits=10, decimal_places=2), pa.decimal128(10, 2)),
+            (models.DecimalField(max_digits=60, decimal_places=2), pa.string()),
+            (models.CharField(max_length=10), pa.string()),
+            (models.JSONField(), pa.string()),
+            (UserActivityLog._meta.get_field('created_by'), pa.string()),
+        ]
+        for field, expected in cases:
+            with self.subTest(field=field.__class__.__name__):
+                self.assertEqual(_parquet_type(field, pa), expected)
+
+    def test_datetime_follows_use_tz(self):
+        field = models.DateTimeField()
+        with self.settings(USE_TZ=True):
+            self.assertEqual(_parquet_type(field, pyarrow), pyarrow.timestamp('us', tz='UTC'))
+        with self.settings(USE_TZ=False):
+            self.assertEqual(_parquet_type(field, pyarrow), pyarrow.timestamp('us'))
@@ -0,0 +1,88 @@
+from django.core.files.base import ContentFile
+from django.test import RequestFactory, SimpleTestCase
+
+from microsys.fetcher import _parse_range, _serve_file
+
+CONTENT = bytes(range(100))
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_headers(self):
+        cases = [
+            ('bytes=0-9', (0, 9)),
+            ('bytes=90-', (90, 99)),
+            ('bytes=90-500', (90, 99)),
+            ('bytes=-5', (95, 99)),
+            ('bytes=-500', (0, 99)),
+            ('bytes=100-', False),
+            ('bytes=-0', False),
+            ('bytes=9-0', None),
+            ('bytes=-', None),
+            ('bytes=0-1,5-6', None),
+            ('items=0-9', None),
+        ]
+        for header, expected in cases:
+            with self.subTest(header=header):
+                self.assertEqual(_parse_range(header, len(CONTENT)), expected)
+
+
+class ServeFileTests(SimpleTestCase):
+    def _get(self, **headers):
+        request = RequestFactory().get('/', **headers)
+        response = _serve_file(ContentFile(CONTENT, name='scopes.csv'), 'scopes.csv', request)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_full_download(self):
+        response, body = self._get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, CONTENT)
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('scopes.csv', response['Content-Disposition'])
+        self.assertNotIn('Content-Range', response)
+
+    def test_partial_content(self):
+        for header, start, end in [('bytes=10-19', 10, 19), ('bytes=90-', 90, 99), ('bytes=95-500', 95, 99)]:
+            with self.subTest(header=header):
+                response, body = self._get(HTTP_RANGE=header)
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(body, CONTENT[start:end + 1])
+                self.assertEqual(response['Content-Range'], f'bytes {start}-{end}/100')
+                self.assertEqual(response['Content-Length'], str(end - start + 1))
+                self.assertIn('scopes.csv', response['Content-Disposition'])
+
+    def test_suffix_range(self):
+        response, body = self._get(HTTP_RANGE='bytes=-5')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, CONTENT[-5:])
+        self.assertEqual(response['Content-Range'], 'bytes 95-99/100')
+
+        response, body = self._get(HTTP_RANGE='bytes=-500')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, CONTENT)
+        self.assertEqual(response['Content-Range'], 'bytes 0-99/100')
+
+    def test_unsatisfiable_range(self):
+        for header in ('bytes=100-', 'bytes=500-600', 'bytes=-0'):
+            with self.subTest(header=header):
+                response, _ = self._get(HTTP_RANGE=header)
+                self.assertEqual(response.status_code, 416)
+                self.assertEqual(response['Content-Range'], 'bytes */100')
+
+    def test_multi_range_gets_full_file(self):
+        response, body = self._get(HTTP_RANGE='bytes=0-1,5-6')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, CONTENT)
+        self.assertEqual(response['Content-Length'], '100')
+
+    def test_malformed_range_gets_full_file(self):
+        response, body = self._get(HTTP_RANGE='items=0-9')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, CONTENT)
+
+    def test_if_range_falls_back_to_full_file(self):
+        response, body = self._get(HTTP_RANGE='bytes=10-19', HTTP_IF_RANGE='"some-etag"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, CONTENT)
+        self.assertNotIn('Content-Range', response)
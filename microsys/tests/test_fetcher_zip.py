@@ -0,0 +1,81 @@
+import io
+import zipfile
+
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, override_settings
+
+from microsys.fetcher import _serve_zip
+
+PDF = b'%PDF-1.4 ' + bytes(range(256)) * 40
+TEXT = b'plain text line\n' * 2000
+
+
+class _UnsizedFile(ContentFile):
+    """Storage file whose size is unknown up front (forces a zip64 member)."""
+
+    @property
+    def size(self):
+        raise OSError("size unavailable")
+
+    @size.setter
+    def size(self, value):
+        pass
+
+
+class _MissingFile(ContentFile):
+    def open(self, mode=None):
+        raise FileNotFoundError(self.name)
+
+
+# Small chunks so every member spans several writes to the non-seekable sink
+@override_settings(MICROSYS_FETCHER={'CHUNK_SIZE': 1024})
+class ServeZipTests(SimpleTestCase):
+    def _archive(self, files):
+        response = _serve_zip(
+            [{'filename': name, 'file': file_obj} for name, file_obj in files],
+            'documents.zip',
+        )
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        self.assertIn('documents.zip', response['Content-Disposition'])
+        return zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+
+    def test_members_round_trip_with_per_type_compression(self):
+        archive = self._archive([
+            ('report.pdf', ContentFile(PDF, name='report.pdf')),
+            ('notes.txt', ContentFile(TEXT, name='notes.txt')),
+        ])
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(archive.namelist(), ['report.pdf', 'notes.txt'])
+        self.assertEqual(archive.read('report.pdf'), PDF)
+        self.assertEqual(archive.read('notes.txt'), TEXT)
+        self.assertEqual(archive.getinfo('report.pdf').compress_type, zipfile.ZIP_STORED)
+        self.assertEqual(archive.getinfo('notes.txt').compress_type, zipfile.ZIP_DEFLATED)
+        self.assertLess(archive.getinfo('notes.txt').compress_size, len(TEXT))
+
+    def test_duplicate_names_are_made_unique(self):
+        archive = self._archive([
+            ('scan.pdf', ContentFile(b'first', name='scan.pdf')),
+            ('scan.pdf', ContentFile(b'second', name='scan.pdf')),
+        ])
+        self.assertEqual(archive.namelist(), ['scan.pdf', 'scan_1.pdf'])
+        self.assertEqual(archive.read('scan.pdf'), b'first')
+        self.assertEqual(archive.read('scan_1.pdf'), b'second')
+
+    def test_unsized_member_is_written_as_zip64(self):
+        archive = self._archive([
+            ('notes.txt', _UnsizedFile(TEXT, name='notes.txt')),
+            ('report.pdf', ContentFile(PDF, name='report.pdf')),
+        ])
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(archive.read('notes.txt'), TEXT)
+        self.assertEqual(archive.read('report.pdf'), PDF)
+        self.assertEqual(archive.getinfo('notes.txt').compress_type, zipfile.ZIP_DEFLATED)
+
+    def test_unreadable_member_is_skipped(self):
+        archive = self._archive([
+            ('missing.pdf', _MissingFile(b'', name='missing.pdf')),
+            ('notes.txt', ContentFile(TEXT, name='notes.txt')),
+        ])
+        self.assertEqual(archive.namelist(), ['notes.txt'])
+        self.assertEqual(archive.read('notes.txt'), TEXT)
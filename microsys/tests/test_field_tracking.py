@@ -0,0 +1,32 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from microsys.middleware import request_context
+from microsys.models import UserActivityLog
+
+
+@override_settings(MICROSYS_ACTIVITY_LOG={'TRACK_FIELDS': True})
+class FieldSnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        cls.target = User.objects.create_user('someone', email='someone@example.com', first_name='Old')
+
+    def test_reading_a_deferred_field_keeps_unsaved_edits_in_the_diff(self):
+        user = get_user_model().objects.defer('email').get(pk=self.target.pk)
+        user.first_name = 'New'
+        self.assertEqual(user.email, 'someone@example.com')  # refresh_from_db(fields=['email'])
+        self.assertEqual(user._microsys_snapshot['first_name'], 'Old')
+
+        with request_context(user=self.admin):
+            user.save()
+        log = UserActivityLog.objects.get(action="UPDATE", object_id=user.pk)
+        self.assertEqual(log.details['first_name'], {'old': 'Old', 'new': 'New'})
+
+    def test_full_refresh_resets_the_snapshot(self):
+        user = get_user_model().objects.get(pk=self.target.pk)
+        user.first_name = 'New'
+        user.refresh_from_db()
+        self.assertEqual(user.first_name, 'Old')
+        self.assertEqual(user._microsys_snapshot['first_name'], 'Old')
@@ -0,0 +1,107 @@
+import gzip
+import os
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from microsys import logarchive
+from microsys.cache_versions import bump_cache_generation
+from microsys.models import UserActivityLog
+
+
+class ArchiveMonthsTests(TransactionTestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('someone', password='pw')
+
+    def tearDown(self):
+        for year, month in logarchive.list_archive_months():
+            with connection.schema_editor() as editor:
+                editor.delete_model(logarchive.get_archive_model(year, month))
+        logarchive._existing_tables.clear()
+        bump_cache_generation('log_archive')
+
+    def _archive(self, days_ago):
+        log = UserActivityLog.objects.create(created_by=self.user, action="VIEW")
+        UserActivityLog.objects.filter(pk=log.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+        logarchive.archive_logs(timezone.now() - timedelta(days=days_ago - 1))
+        return log
+
+    def test_month_list_is_cached_until_a_table_is_created(self):
+        self.assertEqual(logarchive.list_archive_months(), [])
+        with CaptureQueriesContext(connection) as queries:
+            logarchive.list_archive_months()
+        self.assertEqual(len(queries), 0)
+
+        log = self._archive(400)
+        stamp = timezone.localtime(log.created_at - timedelta(days=400))
+        self.assertEqual(logarchive.list_archive_months(), [(stamp.year, stamp.month)])
+
+    def test_archived_log_is_found_with_one_query(self):
+        older = self._archive(400)
+        newer = self._archive(40)
+        self.assertEqual(len(logarchive.list_archive_months()), 2)
+        with CaptureQueriesContext(connection) as queries:
+            found = logarchive.get_archived_log(older.pk)
+        archive_queries = [q for q in queries if logarchive.ARCHIVE_TABLE_PREFIX in q['sql']]
+        self.assertEqual(len(archive_queries), 1)
+        self.assertEqual(found.pk, older.pk)
+        self.assertEqual(logarchive.get_archived_log(newer.pk).pk, newer.pk)
+        self.assertIsNone(logarchive.get_archived_log(newer.pk + 1000))
+
+    def test_archive_models_stay_out_of_the_app_registry(self):
+        model = logarchive.get_archive_model(2020, 1)
+        self.assertNotIn(model, apps.get_models())
+        self.assertNotIn(model, [rel.related_model for rel in get_user_model()._meta.get_fields(include_hidden=True)])
+        self.assertIs(logarchive.get_archive_model(2020, 1), model)
+
+
+class HotCutoffTests(TransactionTestCase):
+    @override_settings(MICROSYS_ACTIVITY_LOG={'HOT_DAYS': 30})
+    def test_cutoff_is_stable_within_the_hour(self):
+        start = timezone.now().replace(minute=0, second=0, microsecond=0)
+        cutoffs = set()
+        for offset in (timedelta(minutes=1), timedelta(minutes=59, microseconds=17)):
+            with mock.patch.object(logarchive.timezone, 'now', return_value=start + offset):
+                cutoffs.add(logarchive.get_hot_cutoff())
+        self.assertEqual(cutoffs, {start - timedelta(days=30)})
+
+    def test_no_cutoff_without_hot_days(self):
+        self.assertIsNone(logarchive.get_hot_cutoff())
+
+
+class JsonlArchiveTests(TransactionTestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('someone', password='pw')
+        self.archive_dir = tempfile.mkdtemp()
+        override = override_settings(MICROSYS_ACTIVITY_LOG={'ARCHIVE_DIR': self.archive_dir})
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def _archived_lines(self):
+        lines = []
+        for name in os.listdir(self.archive_dir):
+            self.assertTrue(name.endswith('.jsonl.gz'), name)
+            with gzip.open(os.path.join(self.archive_dir, name), 'rt', encoding='utf-8') as fh:
+                lines.extend(fh.read().splitlines())
+        return lines
+
+    def test_failed_chunk_leaves_no_archive_records(self):
+        log = UserActivityLog.objects.create(created_by=self.user, action="VIEW")
+        cutoff = timezone.now() + timedelta(seconds=1)
+
+        with mock.patch.object(logarchive, '_delete_rows', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                logarchive.archive_logs(cutoff, backend='jsonl')
+        self.assertEqual(os.listdir(self.archive_dir), [])
+        self.assertTrue(UserActivityLog.objects.filter(pk=log.pk).exists())
+
+        logarchive.archive_logs(cutoff, backend='jsonl')
+        self.assertEqual(len(self._archived_lines()), 1)
+        self.assertFalse(UserActivityLog.objects.filter(pk=log.pk).exists())
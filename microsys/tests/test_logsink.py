@@ -0,0 +1,80 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+
+from microsys.logsink import flush_log_sink, get_log_sink
+from microsys.middleware import request_context
+from microsys.models import UserActivityLog
+
+
+# Long interval: the test flushes itself, the background drain must not race it
+@override_settings(MICROSYS_ACTIVITY_LOG={'SINK': 'queued', 'FLUSH_INTERVAL': 3600})
+class QueuedSinkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'pw')
+
+    def _user_profile_logs(self, user):
+        return UserActivityLog.objects.filter(model_name="User Profile", object_id=user.pk)
+
+    def test_user_profile_pair_merges_inside_transaction(self):
+        # TestCase wraps everything in atomic(), so on_commit entries would not be visible yet
+        with self.captureOnCommitCallbacks(execute=True), request_context(user=self.admin):
+            user = get_user_model().objects.create_user('someone', password='pw')
+            user.profile.phone = '0100'
+            user.profile.save()
+        flush_log_sink(wait=True)
+        logs = self._user_profile_logs(user)
+        self.assertEqual(logs.count(), 1)
+        self.assertEqual(logs.get().action, "CREATE")
+
+    def test_queued_write_returns_none_and_keeps_action_time(self):
+        with self.captureOnCommitCallbacks() as callbacks, request_context(user=self.admin):
+            self.assertIsNone(UserActivityLog.safe_log(user=self.admin, action="EXPORT", model_name="report"))
+        written = now()
+        for callback in callbacks:
+            callback()
+        flush_log_sink(wait=True)
+        self.assertLessEqual(UserActivityLog.objects.get(action="EXPORT").created_at, written)
+
+    def test_repeats_in_one_transaction_are_queued_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            UserActivityLog.safe_log(user=self.admin, action="EXPORT", model_name="report")
+            UserActivityLog.safe_log(user=self.admin, action="EXPORT", model_name="report")
+        flush_log_sink(wait=True)
+        self.assertEqual(UserActivityLog.objects.filter(action="EXPORT").count(), 1)
+
+    def test_rolled_back_write_does_not_suppress_retry(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                UserActivityLog.safe_log(user=self.admin, action="EXPORT", model_name="report")
+                transaction.set_rollback(True)
+            UserActivityLog.safe_log(user=self.admin, action="EXPORT", model_name="report")
+        flush_log_sink(wait=True)
+        self.assertEqual(UserActivityLog.objects.filter(action="EXPORT").count(), 1)
+
+
+@override_settings(MICROSYS_ACTIVITY_LOG={'SINK': 'sync'})
+class SyncSinkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'pw')
+
+    def test_rolled_back_write_does_not_suppress_retry(self):
+        with transaction.atomic():
+            UserActivityLog.safe_log(user=self.admin, action="EXPORT", model_name="report")
+            transaction.set_rollback(True)
+        self.assertIsNotNone(UserActivityLog.safe_log(user=self.admin, action="EXPORT", model_name="report"))
+        self.assertIsNone(UserActivityLog.safe_log(user=self.admin, action="EXPORT", model_name="report"))
+
+
+class SinkResetTests(TestCase):
+    def test_settings_override_stops_the_replaced_worker(self):
+        with override_settings(MICROSYS_ACTIVITY_LOG={'SINK': 'queued', 'FLUSH_INTERVAL': 3600}):
+            sink = get_log_sink()
+            sink._ensure_worker()
+            worker = sink._thread
+        worker.join(timeout=5)
+        self.assertFalse(worker.is_alive())
+        self.assertIsNot(get_log_sink(), sink)
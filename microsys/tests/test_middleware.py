@@ -0,0 +1,45 @@
+import asyncio
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from microsys.middleware import ActivityLogMiddleware, get_current_request, get_current_user
+
+
+class ActivityLogMiddlewareAsyncTests(SimpleTestCase):
+    async def test_concurrent_requests_keep_their_own_context(self):
+        User = get_user_model()
+        entered = []
+        both_inside = asyncio.Event()
+        seen = {}
+
+        async def view(request):
+            entered.append(request)
+            if len(entered) == 2:
+                both_inside.set()
+            # Both requests are inside the middleware before either reads its context
+            await both_inside.wait()
+            seen[request.user.username] = (get_current_request(), get_current_user())
+            return HttpResponse()
+
+        middleware = ActivityLogMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+
+        async def handle(username):
+            request = RequestFactory().get('/')
+            request.user = User(username=username)
+            response = await middleware(request)
+            return request, response, (get_current_request(), get_current_user())
+
+        results = await asyncio.gather(handle('alice'), handle('bob'))
+
+        for request, response, after in results:
+            with self.subTest(user=request.user.username):
+                self.assertEqual(response.status_code, 200)
+                self.assertIs(seen[request.user.username][0], request)
+                self.assertIs(seen[request.user.username][1], request.user)
+                # Unbound again once the middleware returns
+                self.assertEqual(after, (None, None))
+        self.assertEqual((get_current_request(), get_current_user()), (None, None))
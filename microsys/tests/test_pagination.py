@@ -0,0 +1,121 @@
+import json
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.query import QuerySet
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django_tables2 import RequestConfig
+
+from microsys.models import UserActivityLog
+from microsys.pagination import _seek_filter, decode_cursor, encode_cursor, estimated_count
+from microsys.tables import UserTable
+
+User = get_user_model()
+
+
+class CursorTests(SimpleTestCase):
+    def test_round_trip(self):
+        token = encode_cursor(['2024-01-01T00:00:00+00:00', '42'], 'prev', 3)
+        self.assertNotIn('=', token)
+        self.assertEqual(decode_cursor(token), (['2024-01-01T00:00:00+00:00', '42'], 'prev', 3))
+
+    def test_missing_or_garbled_token(self):
+        for token in (None, '', 'not-base64!', encode_cursor(['1'], 'next', 1)[:-3], 'e30'):
+            with self.subTest(token=token):
+                self.assertIsNone(decode_cursor(token))
+
+    def test_bad_direction_and_page_are_normalized(self):
+        self.assertEqual(decode_cursor(encode_cursor(['1'], 'sideways', 0)), (['1'], 'next', 1))
+
+    def test_seek_filter_breaks_ties_on_the_next_key(self):
+        condition = _seek_filter(('-created_at', '-id'), ['t', 5], forward=True)
+        self.assertEqual(
+            str(condition),
+            "(OR: ('created_at__lt', 't'), (AND: ('created_at', 't'), ('id__lt', 5)))",
+        )
+
+
+class KeysetPaginatorTests(TestCase):
+    per_page = 3
+
+    @classmethod
+    def setUpTestData(cls):
+        base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        # Several users share a date_joined, so only the id keeps the order total
+        joined = [base, base, base, base + timedelta(days=1), base + timedelta(days=1), base + timedelta(days=2), base, base + timedelta(days=3)]
+        for index, stamp in enumerate(joined):
+            User.objects.create_user(f'user{index}', password='pw', date_joined=stamp)
+        cls.expected = list(User.objects.order_by('date_joined', 'id').values_list('pk', flat=True))
+
+    def _page(self, cursor=None):
+        request = RequestFactory().get('/', {'cursor': cursor} if cursor else {})
+        table = UserTable(User.objects.all())
+        RequestConfig(request, paginate={'per_page': self.per_page}).configure(table)
+        return table.page
+
+    def _ids(self, page):
+        return [row.record.pk for row in page.object_list]
+
+    def _walk_forward(self):
+        pages = [self._page()]
+        while pages[-1].has_next():
+            pages.append(self._page(pages[-1].next_cursor))
+        return pages
+
+    def test_forward_walk_visits_every_row_once(self):
+        pages = self._walk_forward()
+        self.assertEqual([pk for page in pages for pk in self._ids(page)], self.expected)
+        self.assertEqual([page.number for page in pages], [1, 2, 3])
+
+    def test_last_page(self):
+        last = self._walk_forward()[-1]
+        self.assertFalse(last.has_next())
+        self.assertIsNone(last.next_cursor)
+        self.assertTrue(last.has_previous())
+        self.assertEqual(self._ids(last), self.expected[6:])
+        self.assertEqual(last.paginator.num_pages, 3)
+
+    def test_backward_walk_returns_the_same_pages(self):
+        forward = self._walk_forward()
+        page = forward[-1]
+        backward = [page]
+        while page.has_previous():
+            page = self._page(page.previous_cursor)
+            backward.append(page)
+        self.assertEqual([self._ids(p) for p in reversed(backward)], [self._ids(p) for p in forward])
+        self.assertEqual([p.number for p in backward], [3, 2, 1])
+        first = backward[-1]
+        self.assertFalse(first.has_previous())
+        self.assertTrue(first.has_next())
+
+    def test_garbled_cursor_falls_back_to_first_page(self):
+        page = self._page('garbage')
+        self.assertEqual(page.number, 1)
+        self.assertEqual(self._ids(page), self.expected[:3])
+
+
+class EstimatedCountTests(TestCase):
+    def setUp(self):
+        # Exact counts are cached per SQL; start from a clean slate
+        cache.clear()
+
+    def _explain(self, rows):
+        return mock.patch.object(QuerySet, 'explain', return_value=json.dumps([{'Plan': {'Plan Rows': rows}}]))
+
+    def test_scoped_queryset_uses_the_planner_estimate_on_postgres(self):
+        queryset = UserActivityLog.objects.all()
+        self.assertTrue(queryset.query.where)  # ScopedManager filters out soft-deleted rows
+        with mock.patch.object(connection, 'vendor', 'postgresql'), self._explain(250000) as explain:
+            with self.assertNumQueries(0):
+                self.assertEqual(estimated_count(queryset), 250000)
+        explain.assert_called_once_with(format='json')
+
+    def test_small_estimates_fall_back_to_a_cached_count(self):
+        admin = User.objects.create_user('admin', password='pw')
+        UserActivityLog.objects.create(created_by=admin, action="VIEW")
+        queryset = UserActivityLog.objects.all()
+        with mock.patch.object(connection, 'vendor', 'postgresql'), self._explain(3):
+            self.assertEqual(estimated_count(queryset), 1)
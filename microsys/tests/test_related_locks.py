@@ -0,0 +1,149 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.db.models.fields.related import ManyToManyRel, ManyToOneRel
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from microsys.models import Profile, Scope
+from microsys.utils import compute_locked_ids, has_related_records, related_objects_exist
+
+User = get_user_model()
+
+
+def per_row_locked(instance, ignore_relations=()):
+    """has_related_records() as it was before compute_locked_ids: one row, one check per relation."""
+    fields = instance._meta.get_fields()
+    through_models = {f.through for f in fields if isinstance(f, ManyToManyRel) and f.through}
+    skip = set(ignore_relations)
+    skip.update(f.get_accessor_name() for f in fields if isinstance(f, ManyToManyRel))
+    skip.update(
+        f.get_accessor_name() for f in fields
+        if isinstance(f, ManyToOneRel) and f.related_model in through_models
+    )
+    for field in fields:
+        if not (field.is_relation and field.auto_created):
+            continue
+        accessor = field.get_accessor_name()
+        if not accessor or accessor in skip:
+            continue
+        try:
+            related = getattr(instance, accessor)
+        except Exception:
+            continue
+        if field.one_to_one or related.exists():
+            return True
+    return False
+
+
+class ComputeLockedIdsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.scopes = [Scope.objects.create(name=f'Scope {i}') for i in range(4)]
+        cls.users = [User.objects.create_user(f'user{i}', password='pw') for i in range(4)]
+        # Protected FK: Profile.scope (on_delete=PROTECT)
+        for user, scope in zip(cls.users[:2], cls.scopes[:2]):
+            Profile.objects.filter(user=user).update(scope=scope)
+        # A soft-deleted profile is hidden by the reverse manager, as before
+        Profile.all_objects.filter(user=cls.users[2]).update(scope=cls.scopes[2])
+        Profile.objects.get(user=cls.users[2]).delete()
+        # Reverse OneToOne: user3 has no profile row at all
+        Profile.all_objects.filter(user=cls.users[3]).delete()
+        cls.group = Group.objects.create(name='staff')
+        cls.group.user_set.add(cls.users[0])
+        cls.empty_group = Group.objects.create(name='empty')
+
+    def _assert_matches_per_row(self, model, objects, **kwargs):
+        fresh = list(model._base_manager.filter(pk__in=[obj.pk for obj in objects]))
+        expected = {obj.pk for obj in fresh if per_row_locked(obj, kwargs.get('ignore', ()))}
+        self.assertEqual(compute_locked_ids(model, [obj.pk for obj in fresh], **kwargs), expected)
+        return expected
+
+    def test_protected_fk(self):
+        locked = self._assert_matches_per_row(Scope, self.scopes)
+        self.assertEqual(locked, {self.scopes[0].pk, self.scopes[1].pk})
+
+    def test_ignored_accessor(self):
+        accessor = Profile._meta.get_field('scope').remote_field.get_accessor_name()
+        self.assertEqual(self._assert_matches_per_row(Scope, self.scopes, ignore=[accessor]), set())
+
+    def test_reverse_one_to_one(self):
+        locked = self._assert_matches_per_row(User, self.users)
+        # Soft-deleted profiles still lock their user: reverse O2O reads the base manager
+        self.assertEqual(locked, {user.pk for user in self.users[:3]})
+
+    def test_m2m_child_side_does_not_lock(self):
+        self.assertEqual(self._assert_matches_per_row(Group, [self.group, self.empty_group]), set())
+
+    def test_has_related_records_delegates(self):
+        for obj in list(Scope.objects.all()) + list(User.objects.all()):
+            with self.subTest(obj=obj):
+                self.assertEqual(has_related_records(obj), per_row_locked(obj))
+
+    def test_one_query_per_relation(self):
+        relations = [
+            rel for rel in Scope._meta.get_fields()
+            if rel.auto_created and not rel.concrete and not rel.many_to_many
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            compute_locked_ids(Scope, [scope.pk for scope in self.scopes])
+        lookups = [q for q in queries if 'scopesettings' not in q['sql']]  # ScopedManager's enabled check
+        self.assertLessEqual(len(lookups), len(relations))
+
+    def test_empty_and_missing_pks(self):
+        self.assertEqual(compute_locked_ids(Scope, []), set())
+        self.assertEqual(compute_locked_ids(Scope, [None]), set())
+        self.assertEqual(compute_locked_ids(Scope, [10 ** 6]), set())
+
+
+class RelatedObjectsExistTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.scope = Scope.objects.create(name='used')
+        cls.free_scope = Scope.objects.create(name='free')
+        cls.user = User.objects.create_user('someone', password='pw')
+        Profile.objects.filter(user=cls.user).update(scope=cls.scope)
+        cls.group = Group.objects.create(name='staff')
+        cls.group.user_set.add(cls.user)
+
+    def test_fk_o2o_and_m2m(self):
+        self.assertTrue(related_objects_exist(self.scope))
+        self.assertFalse(related_objects_exist(self.free_scope))
+        # Reverse OneToOne (profile) and forward M2M (groups)
+        self.assertTrue(related_objects_exist(self.user))
+        # Reverse M2M blocks deletion, unlike the lock check
+        self.assertTrue(related_objects_exist(self.group))
+        self.assertFalse(related_objects_exist(Group.objects.create(name='empty')))
+
+
+class DeleteGuardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        cls.scope = Scope.objects.create(name='used')
+        cls.free_scope = Scope.objects.create(name='free')
+        Profile.objects.filter(user=User.objects.create_user('someone', password='pw')).update(scope=cls.scope)
+
+    def setUp(self):
+        # Through the login view: the microsys login signal needs a real request
+        self.client.post(reverse('login'), {'username': 'admin', 'password': 'pw'})
+
+    def _modal_delete(self, scope):
+        return self.client.post(reverse('modal_delete', args=['microsys', 'scope', scope.pk])).json()
+
+    def test_modal_delete_refuses_protected_rows(self):
+        self.assertFalse(self._modal_delete(self.scope)['success'])
+        self.assertTrue(Scope.objects.filter(pk=self.scope.pk).exists())
+
+    def test_modal_delete_removes_free_rows(self):
+        self.assertTrue(self._modal_delete(self.free_scope)['success'])
+        self.assertFalse(Scope.objects.filter(pk=self.free_scope.pk).exists())
+
+    def test_section_delete_lists_what_blocks(self):
+        response = self.client.post(
+            reverse('delete_section'), {'model': 'scope', 'pk': self.scope.pk}, content_type='application/json',
+        ).json()
+        self.assertFalse(response['success'])
+        self.assertTrue(response['related'])
+        self.assertTrue(Scope.objects.filter(pk=self.scope.pk).exists())
@@ -0,0 +1,38 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from microsys import utils
+from microsys.models import Scope, UserActivityLog
+
+
+class CollectRelatedObjectsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.scope = Scope.objects.create(name='used')
+        for action in ('CREATE', 'UPDATE', 'DELETE'):
+            UserActivityLog.objects.create(action=action, scope=cls.scope, details={'k': action}, user_agent='ua')
+        cls.accessor = UserActivityLog._meta.get_field('scope').remote_field.get_accessor_name()
+
+    def setUp(self):
+        utils._DISPLAY_FIELDS_CACHE.clear()
+        self.addCleanup(utils._DISPLAY_FIELDS_CACHE.clear)
+
+    def _prefetched(self):
+        scope = Scope.objects.get(pk=self.scope.pk)
+        related = utils.collect_related_objects(scope, with_counts=True)
+        self.assertEqual(related[str(UserActivityLog._meta.verbose_name_plural)]['count'], 3)
+        return getattr(scope, f'_microsys_related_{self.accessor}')
+
+    def test_rows_are_loaded_whole_by_default(self):
+        # __str__ may read any field; deferring one would cost a query per label
+        for log in self._prefetched():
+            self.assertEqual(log.get_deferred_fields(), set())
+
+    def test_declared_display_fields_narrow_the_load(self):
+        with mock.patch.object(UserActivityLog, 'display_fields', ('action',), create=True):
+            logs = self._prefetched()
+        for log in logs:
+            self.assertIn('details', log.get_deferred_fields())
+            self.assertNotIn('action', log.get_deferred_fields())
+            self.assertNotIn('scope_id', log.get_deferred_fields())
@@ -0,0 +1,41 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from microsys.cache_versions import get_cache_generation
+from microsys.models import SystemSettings
+from microsys.utils import get_system_config
+
+
+class SystemSettingsCacheTests(TestCase):
+    def test_save_caches_the_row_under_the_new_generation(self):
+        settings = SystemSettings.load()
+        generation = get_cache_generation('config')
+        settings.name_en = 'Renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            settings.save()
+
+        self.assertGreater(get_cache_generation('config'), generation)
+        cached = cache.get(SystemSettings._cache_key())
+        self.assertIsNotNone(cached)
+        self.assertEqual(cached.name_en, 'Renamed')
+        with self.assertNumQueries(0):
+            self.assertEqual(SystemSettings.load().name_en, 'Renamed')
+        self.assertEqual(get_system_config()['name_en'], 'Renamed')
+
+    def test_read_before_commit_is_not_pinned_to_the_new_generation(self):
+        settings = SystemSettings.load()
+        settings.name_en = 'Before'
+        with self.captureOnCommitCallbacks(execute=True):
+            settings.save()
+        self.assertEqual(get_system_config()['name_en'], 'Before')
+
+        generation = get_cache_generation('config')
+        settings.name_en = 'After'
+        with self.captureOnCommitCallbacks(execute=True):
+            settings.save()
+            # Another worker reading now still sees (and caches) the committed row
+            self.assertEqual(get_cache_generation('config'), generation)
+            self.assertEqual(get_system_config()['name_en'], 'Before')
+
+        self.assertGreater(get_cache_generation('config'), generation)
+        self.assertEqual(get_system_config()['name_en'], 'After')
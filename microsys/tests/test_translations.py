@@ -0,0 +1,71 @@
+from django.contrib.sessions.backends.db import SessionStore
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from microsys.models import SystemSettings
+from microsys.patches import _MISS, _ms_lookup
+from microsys.translations import (
+    FrozenStrings, begin_request_translations, end_request_translations, lazy_translator, set_active_language,
+)
+
+
+class LazyTranslatorTests(TestCase):
+    def _request(self, lang):
+        request = RequestFactory().get('/')
+        request.session = SessionStore()
+        request.session['lang'] = lang
+        return request
+
+    def _evaluate(self, request, value):
+        token = begin_request_translations(request)
+        try:
+            return str(value)
+        finally:
+            end_request_translations(token)
+
+    def test_language_switch_within_a_request(self):
+        label = lazy_translator('filter_year', 'Year')
+        token = begin_request_translations(self._request('en'))
+        try:
+            self.assertEqual(str(label), 'Year')
+            set_active_language('ar')
+            self.assertEqual(str(label), 'السنة')
+            set_active_language('en')
+            self.assertEqual(str(label), 'Year')
+        finally:
+            end_request_translations(token)
+
+    def test_requests_do_not_share_a_language(self):
+        label = lazy_translator('filter_year', 'Year')
+        self.assertEqual(self._evaluate(self._request('ar'), label), 'السنة')
+        self.assertEqual(self._evaluate(self._request('en'), label), 'Year')
+
+    def test_table_reloads_after_settings_save(self):
+        label = lazy_translator('filter_year', 'Year')
+        self.assertEqual(self._evaluate(self._request('en'), label), 'Year')
+
+        settings = SystemSettings.load()
+        settings.translations_override = {'en': {'filter_year': 'Fiscal year'}}
+        with self.captureOnCommitCallbacks(execute=True):
+            settings.save()
+        self.assertEqual(self._evaluate(self._request('en'), label), 'Fiscal year')
+
+        settings.translations_override = {}
+        with self.captureOnCommitCallbacks(execute=True):
+            settings.save()
+        self.assertEqual(self._evaluate(self._request('en'), label), 'Year')
+
+
+class GettextLookupTests(SimpleTestCase):
+    def test_memo_belongs_to_its_table(self):
+        first = FrozenStrings({'save_changes': 'Save'})
+        second = FrozenStrings({'save_changes': 'Store'})
+        lookup = _ms_lookup(first)
+        self.assertIs(_ms_lookup(first), lookup)
+        self.assertIsNot(_ms_lookup(second), lookup)
+        self.assertEqual(lookup('Save Changes', None), 'Save')
+        self.assertEqual(_ms_lookup(second)('Save Changes', None), 'Store')
+        self.assertIs(lookup('Unknown', None), _MISS)
+
+    def test_plain_dicts_are_not_memoized(self):
+        table = {'save_changes': 'Save'}
+        self.assertIsNot(_ms_lookup(table), _ms_lookup(table))
@@ -910,10 +910,74 @@ MICROSYS_STRINGS = {
 from django.apps import apps
 from importlib import import_module
 from functools import lru_cache
+from django.utils.functional import lazy
 import logging
+from collections.abc import Mapping
+from contextvars import ContextVar
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
+# Translations generation the lru_cache below was filled under (see cache_versions)
+_translations_generation = None
+
+# Prebuilt get_strings() results: (lang, default_lang, overrides key) -> (pinned snapshot or None, table)
+_strings_tables = {}
+_STRINGS_TABLES_MAX = 64
+
+
+class FrozenStrings(dict):
+    """
+    Read-only merged translation table, shared by every get_strings() caller.
+    Still a real dict, so templates, json_script and isinstance checks keep working.
+    Copy it first to modify: dict(get_strings()).
+    """
+    # Memoized gettext resolver for this table (set by microsys.patches),
+    # so the memo lives and dies with the table it was built from
+    __slots__ = ('_gettext_lookup',)
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("get_strings() tables are shared and read-only; copy with dict(...) first")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    update = pop = popitem = setdefault = clear = _readonly
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+
+def _check_translations_generation():
+    """Drop the merged translation tables when the 'translations' generation moves."""
+    global _translations_generation
+    from microsys.cache_versions import get_cache_generation
+    generation = get_cache_generation('translations')
+    if generation != _translations_generation:
+        _discover_and_merge_translations.cache_clear()
+        _strings_tables.clear()
+        _translations_generation = generation
+
+
+def _overrides_key(lang_overrides):
+    """
+    Cache key for one language's overrides.
+    Config snapshots are immutable, so their identity is enough; plain dicts
+    are keyed by content. Returns False when the overrides can't be keyed.
+    """
+    if not lang_overrides:
+        return None
+    if isinstance(lang_overrides, MappingProxyType):
+        return id(lang_overrides)
+    try:
+        return tuple(sorted(lang_overrides.items()))
+    except TypeError:
+        return False
+
 @lru_cache(maxsize=1)
 def _discover_and_merge_translations():
     """
@@ -952,27 +1016,58 @@ def _discover_and_merge_translations():
             
     return merged_strings
 
-def get_current_language_code(request=None):
-    from django.utils.translation import get_language
-    
+
+class _RequestTranslations:
+    """Per-request language state, shared by every copy of the request's context."""
+    __slots__ = ('request', 'language', 'direction', 'strings')
+
+    def __init__(self, request=None):
+        self.request = request
+        self.language = None
+        self.direction = None
+        self.strings = None
+
+
+# Active request's language state (set by ActivityLogMiddleware; None outside requests)
+_request_translations = ContextVar('microsys_request_translations', default=None)
+
+
+def begin_request_translations(request=None):
+    """
+    Start request-local language state; language, direction and strings are
+    resolved on first use. Returns a token for end_request_translations().
+    """
+    return _request_translations.set(_RequestTranslations(request))
+
+
+def end_request_translations(token):
+    _request_translations.reset(token)
+
+
+def _language_direction(lang, languages):
+    lang_config = languages.get(lang) or {}
+    return lang_config.get('dir') or ('rtl' if lang.startswith('ar') else 'ltr')
+
+
+def _resolve_language(request):
+    """
+    (language, direction) for a request:
+    user profile preference → session → system default, validated against
+    the configured languages.
+    """
     # ── 1. Fetch System Settings ──
     try:
         from microsys.utils import get_system_config
         sys_config = get_system_config()
         default_sys_lang = sys_config.get('default_language', 'en')
+        languages = sys_config.get('languages') or {}
     except Exception:
         default_sys_lang = 'en'
-        
+        languages = {}
+
     lang_code = None
-    
-    # ── 2. Resolve Language Code ──
-    if not request:
-        try:
-            from microsys.middleware import get_current_request
-            request = get_current_request()
-        except Exception:
-            pass
 
+    # ── 2. Resolve Language Code ──
     if request:
         # 2.A User Profile Preference
         if hasattr(request, 'user') and getattr(request.user, 'is_authenticated', False):
@@ -986,22 +1081,55 @@ def get_current_language_code(request=None):
             lang_code = request.session.get('lang') or request.session.get('django_language')
     
     # 2.C System Default Language
-    if not lang_code:
-        lang_code = default_sys_lang
-    
-    # 2.D Django Thread Local
-    if not lang_code:
-        lang_code = get_language()
-        
     lang = lang_code or default_sys_lang
     # handle en-us -> en
-    return lang.split('-')[0]
+    lang = lang.split('-')[0]
+    if languages and lang not in languages:
+        lang = default_sys_lang if default_sys_lang in languages else 'en'
+    return lang, _language_direction(lang, languages)
+
+
+def get_active_language(request=None):
+    """
+    (language, direction) of the active request, or of `request` if given.
+    Resolved once per request (see ActivityLogMiddleware); outside a request
+    it is resolved from the thread's current request, if any, on every call.
+    """
+    state = _request_translations.get()
+    if state is None or (request is not None and state.request is not request):
+        if request is None:
+            from microsys.middleware import get_current_request
+            request = get_current_request()
+        return _resolve_language(request)
+    if state.language is None:
+        state.language, state.direction = _resolve_language(state.request)
+    return state.language, state.direction
+
+
+def set_active_language(lang_code):
+    """Switch the active request's language (e.g. right after a language change)."""
+    state = _request_translations.get()
+    if state is None:
+        return
+    try:
+        from microsys.utils import get_system_config
+        languages = get_system_config().get('languages') or {}
+    except Exception:
+        languages = {}
+    state.language = lang_code.split('-')[0]
+    state.direction = _language_direction(state.language, languages)
+    state.strings = None
+
+
+def get_current_language_code(request=None):
+    """Active language code, for the current request or for `request` if given."""
+    return get_active_language(request)[0]
 
 
 def get_strings(lang_code=None, overrides=None):
     """
     Get the translation dict for a given language code.
-    If lang_code is not provided, dynamically resolves it using get_current_language_code().
+    If lang_code is not provided, uses the active request's language (get_active_language()).
     Merges project-level overrides on top of the base strings automatically.
     """
     try:
@@ -1016,11 +1144,23 @@ def get_strings(lang_code=None, overrides=None):
         
     lang = lang_code
     if not lang:
-        lang = get_current_language_code()
+        lang = get_active_language()[0]
     else:
         lang = lang.split('-')[0]
     
-    # ── 3. Merge Strings ──
+    # ── 3. Merge Strings (prebuilt per language + overrides) ──
+    _check_translations_generation()
+    lang_overrides = {}
+    if overrides and isinstance(overrides, Mapping):
+        lang_overrides = overrides.get(lang, {}) or {}
+
+    overrides_key = _overrides_key(lang_overrides)
+    key = (lang, default_sys_lang, overrides_key)
+    entry = _strings_tables.get(key) if overrides_key is not False else None
+    # Identity-keyed entries pin their snapshot, guarding against a recycled id()
+    if entry is not None and (entry[0] is None or entry[0] is lang_overrides):
+        return entry[1]
+
     all_strings = _discover_and_merge_translations()
     base = dict(all_strings.get(default_sys_lang, {}))
 
@@ -1028,21 +1168,43 @@ def get_strings(lang_code=None, overrides=None):
         lang_strings = all_strings.get(lang, {})
         base.update(lang_strings)
 
-    if overrides and isinstance(overrides, dict):
-        lang_overrides = overrides.get(lang, {})
-        base.update(lang_overrides)
+    base.update(lang_overrides)
+    table = FrozenStrings(base)
+
+    if overrides_key is not False:
+        if len(_strings_tables) >= _STRINGS_TABLES_MAX:
+            _strings_tables.clear()
+        pinned = lang_overrides if isinstance(lang_overrides, MappingProxyType) else None
+        _strings_tables[key] = (pinned, table)
+    return table
+
+def get_active_strings(request=None):
+    """
+    get_strings() for the active language (of `request`, if given).
+    Inside a request the table is resolved once and reused for every later
+    lookup; outside a request (shell, commands) it is resolved on every call.
+    """
+    state = _request_translations.get()
+    if state is None or (request is not None and state.request is not request):
+        return get_strings(get_active_language(request)[0])
+    if state.strings is None:
+        state.strings = get_strings()
+    return state.strings
+
+
+def _translate(key, default_val):
+    return get_active_strings().get(key, default_val)
+
+
+# Built once: lazy() creates a new proxy class on every call
+_lazy_translate = lazy(_translate, str)
 
-    return base
 
 def lazy_translator(key, default_val):
     """
     Returns a lazy proxy that evaluates to the translated string
-    at render time, using the current thread's language.
+    at render time, using the active request's language.
     Perfect for patching global class attributes like Column.verbose_name.
     """
-    from django.utils.functional import lazy
-    def _translate():
-        s = get_strings()
-        return s.get(key, default_val)
     # Using str type so Django templates format it correctly
-    return lazy(_translate, str)()
+    return _lazy_translate(key, default_val)
@@ -75,6 +75,10 @@ urlpatterns = [
     # preferences API
     path('sys/api/preferences/update/', api.update_preferences, name='update_preferences'),
     path('sys/api/preferences/reset/', api.reset_preferences, name='reset_preferences'),
+    # export jobs API
+    path('sys/api/exports/', api.list_export_jobs, name='api_export_jobs'),
+    path('sys/api/exports/<uuid:job_id>/', api.get_export_job, name='api_export_job'),
+    path('sys/api/exports/<uuid:job_id>/download/', api.download_export_job, name='api_export_job_download'),
     # Dynamic Modal CRUD
     path('sys/modals/manager/<str:app_label>/<str:model_name>/<str:pk>/', views.DynamicModalManagerView.as_view(), name='modal_manager'),
     path('sys/modals/delete/<str:app_label>/<str:model_name>/<int:pk>/', views.DynamicModalDeleteView.as_view(), name='modal_delete'),
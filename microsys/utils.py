@@ -5,6 +5,7 @@ from django.forms import modelform_factory
 import django_tables2 as tables
 from django.http import JsonResponse
 import json
+from collections import namedtuple
 # try-except for django_filters as it might not be installed (though likely is)
 try:
     import django_filters
@@ -12,11 +13,14 @@ except ImportError:
     django_filters = None
 
 from django.db.models import ManyToManyField, ManyToManyRel, Q
-from django.db import models as dj_models
+from django.db import connections, models as dj_models
+from django.core.exceptions import EmptyResultSet
 from decimal import Decimal, InvalidOperation
 import inspect
+from types import MappingProxyType
 from .translations import get_strings
 from django.conf import settings
+from django.core.signals import setting_changed
 
 
 # Auth Check — Staff permission test for @user_passes_test decorator
@@ -64,13 +68,46 @@ def log_user_action(request, action, instance=None, model_name=None, details=Non
         user_agent=request.META.get("HTTP_USER_AGENT", ""),
     )
 
+# System Config — merged snapshot memoized per process, keyed by the shared 'config' generation
+_config_snapshot = None  # (generation, snapshot)
+
+
+def _freeze(value):
+    """Read-only view of nested config dicts (shared by every caller in the process)."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
+
 def get_system_config():
     """
-    Returns the deeply merged system configuration.
+    Returns the deeply merged system configuration as a read-only mapping.
     1. Default config
     2. settings.MICROSYS_CONFIG (host project codebase)
     3. SystemSettings Singleton (database UI overrides)
+
+    The merged result is built once per 'config' cache generation (bumped by
+    SystemSettings.save and MICROSYS_CONFIG overrides, shared across workers).
+    Callers that need to modify it must copy it first: dict(get_system_config()).
     """
+    global _config_snapshot
+    from .cache_versions import get_cache_generation
+
+    generation = get_cache_generation('config')
+    cached = _config_snapshot
+    if cached is not None and cached[0] == generation:
+        return cached[1]
+
+    config, complete = _build_system_config()
+    snapshot = _freeze(config)
+    # Don't pin defaults while the settings table is unavailable (e.g. before migrate)
+    if complete:
+        _config_snapshot = (generation, snapshot)
+    return snapshot
+
+
+def _build_system_config():
+    """Merge the config layers. Returns (config, db_layer_loaded)."""
     # Default configuration
     default_config = {
         'name': 'microsys',
@@ -113,8 +150,9 @@ def get_system_config():
             db_config['languages'] = sys_settings.languages
         if sys_settings.translations_override:
             db_config['translations'] = sys_settings.translations_override
+        complete = True
     except Exception:
-        pass
+        complete = False
 
     # Merge
     final_config = default_config.copy()
@@ -147,7 +185,7 @@ def get_system_config():
                 trans[lang].update(keys)
     final_config['translations'] = trans
 
-    return final_config
+    return final_config, complete
 
 # Context Menu Helper — Filters context menu actions based on user permissions
 def filter_context_actions(user, actions):
@@ -315,7 +353,7 @@ class LazyModelClasses(dict):
         if not table_class:
              table_class = _resolve_model_class(self._model, "get_table_class")
         if not table_class:
-             table_class = _build_generic_table_class(self._model)
+             table_class = _memoized_class('generic_table', self._model, _build_generic_table_class)
         return table_class
         
     def _resolve_filter(self):
@@ -326,7 +364,7 @@ class LazyModelClasses(dict):
         if not filter_class:
              filter_class = _resolve_model_class(self._model, "get_filter_class")
         if not filter_class and django_filters:
-             filter_class = _build_generic_filter_class(self._model)
+             filter_class = _memoized_class('generic_filter', self._model, _build_generic_filter_class)
         return filter_class
 
 # Model Resolution — Dynamically imports model, form, table, and filter classes by name
@@ -433,11 +471,26 @@ def _model_is_section(model):
         return True
     return bool(getattr(model._meta, 'is_section', False))
 
+# Section Classes — Per-process memo of resolved/generated classes, keyed by (kind, model).
+# Models and their modules are fixed for the life of a process, and building a new
+# Form/Table/FilterSet class per request also grows the libraries' metaclass registries.
+_SECTION_CLASS_CACHE = {}
+
+def _memoized_class(kind, model, resolver):
+    key = (kind, model)
+    if key not in _SECTION_CLASS_CACHE:
+        _SECTION_CLASS_CACHE[key] = resolver(model)
+    return _SECTION_CLASS_CACHE[key]
+
 # Form Resolution — Resolves or generates a ModelForm class for any model
 def resolve_form_class_for_model(model):
     """
     Resolve a ModelForm class for a model using conventions or fallbacks.
+    Resolved once per model and process.
     """
+    return _memoized_class('form', model, _resolve_form_class_for_model)
+
+def _resolve_form_class_for_model(model):
     form_class = _import_by_convention(model, "forms", "Form")
     if not form_class:
         form_class = (
@@ -497,71 +550,186 @@ def resolve_form_class_for_model(model):
 
     return form_class
 
+# Related Objects Inspector — Relations shown by Smart Delete/View (M2M through models skipped)
+def _preview_relations(model):
+    relations = get_relation_meta(model)
+    return [
+        rel for rel in relations.reverse + relations.forward_m2m
+        if rel.related_model not in relations.through_models
+    ]
+
+def _relation_name(rel):
+    meta = rel.related_model._meta
+    return str(meta.verbose_name if rel.kind == 'o2o' else meta.verbose_name_plural)
+
+def _relation_queryset(instance, rel):
+    """The rows behind one relation, filtered by the same manager its accessor uses."""
+    if rel.kind == 'o2o':
+        return rel.related_model._base_manager.filter(**{rel.field.field.name: instance})
+    return getattr(instance, rel.accessor).all()
+
+_DISPLAY_FIELDS_CACHE = {}
+
+def _display_fields(model):
+    """
+    Fields loaded (via only()) to render related rows as labels, or None to
+    load whole rows. Only models listing them in `display_fields` are narrowed:
+    labels come from str(obj), and a deferred field read there would cost a
+    query per row. FKs are always kept so prefetching can match rows to their parent.
+    """
+    if model in _DISPLAY_FIELDS_CACHE:
+        return _DISPLAY_FIELDS_CACHE[model]
+
+    declared = getattr(model, 'display_fields', None)
+    names = None
+    if declared is not None:
+        names = tuple(
+            field.name for field in model._meta.concrete_fields
+            if not field.primary_key and (field.many_to_one or field.one_to_one or field.name in declared)
+        )
+    _DISPLAY_FIELDS_CACHE[model] = names
+    return names
+
+# Related Objects Inspector — Cheap existence check used by delete guards
+def related_objects_exist(instance):
+    """
+    True if any relation collect_related_objects() would report has rows.
+    One EXISTS query per relation, stopping at the first hit; nothing is
+    loaded or stringified.
+    """
+    for rel in _preview_relations(type(instance)):
+        try:
+            if _relation_queryset(instance, rel).exists():
+                return True
+        except Exception:
+            continue
+    return False
+
+# Related Objects Inspector — COUNT(*) of several querysets in one UNION ALL query (also feeds the section tabs)
+def batched_counts(querysets):
+    """
+    COUNT(*) of several querysets in one query per database:
+
+        SELECT 0, COUNT(*) FROM (<qs0>) s0 UNION ALL SELECT 1, COUNT(*) FROM (<qs1>) s1 ...
+
+    Each queryset keeps its own manager filtering (soft delete, scope), so the
+    counts match `qs.count()`. Returns a list of ints in input order.
+    """
+    counts = [0] * len(querysets)
+    by_db = {}
+    for index, queryset in enumerate(querysets):
+        by_db.setdefault(queryset.db, []).append((index, queryset))
+
+    for db, items in by_db.items():
+        if len(items) == 1:
+            index, queryset = items[0]
+            counts[index] = queryset.count()
+            continue
+        parts, params = [], []
+        for index, queryset in items:
+            try:
+                sql, qs_params = queryset.order_by().values('pk').query.get_compiler(using=db).as_sql()
+            except EmptyResultSet:
+                continue
+            parts.append(f'SELECT {int(index)}, COUNT(*) FROM ({sql}) s{int(index)}')
+            params.extend(qs_params)
+        if not parts:
+            continue
+        with connections[db].cursor() as cursor:
+            cursor.execute(' UNION ALL '.join(parts), params)
+            for index, total in cursor.fetchall():
+                counts[index] = total
+    return counts
+
+# Related Objects Inspector — Per-relation counts for Smart Delete/View
+def count_related_objects(instance):
+    """
+    Row count per non-empty relation: { 'Verbose Name Plural': 50000 }
+    All counts come from a single UNION ALL query (see batched_counts).
+    """
+    counts = _relation_counts(instance, _preview_relations(type(instance)))
+    return {name: count for name, (rel, count) in counts.items()}
+
+def _relation_counts(instance, rels):
+    """{name: (rel, count)} for relations with rows; the first relation wins a shared name."""
+    usable, querysets = [], []
+    for rel in rels:
+        try:
+            querysets.append(_relation_queryset(instance, rel))
+            usable.append(rel)
+        except Exception:
+            continue
+    try:
+        totals = batched_counts(querysets)
+    except Exception:
+        totals = []
+        for queryset in querysets:
+            try:
+                totals.append(queryset.count())
+            except Exception:
+                totals.append(0)
+
+    counts = {}
+    for rel, total in zip(usable, totals):
+        if not total:
+            continue
+        name = _relation_name(rel)
+        if name not in counts:
+            counts[name] = (rel, total)
+    return counts
+
 # Related Objects Inspector — Introspects all related objects for Smart Delete/View
-def collect_related_objects(instance):
+def collect_related_objects(instance, limit=20, with_counts=False):
     """
     Introspects a model instance to find all related objects (Reverse FK, M2M).
     Returns a dictionary: { 'Verbose Name Plural': ['Item 1', 'Item 2'] }
+    or, with with_counts=True: { 'Verbose Name Plural': {'count': 50000, 'items': [...]} }
     Used for Smart Delete functionality and Smart View.
+
+    Relations are counted first (one query); only the non-empty ones are then
+    fetched, in one prefetch pass of sliced Prefetch querysets capped at
+    `limit` rows (narrowed to `display_fields` where a model declares them). For a yes/no answer use
+    related_objects_exist() instead.
     """
-    related_data = {}
-    
-    # Identify M2M through models to skip their reverse relationships
-    through_models = set()
-    for f in instance._meta.get_fields():
-        if getattr(f, 'many_to_many', False):
-            try:
-                through = getattr(f, 'through', getattr(getattr(f, 'remote_field', None), 'through', None))
-                if through:
-                    through_models.add(through)
-            except AttributeError:
-                pass
+    from django.db.models import Prefetch, prefetch_related_objects
 
-    # Iterate over all fields to find relations
-    for field in instance._meta.get_fields():
-        if getattr(field, 'related_model', None) in through_models:
+    counts = _relation_counts(instance, _preview_relations(type(instance)))
+
+    lookups = []
+    for rel, total in counts.values():
+        if rel.kind == 'o2o':
+            lookups.append(rel.accessor)
+        else:
+            queryset = rel.related_model._default_manager.all()
+            fields = _display_fields(rel.related_model)
+            if fields is not None:
+                queryset = queryset.only(*fields)
+            lookups.append(Prefetch(
+                rel.accessor,
+                queryset=queryset[:limit],
+                to_attr=f'_microsys_related_{rel.accessor}',
+            ))
+    try:
+        prefetch_related_objects([instance], *lookups)
+    except Exception:
+        # Fall back to per-relation queries below
+        pass
+
+    related_data = {}
+    for name, (rel, total) in counts.items():
+        try:
+            if rel.kind == 'o2o':
+                # OneToOne (raises DoesNotExist when missing)
+                objs = [getattr(instance, rel.accessor)]
+            else:
+                objs = getattr(instance, f'_microsys_related_{rel.accessor}', None)
+                if objs is None:
+                    objs = getattr(instance, rel.accessor).all()[:limit]
+            items = [str(obj) for obj in objs]
+        except Exception:
             continue
+        related_data[name] = {'count': total, 'items': items} if with_counts else items
 
-        if field.auto_created and not field.concrete:
-            # Reverse Relations (OneToMany, OneToOne)
-            # e.g. department.affiliate_set
-            try:
-                accessor = field.get_accessor_name()
-                if not accessor: continue
-                
-                related_msg = getattr(instance, accessor, None)
-                if related_msg:
-                    # Check if it's a Manager (OneToMany/ManyToMany) or single object (OneToOne)
-                    if hasattr(related_msg, 'all'):
-                        # Limit to reasonable amount
-                        qs = related_msg.all()[:20] 
-                        if qs:
-                            items = [str(obj) for obj in qs]
-                            name = str(field.related_model._meta.verbose_name_plural)
-                            if name not in related_data:
-                                related_data[name] = items
-                    else:
-                        # OneToOne
-                        name = str(field.related_model._meta.verbose_name)
-                        if name not in related_data:
-                            related_data[name] = [str(related_msg)]
-            except Exception:
-                pass
-                
-        elif hasattr(field, 'many_to_many') and field.many_to_many:
-            # Forward M2M
-            try:
-                manager = getattr(instance, field.name, None)
-                if manager:
-                    qs = manager.all()[:20]
-                    if qs:
-                        items = [str(obj) for obj in qs]
-                        name = str(field.related_model._meta.verbose_name_plural)
-                        if name not in related_data:
-                            related_data[name] = items
-            except Exception:
-                pass
-                
     return related_data
 
 from django.db.models.fields.files import FieldFile
@@ -573,12 +741,9 @@ def _build_generic_detail_context(instance, request=None):
     Respects translations and the 'is_scope_enabled' global setting.
     """
     from microsys.utils import is_scope_enabled
-    from microsys.translations import get_strings
+    from microsys.translations import get_active_strings
 
-    s = get_strings()
-    if request and request.user.is_authenticated and hasattr(request.user, 'profile'):
-        lang = request.user.profile.preferences.get('language', 'en') if request.user.profile.preferences else 'en'
-        s = get_strings(lang)
+    s = get_active_strings(request)
 
     fields_data = []
     
@@ -732,7 +897,15 @@ def _build_generic_table_class(model):
         meta_attrs["exclude"] = list(dict.fromkeys(raw_exclude))
     Meta = type("Meta", (), meta_attrs)
     table_attrs = {"Meta": Meta, "__init__": __init__}
-    return type(f"{model.__name__}AutoTable", (tables.Table,), table_attrs)
+    bases = (tables.Table,)
+
+    # Opt-in keyset pagination: `table_keyset = ('-created_at', '-id')` on the model
+    keyset = getattr(model, "table_keyset", None)
+    if keyset:
+        from .pagination import KeysetPaginationMixin
+        bases = (KeysetPaginationMixin, tables.Table)
+        table_attrs["keyset"] = tuple(keyset)
+    return type(f"{model.__name__}AutoTable", bases, table_attrs)
 
 # Dynamic Filter Builder — Generates a django-filters FilterSet class at runtime
 def _build_generic_filter_class(model):
@@ -865,11 +1038,79 @@ def _is_child_model(model, app_name=None):
     
     return has_m2m_rel and lacks_table
 
+# Section Discovery — Table/Filter resolution for section models (convention → model hook → generated)
+def _resolve_section_table_class(model):
+    table_class = _import_by_convention(model, "tables", "Table")
+    if not table_class:
+        # Fallback: legacy methods
+        table_class = (
+            _resolve_model_class(model, "get_table_class")
+            or _resolve_model_class(model, "get_table_class_path")
+        )
+    
+    # Generate if not found
+    if not table_class:
+         table_class = _memoized_class('generic_table', model, _build_generic_table_class)
+    return table_class
+
+def _resolve_section_filter_class(model):
+    filter_class = _import_by_convention(model, "filters", "Filter")
+    if not filter_class:
+        # Fallback
+        filter_class = (
+            _resolve_model_class(model, "get_filter_class")
+            or _resolve_model_class(model, "get_filter_class_path")
+        )
+    
+    # Generate if not found (optional, requires django_filters)
+    if not filter_class and django_filters:
+         filter_class = _memoized_class('generic_filter', model, _build_generic_filter_class)
+    return filter_class
+
+# Section Discovery — Registry of discovered sections per (app_name, include_children), built once per process
+_SECTION_MODELS_CACHE = {}
+
+class LazySectionInfo(dict):
+    """
+    Section/subsection info dict whose class entries (form_class, table_class,
+    filter_class) are resolved on first access, so a request only builds the
+    classes of the section it actually shows.
+    """
+    def __init__(self, data, **resolvers):
+        super().__init__(data)
+        self._resolvers = resolvers
+
+    def __getitem__(self, key):
+        if not super().__contains__(key) and key in self._resolvers:
+            self[key] = self._resolvers[key]()
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return super().__contains__(key) or key in self._resolvers
+
+def clear_section_cache(setting=None, **kwargs):
+    """Forget discovered sections, memoized classes and relation metadata (settings overrides in tests)."""
+    if setting in (None, 'INSTALLED_APPS'):
+        _SECTION_MODELS_CACHE.clear()
+        _SECTION_CLASS_CACHE.clear()
+        _MODEL_CLASSES_CACHE.clear()
+        _RELATION_META_CACHE.clear()
+        _DISPLAY_FIELDS_CACHE.clear()
+
+setting_changed.connect(clear_section_cache)
+
 # Section Discovery — Scans apps for section models and resolves their Form/Table/Filter classes
 def discover_section_models(app_name=None, include_children=False):
     """
     Discover section models based on explicit `is_section = True` in class/meta.
     Automatically resolves Form, Table, and Filter classes (by convention or generation).
+    The registry is built once per process; classes are resolved lazily, once per model.
     Identifies 'subsection' models (M2M children) for automatic modal handling.
     
     Args:
@@ -898,6 +1139,10 @@ def discover_section_models(app_name=None, include_children=False):
                 }
         }
     """
+    cache_key = (app_name, include_children)
+    if cache_key in _SECTION_MODELS_CACHE:
+        return list(_SECTION_MODELS_CACHE[cache_key])
+
     section_models = []
     
     # Get app configs to iterate
@@ -933,37 +1178,8 @@ def discover_section_models(app_name=None, include_children=False):
             if not is_section and not (include_children and is_child):
                 continue
             
-            # --- Resolve Classes (Form, Table, Filter) ---
-            # 1. Form
-            form_class = resolve_form_class_for_model(model)
-
-            # 2. Table
-            table_class = _import_by_convention(model, "tables", "Table")
-            if not table_class:
-                # Fallback: legacy methods
-                table_class = (
-                    _resolve_model_class(model, "get_table_class")
-                    or _resolve_model_class(model, "get_table_class_path")
-                )
-            
-            # Generate if not found
-            if not table_class:
-                 table_class = _build_generic_table_class(model)
-
-            # 3. Filter
-            filter_class = _import_by_convention(model, "filters", "Filter")
-            if not filter_class:
-                # Fallback
-                filter_class = (
-                    _resolve_model_class(model, "get_filter_class")
-                    or _resolve_model_class(model, "get_filter_class_path")
-                )
-            
-            # Generate if not found (optional, requires django_filters)
-            if not filter_class and django_filters:
-                 filter_class = _build_generic_filter_class(model)
-
             # --- Identify Subsections (M2M Children) ---
+            # (Form/Table/Filter classes are resolved on first access, see LazySectionInfo)
             subsections = []
             for field in meta.get_fields():
                 if isinstance(field, ManyToManyField):
@@ -972,32 +1188,31 @@ def discover_section_models(app_name=None, include_children=False):
                     
                     # Verify it's a "subsection/child" type model
                     if _is_child_model(child_model):
-                         # Resolve child form for the "Add" modal
-                         child_form_class = resolve_form_class_for_model(child_model)
-                             
-                         subsections.append({
+                         # Child form for the "Add" modal
+                         subsections.append(LazySectionInfo({
                              'model': child_model,
                              'model_name': child_meta.model_name,
                              'verbose_name': child_meta.verbose_name,
                              'verbose_name_plural': child_meta.verbose_name_plural,
                              'related_field': field.name,
-                             'form_class': child_form_class
-                         })
+                         }, form_class=lambda m=child_model: resolve_form_class_for_model(m)))
 
-            section_models.append({
+            section_models.append(LazySectionInfo({
                 'model': model,
                 'model_name': meta.model_name,
                 'app_label': meta.app_label,
                 'verbose_name': meta.verbose_name,
                 'verbose_name_plural': meta.verbose_name_plural,
-                'form_class': form_class,
-                'table_class': table_class,
-                'filter_class': filter_class,
                 'subsections': subsections,
                 'is_child': is_child,
-            })
+            },
+                form_class=lambda m=model: resolve_form_class_for_model(m),
+                table_class=lambda m=model: _memoized_class('section_table', m, _resolve_section_table_class),
+                filter_class=lambda m=model: _memoized_class('section_filter', m, _resolve_section_filter_class),
+            ))
     
-    return section_models
+    _SECTION_MODELS_CACHE[cache_key] = section_models
+    return list(section_models)
 
 # Section Discovery — Returns the first section model name for default tab selection
 def get_default_section_model(app_name=None):
@@ -1108,16 +1323,110 @@ def _create_minimal_instance_from_post(model, data, request):
 def is_scope_enabled():
     """
     Checks if the Scope system is globally enabled.
+    Served from the per-request scope context, so repeated calls are free.
     Returns:
         bool: True if enabled, False otherwise.
     """
-    from django.db.utils import ProgrammingError, OperationalError
-    try:
-        ScopeSettings = apps.get_model('microsys', 'ScopeSettings')
-        return ScopeSettings.load().is_enabled
-    except (LookupError, ProgrammingError, OperationalError):
-        # Fallback if model or table isn't ready (e.g., during migrations or empty DB)
-        return False
+    from .middleware import get_scope_context
+    return get_scope_context().is_enabled
+
+# Relation Metadata — Per-model relation descriptors, built once per process
+RelationInfo = namedtuple('RelationInfo', ['field', 'accessor', 'kind', 'related_model'])
+ModelRelations = namedtuple('ModelRelations', ['reverse', 'forward_m2m', 'through_models', 'lock_ignore'])
+
+_RELATION_META_CACHE = {}
+
+def get_relation_meta(model):
+    """
+    Relation descriptors of a model (cached per process):
+    - reverse:        RelationInfo for every reverse relation (kind 'fk', 'o2o' or 'm2m')
+    - forward_m2m:    RelationInfo for the model's own ManyToManyFields
+    - through_models: through tables of every M2M touching the model
+    - lock_ignore:    accessors skipped by lock checks: the M2M reverse accessors
+                      (this model as a child) and the FKs from their through tables
+    """
+    from django.db.models.fields.related import ManyToManyRel
+
+    cached = _RELATION_META_CACHE.get(model)
+    if cached is not None:
+        return cached
+
+    fields = model._meta.get_fields()
+    through_models = set()
+    child_throughs = set()
+    lock_ignore = set()
+    for field in fields:
+        if not getattr(field, 'many_to_many', False):
+            continue
+        through = getattr(field, 'through', None) or getattr(getattr(field, 'remote_field', None), 'through', None)
+        if through:
+            through_models.add(through)
+        if isinstance(field, ManyToManyRel):
+            # The "reverse" side of a M2M - a parent points to us
+            lock_ignore.add(field.get_accessor_name())
+            if through:
+                child_throughs.add(through)
+
+    reverse = []
+    forward_m2m = []
+    for field in fields:
+        if field.auto_created and not field.concrete and field.is_relation:
+            accessor = field.get_accessor_name()
+            if not accessor:
+                continue
+            kind = 'm2m' if field.many_to_many else ('o2o' if field.one_to_one else 'fk')
+            reverse.append(RelationInfo(field, accessor, kind, field.related_model))
+            # FK from a through table whose M2M points at us
+            if kind == 'fk' and field.related_model in child_throughs:
+                lock_ignore.add(accessor)
+        elif field.many_to_many and field.concrete:
+            forward_m2m.append(RelationInfo(field, field.name, 'm2m', field.related_model))
+
+    relations = ModelRelations(tuple(reverse), tuple(forward_m2m), frozenset(through_models), frozenset(lock_ignore))
+    _RELATION_META_CACHE[model] = relations
+    return relations
+
+# Deletion Safety — Bulk check of which instances have related records (lock/protect logic)
+def compute_locked_ids(model, pks, ignore=None):
+    """
+    Return the subset of `pks` whose rows have related records (reverse FK or
+    OneToOne), i.e. the rows that must not be deleted/unlinked.
+    Issues at most one query per relation for the whole set, and stops early
+    once every pk is locked.
+
+    ignore: accessor names to skip (in addition to get_relation_meta().lock_ignore)
+    """
+    pks = [pk for pk in pks if pk is not None]
+    if not pks:
+        return set()
+
+    pk_field = model._meta.pk
+    wanted = {pk_field.to_python(pk) for pk in pks}
+    skip = set(ignore or ()) | get_relation_meta(model).lock_ignore
+    locked = set()
+
+    for rel in get_relation_meta(model).reverse:
+        if rel.kind == 'm2m' or rel.accessor in skip:
+            continue
+        remaining = wanted - locked
+        if not remaining:
+            break
+
+        fk = rel.field.field  # the ForeignKey / OneToOneField on the related model
+        # Reverse FK managers use the related model's default manager (soft delete / scope);
+        # reverse OneToOne lookups use the base manager
+        manager = rel.related_model._base_manager if rel.kind == 'o2o' else rel.related_model._default_manager
+        if fk.target_field.attname == pk_field.attname:
+            column = fk.attname
+        else:
+            column = f'{fk.name}__pk'  # FK to a non-pk field (to_field)
+        try:
+            found = manager.filter(**{f'{fk.name}__pk__in': remaining}).values_list(column, flat=True).distinct()
+            locked.update(found)
+        except Exception:
+            continue
+
+    return locked
 
 # Deletion Safety — Checks if an instance has related records (lock/protect logic)
 def has_related_records(instance, ignore_relations=None):
@@ -1132,68 +1441,11 @@ def has_related_records(instance, ignore_relations=None):
     (i.e., the target of a ManyToManyField from a parent section model).
     This includes the M2M reverse accessor AND any FK from through tables
     (both auto-created and custom through models like AffiliateDepartment).
+    For many instances at once use compute_locked_ids().
     """
-    from django.db.models.fields.related import ManyToManyRel, ManyToOneRel
-    
-    if not instance:
+    if not instance or instance.pk is None:
         return False
-    
-    if ignore_relations is None:
-        ignore_relations = []
-    
-    # Auto-detect M2M parent relations to ignore
-    # Step 1: Collect all through-table models from M2M relationships pointing at us
-    auto_ignore = set()
-    through_models = set()
-    
-    for field in instance._meta.get_fields():
-        if isinstance(field, ManyToManyRel):
-            # This is the "reverse" side of a M2M - the parent points to us
-            accessor_name = field.get_accessor_name()
-            if accessor_name:
-                auto_ignore.add(accessor_name)
-            # Track through table (works for both auto-created and custom)
-            if hasattr(field, 'through') and field.through:
-                through_models.add(field.through)
-    
-    # Step 2: Any ManyToOneRel whose source model is a known through table
-    # should also be ignored (the FK from the through table to this model)
-    for field in instance._meta.get_fields():
-        if isinstance(field, ManyToOneRel):
-            if field.related_model in through_models:
-                accessor_name = field.get_accessor_name()
-                if accessor_name:
-                    auto_ignore.add(accessor_name)
-    
-    for related_object in instance._meta.get_fields():
-        if related_object.is_relation and related_object.auto_created:
-            # Reverse relationship (Someone points to us)
-            accessor_name = related_object.get_accessor_name()
-            if not accessor_name:
-                continue
-            if accessor_name in ignore_relations or accessor_name in auto_ignore:
-                continue
-                
-            try:
-                # Get the related manager/descriptor
-                related_item = getattr(instance, accessor_name)
-                
-                # Check based on relationship type
-                if related_object.one_to_many or related_object.many_to_many:
-                     if related_item.exists():
-                         return True
-                elif related_object.one_to_one:
-                     # OneToOne
-                     pass 
-            except Exception:
-                # DoesNotExist or other issues
-                continue
-            
-            # For O2O
-            if related_object.one_to_one and related_item:
-                return True
-                
-    return False
+    return bool(compute_locked_ids(type(instance), [instance.pk], ignore=ignore_relations))
 
 # Sidebar State Manager — Handles sidebar collapse toggle and persists state to session/profile
 def toggle_sidebar(request):
@@ -1230,12 +1482,10 @@ def toggle_sidebar(request):
 # Form Helper — Automatically sets placeholders and direction based on language
 def set_field_attrs(form, request=None):
     """Set common attributes for all fields in the form."""
-    ms_trans = get_strings()
-    
-    # Detect language for direction
-    from microsys.translations import get_current_language_code
-    lang = get_current_language_code()
-    direction = 'rtl' if lang.startswith('ar') else 'ltr'
+    # Active request's language, direction and strings (resolved once per request)
+    from microsys.translations import get_active_language, get_active_strings
+    direction = get_active_language(request)[1]
+    ms_trans = get_active_strings(request)
     
     for field_name in form.fields:
         field = form.fields.get(field_name)
@@ -3,6 +3,7 @@ from django.apps import apps
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.core.exceptions import FieldDoesNotExist
+from django.http import Http404
 from django.utils.module_loading import import_string
 from django.views.generic.detail import DetailView
 from django_tables2 import SingleTableMixin
@@ -11,6 +12,10 @@ from django_filters.views import FilterView
 # Project imports
 from ..utils import is_scope_enabled
 from ..translations import get_strings
+from ..logarchive import (
+    archive_models_between, filter_reaches_archive, get_archived_log, get_filter_date_range,
+    get_hot_cutoff,
+)
 
 
 # Activity Log View — Paginated, filterable list of user activity with scope support
@@ -23,15 +28,19 @@ class UserActivityLogView(LoginRequiredMixin, UserPassesTestMixin, SingleTableMi
     def test_func(self):
         return self.request.user.is_staff  # Only staff can access logs
     
+    reaches_archive = False
+
     def get_queryset(self):
         # Order by timestamp descending by default
         # Using .all() ensures we use the ScopedManager which handles scope filtering automatically
-        qs = super().get_queryset().order_by('-created_at')
-        
+        return self._restrict(super().get_queryset()).order_by('-created_at')
+
+    def _restrict(self, qs):
+        """Column and visibility rules shared by the hot table and archive tables."""
         # When scopes are disabled, defer the scope column to avoid loading unused data
         if not is_scope_enabled():
             try:
-                self.model._meta.get_field('scope')
+                qs.model._meta.get_field('scope')
                 qs = qs.defer('scope')
             except FieldDoesNotExist:
                 pass
@@ -43,8 +52,37 @@ class UserActivityLogView(LoginRequiredMixin, UserPassesTestMixin, SingleTableMi
             
         return qs
 
+    def get_table_data(self):
+        """
+        Hot table only, unless the date filter reaches past the hot window
+        (MICROSYS_ACTIVITY_LOG['HOT_DAYS']); then the overlapping monthly
+        archive tables are UNIONed in.
+        """
+        data = super().get_table_data()
+        cutoff = get_hot_cutoff()
+        if cutoff is None:
+            return data
+
+        cleaned_data = self.filterset.form.cleaned_data if self.filterset.is_valid() else {}
+        if not filter_reaches_archive(cleaned_data, cutoff):
+            return data.filter(created_at__gte=cutoff)
+
+        archives = archive_models_between(*get_filter_date_range(cleaned_data))
+        if not archives:
+            return data
+
+        self.reaches_archive = True
+        parts = [
+            self.filterset_class(self.request.GET, queryset=self._restrict(archive.objects.all()), request=self.request).qs.order_by()
+            for archive in archives
+        ]
+        return data.order_by().union(*parts, all=True).order_by('-created_at')
+
     def get_table(self, **kwargs):
         table = super().get_table(**kwargs)
+        if self.reaches_archive:
+            # Compound (UNION) queries can only be ordered by selected columns
+            table.orderable = False
         if not is_scope_enabled():
             table.exclude = ('scope',)
         elif hasattr(self.request.user, 'profile') and self.request.user.profile.scope:
@@ -78,6 +116,16 @@ class ActivityLogDetailView(LoginRequiredMixin, UserPassesTestMixin, DetailView)
         # Allow superusers or users with specific permission
         return self.request.user.is_superuser or self.request.user.has_perm('microsys.view_activity_log')
 
+    def get_object(self, queryset=None):
+        try:
+            return super().get_object(queryset)
+        except Http404:
+            # Rows moved by microsys_archive_logs keep their ids
+            log = get_archived_log(self.kwargs.get(self.pk_url_kwarg))
+            if log is None:
+                raise
+            return log
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         log = self.object
@@ -26,19 +26,34 @@ from ..utils import (
     resolve_model_by_name,
     resolve_form_class_for_model,
     has_related_records,
+    compute_locked_ids,
     collect_related_objects,
+    related_objects_exist,
     get_model_classes,
     _get_m2m_through_defaults,
     _create_minimal_instance_from_post,
     log_user_action,
     setup_filter_helper,
     has_submit_button,
+    batched_counts,
 )
 from ..translations import get_strings
 
 User = get_user_model()
 
 
+# Section Management — Tab list with per-model record counts (one UNION ALL query, scope-aware)
+def _section_tabs(section_models):
+    counts = batched_counts([sm['model'].objects.all() for sm in section_models])
+    return [
+        {
+            'name': sm['model_name'],
+            'ar_names': sm['verbose_name_plural'],
+            'count': count,
+        }
+        for sm, count in zip(section_models, counts)
+    ]
+
 # Section Management — Main dynamic CRUD view for all section and subsection models
 @login_required
 def core_models_view(request):
@@ -81,7 +96,7 @@ def core_models_view(request):
         return render(request, 'microsys/sections/manage_sections.html', {
             'error': 'هناك خطأ في تحميل المودل.',
             'active_model': model_param,
-            'models': [{'name': sm['model_name'], 'ar_names': sm['verbose_name_plural'], 'count': sm['model'].objects.count()} for sm in section_models],
+            'models': _section_tabs(section_models),
         })
     
     # Check for edit mode
@@ -215,9 +230,9 @@ def core_models_view(request):
                         accessor = None
 
                     ignore = [accessor] if accessor else []
-                    for child in rel_manager.all():
-                        if has_related_records(child, ignore_relations=ignore):
-                            locked_ids.append(str(child.pk))
+                    child_pks = list(rel_manager.values_list('pk', flat=True))
+                    locked = compute_locked_ids(child_model, child_pks, ignore=ignore)
+                    locked_ids = [str(pk) for pk in child_pks if pk in locked]
             except Exception:
                 locked_ids = []
 
@@ -365,14 +380,7 @@ def core_models_view(request):
     # Build context
     context = {
         'active_model': model_param,
-        'models': [
-            {
-                'name': sm['model_name'], 
-                'ar_names': sm['verbose_name_plural'],
-                'count': sm['model'].objects.count()
-            } 
-            for sm in section_models
-        ],
+        'models': _section_tabs(section_models),
         'form': form,
         'filter': filter_obj,
         'table': table,
@@ -606,14 +614,12 @@ def delete_section(request):
         return JsonResponse({'success': False, 'error': 'العنصر غير موجود'}, status=404)
     
     # Check if has related records (protect from deletion)
-    # Use generic helper to find WHAT is related
-    related_objects = collect_related_objects(instance)
-    
-    if related_objects:
+    # Cheap existence check first; only a blocked delete lists WHAT is related
+    if related_objects_exist(instance):
         return JsonResponse({
             'success': False, 
             'error': 'لا يمكن حذف هذا العنصر لارتباطه بسجلات أخرى.',
-            'related': related_objects # Structured dict of blocking items
+            'related': collect_related_objects(instance, with_counts=True) # Structured dict of blocking items
         }, status=200)
     
     name = str(instance)
@@ -673,8 +679,8 @@ def get_section_details(request):
                 except:
                     pass
 
-        # 2. Collect Related Objects
-        related_objects = collect_related_objects(instance)
+        # 2. Collect Related Objects (counts + first labels)
+        related_objects = collect_related_objects(instance, with_counts=True)
         
         return JsonResponse({
             'success': True,
@@ -923,8 +929,7 @@ class DynamicModalDeleteView(LoginRequiredMixin, View):
         instance = get_object_or_404(model_class, pk=pk)
         
         # Protection check (Generic helper from utils)
-        related = collect_related_objects(instance)
-        if related:
+        if related_objects_exist(instance):
             return JsonResponse({
                 'success': False, 
                 'error': get_strings().get('delete_error_related', 'لا يمكن الحذف لارتباطه بسجلات أخرى.')
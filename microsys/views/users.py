@@ -16,7 +16,7 @@ from django.views.generic.detail import DetailView
 
 # Project imports
 from ..utils import is_scope_enabled, is_staff, is_superuser, log_user_action, get_client_ip, get_user_linked_models
-from ..translations import get_strings
+from ..translations import get_strings, set_active_language
 from .twofa import send_otp
 
 
@@ -56,6 +56,7 @@ class CustomLoginView(LoginView):
         # Only set if provided (the helper will read it from session automatically)
         if lang_param in ['ar', 'en']:
             self.request.session['lang'] = lang_param
+            set_active_language(lang_param)
             
         # 2. Use the smart helper (now handles session automatically)
         context['MS_TRANS'] = get_strings()